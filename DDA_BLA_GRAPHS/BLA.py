@@ -1,60 +1,38 @@
+import os
+import sys
 
-import glfw
-from OpenGL.GL import *
-import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from raster.framebuffer import Framebuffer, save_frame, out_arg
+from raster.trace import PrintTrace
+from raster.scheduler import RevealScheduler
+from raster.retained import PointBuffer
+from raster.bresenham import bresenham_line
 
 
 WIN_WIDTH, WIN_HEIGHT = 1200, 700
-plot_points = []  
+# the glOrtho box as (xmin, ymin, xmax, ymax); lines are clipped to it
+VIEWPORT = (-60, -60, WIN_WIDTH + 60, WIN_HEIGHT + 60)
+plot_points = PointBuffer()
+TRACE_FMT = "> step#{step:04d} -> coord=({x:4},{y:4})  decision={value:4d}"
 
 
-def bresenham_line(x0, y0, x1, y1):
-    """Bresenham's line algorithm with support for all slopes."""
-    dx = abs(x1 - x0)
-    dy = abs(y1 - y0)
-    x, y = x0, y0
+def render_pixels(fb=None):
+    if fb is not None:
+        fb.clear()
+        fb.points(plot_points.view(), (0.18, 0.80, 0.40), size=4)
+        return
 
-    sx = 1 if x1 >= x0 else -1
-    sy = 1 if y1 >= y0 else -1
-
-    
-    if dx > dy:  
-        decision = 2 * dy - dx
-        for step in range(dx + 1):
-            print(f"> step#{step:04d} -> coord=({x:4},{y:4})  decision={decision:4d}")
-            yield x, y
-            x += sx
-            if decision >= 0:
-                y += sy
-                decision += 2 * (dy - dx)
-            else:
-                decision += 2 * dy
-    else:  
-        decision = 2 * dx - dy
-        for step in range(dy + 1):
-            print(f"> step#{step:04d} -> coord=({x:4},{y:4})  decision={decision:4d}")
-            yield x, y
-            y += sy
-            if decision >= 0:
-                x += sx
-                decision += 2 * (dx - dy)
-            else:
-                decision += 2 * dx
-
-
-def render_pixels():
+    from OpenGL.GL import GL_COLOR_BUFFER_BIT, GL_POINTS, glClear, glColor3f, glPointSize
     glClear(GL_COLOR_BUFFER_BIT)
     glPointSize(4)
 
-    glBegin(GL_POINTS)
-    
     glColor3f(0.18, 0.80, 0.40)
-    for px, py in plot_points:
-        glVertex2i(px, py)
-    glEnd()
+    plot_points.draw(GL_POINTS)
 
 
 def setup_projection():
+    from OpenGL.GL import (GL_MODELVIEW, GL_PROJECTION, glClearColor, glLoadIdentity, glMatrixMode,
+                           glOrtho)
     glMatrixMode(GL_PROJECTION)
     glLoadIdentity()
     glOrtho(-60, WIN_WIDTH + 60, -60, WIN_HEIGHT + 60, -1, 1)
@@ -63,9 +41,22 @@ def setup_projection():
     glClearColor(0.04, 0.06, 0.10, 1)
 
 
-def run():
-    global plot_points
+def setup_framebuffer():
+    fb = Framebuffer(WIN_WIDTH, WIN_HEIGHT, clear_color=(0.04, 0.06, 0.10, 1))
+    fb.ortho(-60, WIN_WIDTH + 60, -60, WIN_HEIGHT + 60)
+    return fb
+
+
+def run(headless=False, out="bresenham.png", trace=None, rate=200.0, instant=False):
+    if headless:
+        fb = setup_framebuffer()
+        plot_points.clear()
+        plot_points.extend(bresenham_line(50, 600, 1150, 120, trace=trace, clip=VIEWPORT))
+        render_pixels(fb)
+        save_frame(fb, out)
+        return fb
 
+    import glfw
     if not glfw.init():
         raise RuntimeError("Failed to initialize GLFW")
     window = glfw.create_window(WIN_WIDTH, WIN_HEIGHT, "Bresenham (Variant)", None, None)
@@ -80,27 +71,25 @@ def run():
     print("Idx  |   coordinate   |  decision param")
 
     
-    stream = bresenham_line(50, 600, 1150, 120)
-    last = time.time()
+    if trace is None:
+        trace = PrintTrace(TRACE_FMT)
+    stream = bresenham_line(50, 600, 1150, 120, trace=trace, clip=VIEWPORT)
+    reveal = RevealScheduler(stream, rate, instant=instant)
 
     
     while not glfw.window_should_close(window):
         glfw.poll_events()
 
-        if time.time() - last >= 0.005:
-            try:
-                px, py = next(stream)
-                plot_points.append((px, py))
-            except StopIteration:
-                
-                pass
-            last = time.time()
+        fresh = reveal.step()
+        if fresh:
+            plot_points.extend(fresh)
 
         render_pixels()
         glfw.swap_buffers(window)
+        reveal.wait()
 
     glfw.terminate()
 
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    run(headless="--headless" in sys.argv, out=out_arg(sys.argv, "bresenham.png"))
\ No newline at end of file
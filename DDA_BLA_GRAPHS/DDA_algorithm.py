@@ -1,53 +1,48 @@
 #!/usr/bin/env python3
-import glfw
-from OpenGL.GL import *
-import time
+import os
+import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from raster.framebuffer import Framebuffer, save_frame, out_arg
+from raster.trace import PrintTrace
+from raster.scheduler import RevealScheduler
+from raster.retained import PointBuffer
+from raster.dda import dda_line
 
-WIN_WIDTH, WIN_HEIGHT = 1100, 650
-pixel_list = []  
-
-
-def dda_raster(x0, y0, x1, y1):
-    """DDA rasterization supporting any slope (variant)."""
-    dx = x1 - x0
-    dy = y1 - y0
 
-    steps = int(max(abs(dx), abs(dy)))
-    if steps == 0:
-        # single point
-        print("single-point ->", round(x0), round(y0))
-        yield round(x0), round(y0)
-        return
+WIN_WIDTH, WIN_HEIGHT = 1100, 650
+# the glOrtho box as (xmin, ymin, xmax, ymax); lines are clipped to it
+VIEWPORT = (-40, -40, WIN_WIDTH + 40, WIN_HEIGHT + 40)
+pixel_list = PointBuffer()
+TRACE_FMT = "TRACE {step:04d} | pix=({x:4},{y:4}) | fx={value:7.3f}, fy={aux:7.3f}"
 
-    x_step = dx / steps
-    y_step = dy / steps
 
-    x = x0
-    y = y0
+def dda_raster(x0, y0, x1, y1, trace=None, mode="float", clip=None):
+    """DDA rasterization supporting any slope (variant).
+    ``trace`` is an optional sink from raster.trace (off by default);
+    ``mode`` picks the stepping of the shared kernel ("float" or "fixed");
+    ``clip`` skips the steps outside an (xmin, ymin, xmax, ymax) box."""
+    return dda_line(x0, y0, x1, y1, mode=mode, trace=trace, clip=clip)
 
-    for idx in range(steps + 1):
-        
-        print(f"TRACE {idx:04d} | pix=({round(x):4},{round(y):4}) | fx={x:7.3f}, fy={y:7.3f}")
-        yield round(x), round(y)
-        x += x_step
-        y += y_step
 
+def render_pixels(fb=None):
+    if fb is not None:
+        fb.clear()
+        fb.points(pixel_list.view(), (1.0, 0.55, 0.10), size=5)
+        return
 
-def render_pixels():
+    from OpenGL.GL import GL_COLOR_BUFFER_BIT, GL_POINTS, glClear, glColor3f, glPointSize
     glClear(GL_COLOR_BUFFER_BIT)
     
     glPointSize(5)
 
-    glBegin(GL_POINTS)
-    
     glColor3f(1.0, 0.55, 0.10)
-    for px, py in pixel_list:
-        glVertex2i(px, py)
-    glEnd()
+    pixel_list.draw(GL_POINTS)
 
 
 def setup_projection():
+    from OpenGL.GL import (GL_MODELVIEW, GL_PROJECTION, glClearColor, glLoadIdentity, glMatrixMode,
+                           glOrtho)
     glMatrixMode(GL_PROJECTION)
     glLoadIdentity()
     
@@ -58,9 +53,22 @@ def setup_projection():
     glClearColor(0.06, 0.04, 0.02, 1.0)
 
 
-def run():
-    global pixel_list
+def setup_framebuffer():
+    fb = Framebuffer(WIN_WIDTH, WIN_HEIGHT, clear_color=(0.06, 0.04, 0.02, 1.0))
+    fb.ortho(-40, WIN_WIDTH + 40, -40, WIN_HEIGHT + 40)
+    return fb
+
+
+def run(headless=False, out="dda.png", trace=None, rate=170.0, instant=False):
+    if headless:
+        fb = setup_framebuffer()
+        pixel_list.clear()
+        pixel_list.extend(dda_raster(60, 590, 1040, 90, trace=trace, clip=VIEWPORT))
+        render_pixels(fb)
+        save_frame(fb, out)
+        return fb
 
+    import glfw
     if not glfw.init():
         raise RuntimeError("GLFW initialization failed (variant)")
     window = glfw.create_window(WIN_WIDTH, WIN_HEIGHT, "DDA Raster (variant)", None, None)
@@ -75,27 +83,24 @@ def run():
     print("Idx  | pixel (x,y) | float coords (x,y)")
 
    
-    stream = dda_raster(60, 590, 1040, 90)
-    last = time.time()
+    if trace is None:
+        trace = PrintTrace(TRACE_FMT)
+    stream = dda_raster(60, 590, 1040, 90, trace=trace, clip=VIEWPORT)
+    reveal = RevealScheduler(stream, rate, instant=instant)
 
     while not glfw.window_should_close(window):
         glfw.poll_events()
 
-        
-        if time.time() - last >= 0.006:
-            try:
-                px, py = next(stream)
-                pixel_list.append((px, py))
-            except StopIteration:
-                
-                pass
-            last = time.time()
+        fresh = reveal.step()
+        if fresh:
+            pixel_list.extend(fresh)
 
         render_pixels()
         glfw.swap_buffers(window)
+        reveal.wait()
 
     glfw.terminate()
 
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    run(headless="--headless" in sys.argv, out=out_arg(sys.argv, "dda.png"))
\ No newline at end of file
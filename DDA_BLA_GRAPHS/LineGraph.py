@@ -1,39 +1,51 @@
 #!/usr/bin/env python3
-import glfw
-from OpenGL.GL import *
-import time
+import os
+import sys
+import numpy as np
 import random
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from raster.framebuffer import Framebuffer, save_frame, out_arg
+from raster.trace import PrintTrace
+from raster.scheduler import RevealScheduler
+from raster.dda import dda_line
+from raster.glyphs import GlyphAtlas, label_rects
+from raster.rects import RectBatch
+from raster.decimate import MinMaxEnvelope
+
 
 WIDTH, HEIGHT = 1000, 600
+# the glOrtho box as (xmin, ymin, xmax, ymax); segments are clipped to it
+VIEWPORT = (-50, -50, WIDTH + 50, HEIGHT + 50)
 points_buffer = []  
 
+# axis labels: (texts, positions); glyph units are 1.6 world units (~1.5 px)
+LABEL_SCALE = 1.6
+LABEL_COLOR = (0.75, 0.75, 0.80)
+axis_labels = ([], [])
+label_atlas = GlyphAtlas(1.5)
+label_batch = None
 
-def dda_segment(x0, y0, x1, y1, tag=""):
-    dx = x1 - x0
-    dy = y1 - y0
-    steps = int(max(abs(dx), abs(dy)))
 
-    if steps == 0:
-        rx, ry = int(round(x0)), int(round(y0))
-        print(f"[{tag}] single -> ({rx},{ry})")
-        yield rx, ry
-        return
+def segment_trace(tag):
+    return PrintTrace(f"SEG {tag} | step={{step:04d}} | float=(x={{value:7.4f}}, y={{aux:7.4f}}) -> int=({{x:4d}},{{y:4d}})")
+
 
-    sx = dx / steps
-    sy = dy / steps
-    x = x0
-    y = y0
+def dda_segment(x0, y0, x1, y1, tag="", trace=None, mode="float", clip=VIEWPORT):
+    # same kernel as DDA_algorithm.dda_raster; tag only labels the console trace
+    return dda_line(x0, y0, x1, y1, mode=mode, trace=trace, clip=clip)
 
-    for i in range(steps + 1):
-        rx, ry = int(round(x)), int(round(y))
-        print(f"SEG {tag} | step={i:04d} | float=(x={x:7.4f}, y={y:7.4f}) -> int=({rx:4d},{ry:4d})")
-        yield rx, ry
-        x += sx
-        y += sy
 
+def draw_scene(fb=None):
+    if fb is not None:
+        fb.clear()
+        fb.points(points_buffer, (0.85, 0.95, 0.20), size=6)
+        fb.line_strip(points_buffer, (0.55, 0.20, 0.75))
+        label_atlas.stamp(fb, *axis_labels, LABEL_COLOR, anchor="center")
+        return
 
-def draw_scene():
+    from OpenGL.GL import (GL_COLOR_BUFFER_BIT, GL_LINE_STRIP, GL_POINTS, glBegin, glClear,
+                           glColor3f, glEnd, glPointSize, glVertex2i)
     glClear(GL_COLOR_BUFFER_BIT)
     glPointSize(6)
 
@@ -51,8 +63,20 @@ def draw_scene():
         glVertex2i(px, py)
     glEnd()
 
+    if label_batch is not None:
+        label_batch.draw()
+
+
+def make_labels(xs, data):
+    """Index under every sample and its value just above it."""
+    texts = [str(i) for i in range(len(xs))] + [str(v) for v in data]
+    positions = [(x, 10) for x in xs] + [(x, y + 12) for x, y in zip(xs, data)]
+    return texts, positions
+
 
 def configure_projection():
+    from OpenGL.GL import (GL_MODELVIEW, GL_PROJECTION, glClearColor, glLoadIdentity, glMatrixMode,
+                           glOrtho)
     glMatrixMode(GL_PROJECTION)
     glLoadIdentity()
     
@@ -63,18 +87,28 @@ def configure_projection():
     glClearColor(0.10, 0.09, 0.12, 1.0)
 
 
-def run():
-    global points_buffer
+def setup_framebuffer():
+    fb = Framebuffer(WIDTH, HEIGHT, clear_color=(0.10, 0.09, 0.12, 1.0))
+    fb.ortho(-50, WIDTH + 50, -50, HEIGHT + 50)
+    return fb
 
-    if not glfw.init():
-        raise RuntimeError("GLFW initialization error")
-    window = glfw.create_window(WIDTH, HEIGHT, "DDA Graph (alternative)", None, None)
-    if not window:
-        glfw.terminate()
-        raise RuntimeError("Window creation failed")
 
-    glfw.make_context_current(window)
-    configure_projection()
+def run(headless=False, out="linegraph.png", trace=None, rate=180.0, instant=False):
+    global points_buffer, axis_labels, label_batch
+
+    if headless:
+        fb = setup_framebuffer()
+    else:
+        import glfw
+        if not glfw.init():
+            raise RuntimeError("GLFW initialization error")
+        window = glfw.create_window(WIDTH, HEIGHT, "DDA Graph (alternative)", None, None)
+        if not window:
+            glfw.terminate()
+            raise RuntimeError("Window creation failed")
+
+        glfw.make_context_current(window)
+        configure_projection()
 
     
     N = 20
@@ -82,6 +116,9 @@ def run():
     x_spacing = (WIDTH - 2 * margin) / (N - 1)
     
     data = [random.randint(80, HEIGHT - 80) for _ in range(N)]
+    axis_labels = make_labels([margin + i * x_spacing for i in range(N)], data)
+    if not headless:
+        label_batch = RectBatch(label_rects(*axis_labels, scale=LABEL_SCALE, anchor="center"), LABEL_COLOR)
 
     print("\n>>> DDA GRAPH TRACE (alternative) <<<")
     print("Format: SEG <id> | step=#### | float=(x=..., y=...) -> int=(x,y)")
@@ -94,30 +131,129 @@ def run():
         x1 = margin + (idx + 1) * x_spacing
         y1 = data[idx + 1]
         tag = f"{idx}->{idx+1}"
-        segment_generators.append(dda_segment(x0, y0, x1, y1, tag=tag))
+        seg_trace = trace if (headless or trace is not None) else segment_trace(tag)
+        segment_generators.append(dda_segment(x0, y0, x1, y1, tag=tag, trace=seg_trace))
 
-    last = time.time()
-    seg_idx = 0
+    if headless:
+        points_buffer = [p for gen in segment_generators for p in gen]
+        draw_scene(fb)
+        save_frame(fb, out)
+        return fb
 
-   
-    tick = 0.0055
+    # segments are revealed one after another
+    reveal = RevealScheduler((p for gen in segment_generators for p in gen), rate, instant=instant)
 
     while not glfw.window_should_close(window):
         glfw.poll_events()
 
-        if time.time() - last >= tick:
-            if seg_idx < len(segment_generators):
-                try:
-                    points_buffer.append(next(segment_generators[seg_idx]))
-                except StopIteration:
-                    seg_idx += 1
-            last = time.time()
+        points_buffer.extend(reveal.step())
 
         draw_scene()
         glfw.swap_buffers(window)
+        reveal.wait()
+
+    glfw.terminate()
+
+
+def telemetry(total, chunk, seed=None):
+    """Synthetic telemetry in array chunks: a noisy random walk on a slow sine."""
+    rng = np.random.default_rng(seed)
+    level = 0.0
+    for start in range(0, total, chunk):
+        n = min(chunk, total - start)
+        walk = level + np.cumsum(rng.normal(0.0, 1.0, n))
+        level = walk[-1]
+        t = np.arange(start, start + n)
+        yield walk + 400.0 * np.sin(t * (2.0 * np.pi / 400_000))
+
+
+def envelope_segments(env, x0, x1, y0, y1):
+    """One vertical (x, lo, x, hi) world segment per used envelope column,
+    with the data range fitted to [y0, y1]. At most env.columns segments
+    however many samples went in."""
+    lo, hi = env.envelope()
+    if len(lo) == 0:
+        return np.empty((0, 4))
+    v_min, v_max = lo.min(), hi.max()
+    scale = (y1 - y0) / max(v_max - v_min, 1e-12)
+    # columns are placed by the samples they cover, so the history spans x0..x1
+    xs = x0 + (np.arange(len(lo)) + 0.5) * (env.span * (x1 - x0) / env.count)
+    ys_lo = y0 + (lo - v_min) * scale
+    # at least one unit tall so flat columns still show up as GL lines
+    ys_hi = np.maximum(y0 + (hi - v_min) * scale, ys_lo + 1.0)
+    return np.column_stack([xs, ys_lo, xs, ys_hi])
+
+
+def draw_envelope(segments, fb=None):
+    if fb is not None:
+        fb.clear()
+        fb.lines(segments, (0.85, 0.95, 0.20))
+        return
+
+    from OpenGL.GL import (GL_COLOR_BUFFER_BIT, GL_FLOAT, GL_LINES, GL_VERTEX_ARRAY, glClear,
+                           glColor3f, glDisableClientState, glDrawArrays, glEnableClientState,
+                           glVertexPointer)
+    glClear(GL_COLOR_BUFFER_BIT)
+    if len(segments) == 0:
+        return
+    verts = np.ascontiguousarray(segments.reshape(-1, 2), dtype=np.float32)
+    glColor3f(0.85, 0.95, 0.20)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(2, GL_FLOAT, 0, verts)
+    glDrawArrays(GL_LINES, 0, len(verts))
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+
+def run_stream(headless=False, out="linegraph_stream.png", source=None, total=2_000_000, chunk=20_000):
+    """Streaming mode: ``source`` yields sample chunks (arrays); they are folded
+    into one min/max column per pixel of the plot area, so a frame costs the
+    plot width, not the sample count. Defaults to synthetic telemetry."""
+    margin = 70
+    # the envelope halves its resolution when full, so give it two columns per
+    # pixel column of the plot area: it then always has at least one per pixel
+    columns = 2 * int((WIDTH - 2 * margin) * WIDTH / (WIDTH + 100))
+    env = MinMaxEnvelope(columns)
+    if source is None:
+        source = telemetry(total, chunk)
+    plot = (margin, WIDTH - margin, 80, HEIGHT - 80)
+
+    if headless:
+        fb = setup_framebuffer()
+        for block in source:
+            env.extend(block)
+        print(f"{env.count} samples -> {len(env)} columns of {env.span}")
+        draw_envelope(envelope_segments(env, *plot), fb)
+        save_frame(fb, out)
+        return fb
+
+    import glfw
+    if not glfw.init():
+        raise RuntimeError("GLFW initialization error")
+    window = glfw.create_window(WIDTH, HEIGHT, "Streaming DDA Graph (min/max columns)", None, None)
+    if not window:
+        glfw.terminate()
+        raise RuntimeError("Window creation failed")
+
+    glfw.make_context_current(window)
+    configure_projection()
+
+    # one chunk per frame; the envelope keeps the whole history on screen
+    source = iter(source)
+    while not glfw.window_should_close(window):
+        glfw.poll_events()
+
+        block = next(source, None)
+        if block is not None:
+            env.extend(block)
+
+        draw_envelope(envelope_segments(env, *plot))
+        glfw.swap_buffers(window)
 
     glfw.terminate()
 
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    if "--stream" in sys.argv:
+        run_stream(headless="--headless" in sys.argv, out=out_arg(sys.argv, "linegraph_stream.png"))
+    else:
+        run(headless="--headless" in sys.argv, out=out_arg(sys.argv, "linegraph.png"))
\ No newline at end of file
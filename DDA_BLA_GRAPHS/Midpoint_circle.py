@@ -1,63 +1,36 @@
-import glfw
-from OpenGL.GL import *
-import time
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from raster.framebuffer import Framebuffer, save_frame, out_arg
+from raster.trace import PrintTrace
+from raster.scheduler import RevealScheduler
+from raster.retained import PointBuffer
+from raster.circle import midpoint_circle
 
 WIN_W, WIN_H = 1200, 800
-points = []
-
-
-def midpoint_circle(cx, cy, radius):
-    """Midpoint circle generator (yields 8-way symmetric integer points)."""
-    x = 0
-    y = radius
-    d = 1 - radius
-    step = 0
-
-    while x <= y:
-        p0 = (cx + x, cy + y)
-        p1 = (cx - x, cy + y)
-        p2 = (cx + x, cy - y)
-        p3 = (cx - x, cy - y)
-        p4 = (cx + y, cy + x)
-        p5 = (cx - y, cy + x)
-        p6 = (cx + y, cy - x)
-        p7 = (cx - y, cy - x)
-
-        print(f"STEP {step:04d} | x={x:3d} y={y:3d} d={d:4d}  -> primary={p0}")
-        step += 1
-
-        yield p0
-        yield p1
-        yield p2
-        yield p3
-        yield p4
-        yield p5
-        yield p6
-        yield p7
-
-        
-        if d < 0:
-            d += (2 * x) + 3
-        else:
-            d += (2 * (x - y)) + 5
-            y -= 1
-        x += 1
-
-
-def render():
+points = PointBuffer()
+
+
+def render(fb=None):
+    if fb is not None:
+        fb.clear()
+        fb.points(points.view(), (0.12, 0.62, 0.95), size=4)
+        return
+
+    from OpenGL.GL import GL_COLOR_BUFFER_BIT, GL_POINTS, glClear, glColor3f, glPointSize
     glClear(GL_COLOR_BUFFER_BIT)
     glPointSize(4)
 
     
     glColor3f(0.12, 0.62, 0.95)
 
-    glBegin(GL_POINTS)
-    for x, y in points:
-        glVertex2i(int(x), int(y))
-    glEnd()
+    points.draw(GL_POINTS)
 
 
 def configure_projection():
+    from OpenGL.GL import (GL_MODELVIEW, GL_PROJECTION, glClearColor, glLoadIdentity, glMatrixMode,
+                           glOrtho)
     glMatrixMode(GL_PROJECTION)
     glLoadIdentity()
     glOrtho(-80, WIN_W + 80, -80, WIN_H + 80, -1, 1)
@@ -66,7 +39,28 @@ def configure_projection():
     glClearColor(0.02, 0.03, 0.06, 1.0)
 
 
-def run():
+def setup_framebuffer():
+    fb = Framebuffer(WIN_W, WIN_H, clear_color=(0.02, 0.03, 0.06, 1.0))
+    fb.ortho(-80, WIN_W + 80, -80, WIN_H + 80)
+    return fb
+
+
+def circle_trace(cx, cy):
+    # same line as before, primary point is the first octant shifted to the center
+    return PrintTrace(lambda step, x, y, d, aux:
+                      f"STEP {step:04d} | x={x:3d} y={y:3d} d={d:4d}  -> primary={(cx + x, cy + y)}")
+
+
+def run(headless=False, out="midpoint_circle.png", trace=None, rate=660.0, instant=False):
+    if headless:
+        fb = setup_framebuffer()
+        points.clear()
+        points.extend(midpoint_circle(WIN_W // 2 + 30, WIN_H // 2 - 20, 260, trace=trace))
+        render(fb)
+        save_frame(fb, out)
+        return fb
+
+    import glfw
     if not glfw.init():
         raise RuntimeError("GLFW initialization failed (variant)")
     win = glfw.create_window(WIN_W, WIN_H, "Midpoint Circle (variant)", None, None)
@@ -84,29 +78,25 @@ def run():
 
     print("\n~~~ MIDPOINT CIRCLE TRACE (variant) ~~~")
     print("Format: STEP #### | x Y d -> primary_point")
-    gen = midpoint_circle(center_x, center_y, r)
+    if trace is None:
+        trace = circle_trace(center_x, center_y)
+    gen = midpoint_circle(center_x, center_y, r, trace=trace)
 
-    last = time.time()
-
-    
-    tick = 0.0015
+    reveal = RevealScheduler(gen, rate, instant=instant)
 
     while not glfw.window_should_close(win):
         glfw.poll_events()
 
-        if time.time() - last >= tick:
-            try:
-                points.append(next(gen))
-            except StopIteration:
-                
-                pass
-            last = time.time()
+        fresh = reveal.step()
+        if fresh:
+            points.extend(fresh)
 
         render()
         glfw.swap_buffers(win)
+        reveal.wait()
 
     glfw.terminate()
 
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    run(headless="--headless" in sys.argv, out=out_arg(sys.argv, "midpoint_circle.png"))
\ No newline at end of file
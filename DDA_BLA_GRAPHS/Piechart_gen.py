@@ -1,9 +1,15 @@
-import glfw
-from OpenGL.GL import *
-import math
-import time
+import os
+import sys
+import numpy as np
 import random
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from raster.framebuffer import Framebuffer, save_frame, out_arg
+from raster.pie import PALETTE, sector_fans, generate_sector, PieChart
+from raster.scheduler import RevealScheduler
+from raster.glyphs import GlyphAtlas, label_rects
+from raster.rects import RectBatch
+
 WIN_W, WIN_H = 1100, 700
 sectors_buffer = []
 
@@ -13,44 +19,60 @@ sector_values = [random.randint(10, 80) for _ in range(8)]
 sum_vals = sum(sector_values)
 sector_degrees = [360.0 * v / sum_vals for v in sector_values]
 
-
-PALETTE = [
-    (0.95, 0.47, 0.60),  # soft pink
-    (0.60, 0.87, 0.73),  # mint
-    (0.64, 0.76, 0.96),  # light blue
-    (0.99, 0.84, 0.59),  # peach
-    (0.82, 0.63, 0.88),  # lavender
-    (0.98, 0.72, 0.72),  # salmon
-    (0.58, 0.84, 0.97),  # aqua
-    (0.88, 0.95, 0.70),  # pale lime
-]
-
-
-def generate_sector(cx, cy, radius, start_deg, end_deg, steps=120):
-    """Yield an animated list of points that form a filled pie-sector (triangle fan).
-    Each yielded value is a copy of the fan points so far (so it can be drawn incrementally)."""
-    fan = [(cx, cy)]
-    for s in range(steps + 1):
-        t = s / steps
-        angle_rad = math.radians(start_deg + (end_deg - start_deg) * t)
-        x = cx + radius * math.cos(angle_rad)
-        y = cy + radius * math.sin(angle_rad)
-        fan.append((int(round(x)), int(round(y))))
-        yield list(fan)
-
-
-def draw_scene():
+# sector value labels just outside the rim; glyph units are 1.7 world units (~1.5 px)
+LABEL_SCALE = 1.7
+LABEL_COLOR = (0.85, 0.86, 0.90)
+sector_labels = ([], [])
+label_atlas = GlyphAtlas(1.5)
+label_batch = None
+
+
+def make_labels(cx, cy, radius, start_deg=90.0):
+    """Value of each sector at its mid-angle, 30 units outside the rim."""
+    bounds = start_deg + np.concatenate([[0.0], np.cumsum(sector_degrees)])
+    mid = np.radians((bounds[:-1] + bounds[1:]) / 2)
+    r = radius + 30
+    # positions are baselines, so drop by half the glyph height
+    positions = np.column_stack([cx + r * np.cos(mid), cy + r * np.sin(mid) - 5 * LABEL_SCALE])
+    return [f"{v}" for v in sector_values], positions.tolist()
+
+
+def draw_scene(fb=None):
+    if fb is not None:
+        fb.clear()
+        if isinstance(sectors_buffer, np.ndarray):
+            # bulk mode: all fans are complete, hand the (S, N, 2) array over as is
+            fans = sectors_buffer
+            colors = [PALETTE[i % len(PALETTE)] for i in range(len(fans))]
+        else:
+            fans = [fan for fan in sectors_buffer if len(fan) >= 3]
+            colors = [PALETTE[i % len(PALETTE)] for i, fan in enumerate(sectors_buffer) if len(fan) >= 3]
+        if len(fans):
+            fb.polygons(fans, colors)
+        label_atlas.stamp(fb, *sector_labels, LABEL_COLOR, anchor="center")
+        return
+
+    from OpenGL.GL import (GL_COLOR_BUFFER_BIT, GL_INT, GL_TRIANGLE_FAN, GL_VERTEX_ARRAY, glClear,
+                           glColor3f, glDisableClientState, glDrawArrays, glEnableClientState,
+                           glVertexPointer)
     glClear(GL_COLOR_BUFFER_BIT)
+    glEnableClientState(GL_VERTEX_ARRAY)
     for i, fan_pts in enumerate(sectors_buffer):
+        if len(fan_pts) < 3:
+            continue
         col = PALETTE[i % len(PALETTE)]
         glColor3f(*col)
-        glBegin(GL_TRIANGLE_FAN)
-        for x, y in fan_pts:
-            glVertex2i(x, y)
-        glEnd()
+        # the fan is a view into the sector's vertex array: one call per sector
+        glVertexPointer(2, GL_INT, 0, fan_pts)
+        glDrawArrays(GL_TRIANGLE_FAN, 0, len(fan_pts))
+    glDisableClientState(GL_VERTEX_ARRAY)
+    if label_batch is not None:
+        label_batch.draw()
 
 
 def configure_projection():
+    from OpenGL.GL import (GL_MODELVIEW, GL_PROJECTION, glClearColor, glLoadIdentity, glMatrixMode,
+                           glOrtho)
     glMatrixMode(GL_PROJECTION)
     glLoadIdentity()
     glOrtho(-120, WIN_W + 120, -120, WIN_H + 120, -1, 1)
@@ -59,8 +81,25 @@ def configure_projection():
     glClearColor(0.06, 0.07, 0.10, 1.0)
 
 
-def run():
-    global sectors_buffer
+def setup_framebuffer():
+    fb = Framebuffer(WIN_W, WIN_H, clear_color=(0.06, 0.07, 0.10, 1.0))
+    fb.ortho(-120, WIN_W + 120, -120, WIN_H + 120)
+    return fb
+
+
+def run(headless=False, out="piechart.png", rate=285.0, instant=False):
+    global sectors_buffer, sector_labels, label_batch
+
+    if headless:
+        fb = setup_framebuffer()
+        cx, cy, radius = WIN_W // 2 + 60, WIN_H // 2 - 40, 240
+        sector_labels = make_labels(cx, cy, radius)
+        sectors_buffer = sector_fans(cx, cy, radius, sector_degrees, 90.0, steps=100)
+        draw_scene(fb)
+        save_frame(fb, out)
+        return fb
+
+    import glfw
     if not glfw.init():
         raise RuntimeError("GLFW initialization failed")
     window = glfw.create_window(WIN_W, WIN_H, "Pastel Pie Chart (variant)", None, None)
@@ -74,6 +113,8 @@ def run():
     cx = WIN_W // 2 + 60
     cy = WIN_H // 2 - 40
     radius = 240 
+    sector_labels = make_labels(cx, cy, radius)
+    label_batch = RectBatch(label_rects(*sector_labels, scale=LABEL_SCALE, anchor="center"), LABEL_COLOR)
 
     print("\n>>> SECTOR SUMMARY <<<")
     print("ID | start°  -> end°   | value ")
@@ -90,27 +131,64 @@ def run():
 
 
     sectors_buffer = [[] for _ in gens]
-    current = 0
-    last = time.time()
-
-    tick = 0.0035
+    # sectors grow one after another; each item is (sector index, fan so far)
+    reveal = RevealScheduler(((i, fan) for i, gen in enumerate(gens) for fan in gen), rate, instant=instant)
 
     while not glfw.window_should_close(window):
         glfw.poll_events()
 
-        if time.time() - last >= tick:
-            if current < len(gens):
-                try:
-                    sectors_buffer[current] = next(gens[current])
-                except StopIteration:
-                    current += 1
-            last = time.time()
+        for i, fan in reveal.step():
+            sectors_buffer[i] = fan
 
         draw_scene()
         glfw.swap_buffers(window)
+        reveal.wait()
+
+    glfw.terminate()
+
+
+def run_dashboard(headless=False, out="pie_dashboard.png", rows=30, cols=50, sectors=6):
+    """A grid of rows * cols small random pies rendered as one PieChart."""
+    cell_w, cell_h = WIN_W / cols, WIN_H / rows
+    ys, xs = np.mgrid[0:rows, 0:cols]
+    centers = np.column_stack([(xs.ravel() + 0.5) * cell_w, (ys.ravel() + 0.5) * cell_h])
+    values = np.random.randint(10, 80, size=(rows * cols, sectors))
+    pies = PieChart(values, centers, 0.45 * min(cell_w, cell_h), steps=12)
+
+    if headless:
+        fb = Framebuffer(WIN_W, WIN_H, clear_color=(0.06, 0.07, 0.10, 1.0))
+        fb.ortho(0, WIN_W, 0, WIN_H)
+        pies.fill(fb)
+        save_frame(fb, out)
+        return fb
+
+    import glfw
+    from OpenGL.GL import (GL_COLOR_BUFFER_BIT, GL_MODELVIEW, GL_PROJECTION, glClear, glClearColor,
+                           glLoadIdentity, glMatrixMode, glOrtho)
+    if not glfw.init():
+        raise RuntimeError("GLFW initialization failed")
+    window = glfw.create_window(WIN_W, WIN_H, f"Pie Dashboard ({len(pies)} charts)", None, None)
+    if not window:
+        glfw.terminate()
+        raise RuntimeError("Window creation failed")
+    glfw.make_context_current(window)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    glOrtho(0, WIN_W, 0, WIN_H, -1, 1)
+    glMatrixMode(GL_MODELVIEW)
+    glClearColor(0.06, 0.07, 0.10, 1.0)
+
+    while not glfw.window_should_close(window):
+        glfw.poll_events()
+        glClear(GL_COLOR_BUFFER_BIT)
+        pies.draw()
+        glfw.swap_buffers(window)
 
     glfw.terminate()
 
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    if "--dashboard" in sys.argv:
+        run_dashboard(headless="--headless" in sys.argv, out=out_arg(sys.argv, "pie_dashboard.png"))
+    else:
+        run(headless="--headless" in sys.argv, out=out_arg(sys.argv, "piechart.png"))
\ No newline at end of file
@@ -1,34 +1,27 @@
-import glfw
+import os
+import sys
 import time
-from OpenGL.GL import *
 import numpy as np
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from raster.framebuffer import Framebuffer, save_frame, out_arg
+from raster.transform import Transform2D, make_scale, make_rotate, make_shear, make_translate
+from raster.timeline import Timeline, ease_in_out, ping_pong
+from raster.clip import clip_polygons
+
 WIN_W, WIN_H = 800, 600
+# the glOrtho box as (xmin, ymin, xmax, ymax); shapes are clipped to it
+VIEW = (-1.0, -1.0, 1.0, 1.0)
 
-def make_scale(sx, sy):
-    return np.array([[sx, 0.0, 0.0],
-                     [0.0, sy, 0.0],
-                     [0.0, 0.0, 1.0]], dtype=float)
-
-def make_rotate(degrees):
-    r = np.radians(degrees)
-    return np.array([[np.cos(r), -np.sin(r), 0.0],
-                     [np.sin(r),  np.cos(r), 0.0],
-                     [0.0,        0.0,       1.0]], dtype=float)
-
-def make_shear(shx, shy):
-    # shear matrix (x shear, y shear)
-    return np.array([[1.0, shx, 0.0],
-                     [shy, 1.0, 0.0],
-                     [0.0, 0.0, 1.0]], dtype=float)
-
-def make_translate(tx, ty):
-    return np.array([[1.0, 0.0, tx],
-                     [0.0, 1.0, ty],
-                     [0.0, 0.0, 1.0]], dtype=float)
-
-def draw_polygon(v, filled=True, color=(0.0, 0.5, 1.0)):
+def draw_polygon(v, filled=True, color=(0.0, 0.5, 1.0), fb=None):
     # v is 3xN homogeneous coordinates
+    if fb is not None:
+        if filled:
+            fb.polygon(v[:2].T, color)
+        else:
+            fb.line_strip(v[:2].T, color, closed=True)
+        return
+    from OpenGL.GL import GL_LINE_LOOP, GL_POLYGON, glBegin, glColor3f, glEnd, glVertex2f
     if filled:
         glBegin(GL_POLYGON)
     else:
@@ -38,7 +31,11 @@ def draw_polygon(v, filled=True, color=(0.0, 0.5, 1.0)):
         glVertex2f(p[0], p[1])
     glEnd()
 
-def draw_axes(size=1.0):
+def draw_axes(size=1.0, fb=None):
+    if fb is not None:
+        fb.lines([(-size, 0.0, size, 0.0), (0.0, -size, 0.0, size)], (0.8, 0.8, 0.8))
+        return
+    from OpenGL.GL import GL_LINES, glBegin, glColor3f, glEnd, glVertex2f
     glColor3f(0.8, 0.8, 0.8)
     glBegin(GL_LINES)
     # X axis
@@ -47,25 +44,56 @@ def draw_axes(size=1.0):
     glVertex2f(0.0, -size); glVertex2f(0.0, size)
     glEnd()
 
-def ease_in_out(t):
-    # smoothstep-like easing: 3t^2 - 2t^3
-    return t * t * (3 - 2 * t)
-
-def main():
-    if not glfw.init():
-        print("Failed to initialize GLFW")
-        return
-
-    win = glfw.create_window(WIN_W, WIN_H, "Composite Transform — Variant", None, None)
-    if not win:
-        glfw.terminate()
-        print("Failed to create window")
-        return
-
-    glfw.make_context_current(win)
-    glViewport(0, 0, WIN_W, WIN_H)
-    glMatrixMode(GL_PROJECTION); glLoadIdentity(); glOrtho(-1, 1, -1, 1, -1, 1)
-    glMatrixMode(GL_MODELVIEW)
+def ping_pong_t(elapsed, duration):
+    # normalized progress in [0,1], flipped on odd cycles, then eased;
+    # works on arrays of times too (see bake_timeline)
+    return ease_in_out(ping_pong(elapsed, duration))  # smooth interpolation value
+
+def bake_timeline(square, transformed, duration, fps):
+    # one full ping-pong cycle sampled at fps; the last frame equals the first
+    times = np.arange(int(round(2 * duration * fps)) + 1) / fps
+    return Timeline.bake(square, transformed, times, easing=lambda e: ping_pong_t(e, duration))
+
+def draw_scene(square, interp, t, fb=None):
+    # interp is the baked frame between original and transformed at eased time t
+
+    # draw axes
+    draw_axes(1.0, fb=fb)
+
+    # draw original outline in light color
+    draw_polygon(square, filled=False, color=(0.9, 0.9, 0.9), fb=fb)
+
+    # draw interpolated filled polygon with a color that shifts slightly with t,
+    # clipped to the view first; nothing is submitted once it has left it
+    color = (0.0 + 0.6 * t, 0.4, 0.8 - 0.4 * t)
+    for v in clip_polygons(interp, *VIEW)[0]:
+        draw_polygon(v, filled=True, color=color, fb=fb)
+
+def setup_framebuffer():
+    fb = Framebuffer(WIN_W, WIN_H, clear_color=(0.1, 0.1, 0.1, 1.0))
+    fb.ortho(-1, 1, -1, 1)
+    return fb
+
+def main(headless=False, out="composite.png", fps=60, timeline=None):
+    # timeline: optional .npy path; the baked cycle is saved there and memory-mapped on later runs
+    if not headless:
+        import glfw
+        from OpenGL.GL import (GL_COLOR_BUFFER_BIT, GL_MODELVIEW, GL_PROJECTION, glClear,
+                               glClearColor, glLoadIdentity, glMatrixMode, glOrtho, glViewport)
+        if not glfw.init():
+            print("Failed to initialize GLFW")
+            return
+
+        win = glfw.create_window(WIN_W, WIN_H, "Composite Transform — Variant", None, None)
+        if not win:
+            glfw.terminate()
+            print("Failed to create window")
+            return
+
+        glfw.make_context_current(win)
+        glViewport(0, 0, WIN_W, WIN_H)
+        glMatrixMode(GL_PROJECTION); glLoadIdentity(); glOrtho(-1, 1, -1, 1, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
 
   
     square = np.array([
@@ -80,18 +108,31 @@ def main():
     Sh = make_shear(-0.4, 0.2)      # shear with negative x-shear
     T = make_translate(-0.25, 0.15) # translate in different direction
 
-    # Composite matrix: translate @ rotate @ scale @ shear
-    M = T @ R @ S @ Sh
-    transformed = M @ square
+    # Composite matrix: translate @ rotate @ scale @ shear, composed in place
+    M = Transform2D(T).compose(R).compose(S).compose(Sh)
+    transformed = M.apply(square)
 
     print("\nInitial coords:\n", square[:2].T)
-    print("\nComposite matrix:\n", M)
+    print("\nComposite matrix:\n", M.m)
     print("\nTransformed coords:\n", transformed[:2].T)
 
-    glClearColor(0.1, 0.1, 0.1, 1.0)
     paused = False
     direction = 1  # 1 forward, -1 backwards
     duration = 1.6  # seconds for one-way animation
+    tl = Timeline.cached(timeline, lambda: bake_timeline(square, transformed, duration, fps),
+                         key=(square, transformed, duration, fps))
+
+    if headless:
+        # one full ping-pong cycle at a fixed frame rate
+        fb = setup_framebuffer()
+        for i in range(len(tl)):
+            fb.clear()
+            draw_scene(square, tl[i], tl.t[i], fb=fb)
+            save_frame(fb, out, i)
+        save_frame(fb, out)
+        return fb
+
+    glClearColor(0.1, 0.1, 0.1, 1.0)
     t0 = glfw.get_time()
 
     # GLFW key callback to pause/unpause and close on ESC
@@ -112,30 +153,13 @@ def main():
             # if paused, keep elapsed frozen by not updating t0
             elapsed = (now - t0)  # but we'll not advance t0 until unpaused
 
-        # normalized progress in [0,1]
-        raw_t = (elapsed % duration) / duration
-        # If we want ping-pong, flip with direction based on whole cycles
-        cycle = int((elapsed // duration))
-        if cycle % 2 == 1:
-            raw_t = 1.0 - raw_t
-
-        t = ease_in_out(raw_t)  # smooth interpolation value
-
-        # Interpolate between original and transformed
-        interp = (1.0 - t) * square + t * transformed
+        # the baked cycle repeats every len(tl) - 1 frames (last == first)
+        i = int(elapsed * fps) % (len(tl) - 1)
 
         glClear(GL_COLOR_BUFFER_BIT)
         glLoadIdentity()
 
-        # draw axes
-        draw_axes(1.0)
-
-        # draw original outline in light color
-        draw_polygon(square, filled=False, color=(0.9, 0.9, 0.9))
-
-        # draw interpolated filled polygon with a color that shifts slightly with t
-        color = (0.0 + 0.6 * t, 0.4, 0.8 - 0.4 * t)
-        draw_polygon(interp, filled=True, color=color)
+        draw_scene(square, tl[i], tl.t[i])
 
         glfw.swap_buffers(win)
         glfw.poll_events()
@@ -146,4 +170,4 @@ def main():
     glfw.terminate()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(headless="--headless" in sys.argv, out=out_arg(sys.argv, "composite.png"))
\ No newline at end of file
@@ -1,71 +1,17 @@
-import glfw
+import os
+import sys
 import time
-import math
-from OpenGL.GL import *
 
-WIN_W, WIN_H = 900, 550
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from raster.framebuffer import Framebuffer, save_frame, out_arg
+from raster.ellipse import midpoint_ellipse_points_int, ellipse_parametric
 
-def midpoint_ellipse_points(cx, cy, rx, ry):
-    """
-    Generator for points on an ellipse using the midpoint algorithm.
-    Yields symmetric integer points (x, y) in screen coordinates.
-    """
-    x, y = 0, ry
-    rx2 = rx * rx
-    ry2 = ry * ry
-    dx = 2 * ry2 * x
-    dy = 2 * rx2 * y
-
-    # Decision parameter for region 1
-    d1 = ry2 - (rx2 * ry) + (0.25 * rx2)
-    while dx < dy:
-        yield (cx + x, cy + y)
-        yield (cx - x, cy + y)
-        yield (cx + x, cy - y)
-        yield (cx - x, cy - y)
-        if d1 < 0:
-            x += 1
-            dx += 2 * ry2
-            d1 += dx + ry2
-        else:
-            x += 1
-            y -= 1
-            dx += 2 * ry2
-            dy -= 2 * rx2
-            d1 += dx - dy + ry2
-
-    # Decision parameter for region 2
-    d2 = (ry2 * (x + 0.5) * (x + 0.5)) + (rx2 * (y - 1) * (y - 1)) - (rx2 * ry2)
-    while y >= 0:
-        yield (cx + x, cy + y)
-        yield (cx - x, cy + y)
-        yield (cx + x, cy - y)
-        yield (cx - x, cy - y)
-        if d2 > 0:
-            y -= 1
-            dy -= 2 * rx2
-            d2 += rx2 - dy
-        else:
-            y -= 1
-            x += 1
-            dx += 2 * ry2
-            dy -= 2 * rx2
-            d2 += dx - dy + rx2
-
-def ellipse_parametric(cx, cy, rx, ry, segments=200):
-    """
-    Parametric polygon approximation of the ellipse (useful for outline/fill).
-    Returns a list of (x,y) floats.
-    """
-    pts = []
-    for i in range(segments):
-        theta = 2.0 * math.pi * i / segments
-        x = cx + rx * math.cos(theta)
-        y = cy + ry * math.sin(theta)
-        pts.append((x, y))
-    return pts
+WIN_W, WIN_H = 900, 550
 
 def setup_gl():
+    from OpenGL.GL import (GL_LINE_SMOOTH, GL_LINE_SMOOTH_HINT, GL_MODELVIEW, GL_NICEST,
+                           GL_POINT_SMOOTH, GL_POINT_SMOOTH_HINT, GL_PROJECTION, glClearColor,
+                           glEnable, glHint, glLoadIdentity, glMatrixMode, glOrtho)
     glMatrixMode(GL_PROJECTION); glLoadIdentity()
     glOrtho(0, WIN_W, 0, WIN_H, -1, 1)
     glMatrixMode(GL_MODELVIEW); glLoadIdentity()
@@ -75,69 +21,104 @@ def setup_gl():
     glHint(GL_LINE_SMOOTH_HINT, GL_NICEST)
     glHint(GL_POINT_SMOOTH_HINT, GL_NICEST)
 
-def draw_points(points, size=4):
+def setup_framebuffer():
+    fb = Framebuffer(WIN_W, WIN_H, clear_color=(0.06, 0.06, 0.08, 1.0))
+    fb.ortho(0, WIN_W, 0, WIN_H)
+    # GL_LINE_SMOOTH counterpart: Wu coverage for the outline
+    fb.line_smooth = True
+    return fb
+
+def point_colors(n):
+    # gradient: green -> teal -> cyan
+    colors = []
+    for i in range(n):
+        t = i / max(1, n)
+        colors.append((0.0 + 0.2 * t, 0.6 + 0.4 * (1 - abs(0.5 - t) * 2), 0.3 + 0.7 * t))
+    return colors
+
+def draw_points(points, size=4, fb=None):
+    if fb is not None:
+        if points:
+            fb.points(points, point_colors(len(points)), size=size)
+        return
+    from OpenGL.GL import GL_POINTS, glBegin, glColor3f, glEnd, glPointSize, glVertex2f
     glPointSize(size)
     glBegin(GL_POINTS)
-    n = max(1, len(points))
-    for i, (x, y) in enumerate(points):
-        t = i / n
-        # gradient: green -> teal -> cyan
-        r = 0.0 + 0.2 * t
-        g = 0.6 + 0.4 * (1 - abs(0.5 - t) * 2)
-        b = 0.3 + 0.7 * t
-        glColor3f(r, g, b)
+    for (x, y), col in zip(points, point_colors(len(points))):
+        glColor3f(*col)
         glVertex2f(x, y)
     glEnd()
 
-def draw_line_strip(points, width=2.0):
+def draw_line_strip(points, width=2.0, fb=None):
+    if fb is not None:
+        fb.line_strip(points, (0.9, 0.9, 0.9), closed=True, width=width)
+        return
+    from OpenGL.GL import GL_LINE_STRIP, glBegin, glColor3f, glEnd, glLineWidth, glVertex2f
     glLineWidth(width)
     glBegin(GL_LINE_STRIP)
     glColor3f(0.9, 0.9, 0.9)
     for x, y in points:
         glVertex2f(x, y)
     # close the loop by repeating first point
-    if points:
+    if len(points):
         glVertex2f(points[0][0], points[0][1])
     glEnd()
 
-def draw_filled(pts):
+def draw_filled(pts, fb=None):
+    if fb is not None:
+        fb.polygon(pts, (0.05, 0.6, 0.4))
+        return
+    from OpenGL.GL import GL_POLYGON, glBegin, glColor3f, glEnd, glVertex2f
     glColor3f(0.05, 0.6, 0.4)
     glBegin(GL_POLYGON)
     for x, y in pts:
         glVertex2f(x, y)
     glEnd()
 
-def main():
-    if not glfw.init():
-        raise RuntimeError("GLFW init failed")
+def main(headless=False, out="ellipse.png"):
+    if not headless:
+        import glfw
+        from OpenGL.GL import (GL_COLOR_BUFFER_BIT, GL_POINTS, glBegin, glClear, glColor3f, glEnd,
+                               glLoadIdentity, glPointSize, glVertex2f)
+        if not glfw.init():
+            raise RuntimeError("GLFW init failed")
 
-    win = glfw.create_window(WIN_W, WIN_H, "Midpoint Ellipse — Variant", None, None)
-    if not win:
-        glfw.terminate()
-        raise RuntimeError("Window creation failed")
+        win = glfw.create_window(WIN_W, WIN_H, "Midpoint Ellipse — Variant", None, None)
+        if not win:
+            glfw.terminate()
+            raise RuntimeError("Window creation failed")
 
-    glfw.make_context_current(win)
-    setup_gl()
+        glfw.make_context_current(win)
+        setup_gl()
 
     # initial ellipse parameters
     cx, cy = WIN_W // 2, WIN_H // 2
     rx, ry = 300, 150
 
-    # precompute symmetric points from midpoint generator (keeps order but will contain duplicates)
+    # precompute symmetric points from the integer midpoint generator (already duplicate-free)
     def build_midpoint_list(rx, ry):
-        gen = midpoint_ellipse_points(cx, cy, rx, ry)
-        pts = []
-        seen = set()
-        for x, y in gen:
-            key = (int(x), int(y))
-            if key not in seen:
-                seen.add(key)
-                pts.append((float(x), float(y)))
-        return pts
+        return [(float(x), float(y)) for x, y in midpoint_ellipse_points_int(cx, cy, rx, ry)]
 
     mid_pts = build_midpoint_list(rx, ry)
     parametric_pts = ellipse_parametric(cx, cy, rx, ry, segments=300)
 
+    if headless:
+        # one frame per display mode, with the perimeter fully revealed
+        fb = setup_framebuffer()
+        for mode in range(3):
+            fb.clear()
+            if mode == 0:
+                draw_points(mid_pts, size=4, fb=fb)
+            elif mode == 1:
+                draw_line_strip(parametric_pts, width=2.0, fb=fb)
+                draw_points(mid_pts, size=3, fb=fb)
+            else:
+                draw_filled(parametric_pts, fb=fb)
+                draw_points(mid_pts, size=3, fb=fb)
+            save_frame(fb, out, mode)
+        save_frame(fb, out)
+        return fb
+
     # animated buffer (progressively revealed indices into mid_pts)
     idx = 0
     forward = True
@@ -239,4 +220,4 @@ def main():
     glfw.terminate()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(headless="--headless" in sys.argv, out=out_arg(sys.argv, "ellipse.png"))
\ No newline at end of file
@@ -1,34 +1,42 @@
 
-import glfw
+import os
+import sys
 import time
 import numpy as np
-from OpenGL.GL import *
 
-WIN_W, WIN_H = 800, 600
-
-def make_translate(tx, ty):
-    return np.array([[1.0, 0.0, tx],
-                     [0.0, 1.0, ty],
-                     [0.0, 0.0, 1.0]], dtype=float)
-
-def make_rotate_deg(deg):
-    r = np.radians(deg)
-    c, s = np.cos(r), np.sin(r)
-    return np.array([[c, -s, 0.0],
-                     [s,  c, 0.0],
-                     [0.0, 0.0, 1.0]], dtype=float)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from raster.framebuffer import Framebuffer, save_frame, out_arg
+from raster.transform import Transform2D, make_rotate
+from raster.trail import TrailBuffer
+from raster.clip import clip_polygons
 
-def draw_square(v, color=(0.0, 0.5, 1.0, 1.0), outline=False):
+WIN_W, WIN_H = 800, 600
+# the glOrtho box as (xmin, ymin, xmax, ymax); shapes are clipped to it
+VIEW = (-1.0, -1.0, 1.0, 1.0)
+
+def draw_square(v, color=(0.0, 0.5, 1.0, 1.0), outline=False, fb=None):
+    if fb is not None:
+        if outline:
+            fb.line_strip(v[:2].T, color, closed=True)
+        else:
+            fb.polygon(v[:2].T, color)
+        return
+    from OpenGL.GL import GL_LINE_LOOP, GL_POLYGON, glBegin, glColor4f, glEnd, glVertex2f
     if outline:
         glBegin(GL_LINE_LOOP)
     else:
-        glBegin(GL_QUADS)
+        # a clipped square can have up to 8 corners
+        glBegin(GL_POLYGON)
     glColor4f(*color)
     for p in v.T:
         glVertex2f(p[0], p[1])
     glEnd()
 
-def draw_axes(size=1.0):
+def draw_axes(size=1.0, fb=None):
+    if fb is not None:
+        fb.lines([(-size, 0.0, size, 0.0), (0.0, -size, 0.0, size)], (0.6, 0.6, 0.6))
+        return
+    from OpenGL.GL import GL_LINES, glBegin, glColor3f, glEnd, glVertex2f
     glColor3f(0.6, 0.6, 0.6)
     glBegin(GL_LINES)
     glVertex2f(-size, 0.0); glVertex2f(size, 0.0)
@@ -43,20 +51,56 @@ def to_homog(points2d):
 def from_homog(points3d):
     return points3d[:2] / points3d[2]
 
-def main():
-    if not glfw.init():
-        print("GLFW init failed")
+def draw_scene(orig_sq, trail, transformed, pivot, fb=None):
+    draw_axes(1.0, fb=fb)
+    # draw original outline
+    draw_square(orig_sq, color=(0.9,0.9,0.9,1.0), outline=True, fb=fb)
+
+    # draw faded trail (one batch, oldest first)
+    if fb is not None:
+        trail.fill(fb)
+    else:
+        trail.draw()
+
+    # draw current transformed square (solid), clipped to the view first;
+    # nothing is submitted once it has left it
+    for v in clip_polygons(transformed, *VIEW)[0]:
+        draw_square(v, color=(0.0, 0.6, 0.9, 1.0), fb=fb)
+
+    # draw pivot marker
+    if fb is not None:
+        fb.points([pivot], (1.0, 0.4, 0.1), size=6)
         return
+    from OpenGL.GL import GL_POINTS, glBegin, glColor3f, glEnd, glPointSize, glVertex2f
+    glPointSize(6.0)
+    glBegin(GL_POINTS)
+    glColor3f(1.0, 0.4, 0.1)
+    glVertex2f(*pivot)
+    glEnd()
 
-    win = glfw.create_window(WIN_W, WIN_H, "2D Rotation (Homogeneous) — Variant", None, None)
-    if not win:
-        glfw.terminate(); print("Window creation failed"); return
+def setup_framebuffer():
+    fb = Framebuffer(WIN_W, WIN_H, clear_color=(0.08, 0.08, 0.10, 1.0))
+    fb.ortho(-1, 1, -1, 1)
+    return fb
+
+def main(headless=False, out="rotation.png", frames=240, fps=60):
+    if not headless:
+        import glfw
+        from OpenGL.GL import (GL_COLOR_BUFFER_BIT, GL_MODELVIEW, GL_PROJECTION, glClear,
+                               glClearColor, glLoadIdentity, glMatrixMode, glOrtho, glViewport)
+        if not glfw.init():
+            print("GLFW init failed")
+            return
 
-    glfw.make_context_current(win)
-    glViewport(0, 0, WIN_W, WIN_H)
-    glMatrixMode(GL_PROJECTION); glLoadIdentity(); glOrtho(-1, 1, -1, 1, -1, 1)
-    glMatrixMode(GL_MODELVIEW)
-    glClearColor(0.08, 0.08, 0.10, 1.0)
+        win = glfw.create_window(WIN_W, WIN_H, "2D Rotation (Homogeneous) — Variant", None, None)
+        if not win:
+            glfw.terminate(); print("Window creation failed"); return
+
+        glfw.make_context_current(win)
+        glViewport(0, 0, WIN_W, WIN_H)
+        glMatrixMode(GL_PROJECTION); glLoadIdentity(); glOrtho(-1, 1, -1, 1, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+        glClearColor(0.08, 0.08, 0.10, 1.0)
 
     # Original square in homogeneous coordinates (3x4)
     orig_sq = np.array([[-0.2, 0.2, 0.2, -0.2],
@@ -81,14 +125,33 @@ def main():
     angular_speed = 90.0            # degrees per second
     direction = 1                   # 1 or -1
     paused = False
-    trail = []                      # list of transformed squares (3x4 arrays)
     max_trail = 60
+    # ring of the last max_trail transformed squares, fading towards the oldest
+    trail = TrailBuffer(max_trail, color=(0.0, 0.5, 1.0),
+                        alpha=lambda i, n: (0.15 + 0.85 * (i + 1) / max(1, n)) * 0.6, clip=VIEW)
+    # reused every frame: the transform and the transformed square
+    xf = Transform2D()
+    transformed = np.empty_like(orig_sq)
 
     print("\n=== INITIAL COORDINATES ===")
     for i in range(4):
         print(f"V{i+1}: ({orig_sq[0,i]:.3f}, {orig_sq[1,i]:.3f})")
     print("\nStarting rotation demo...")
 
+    if headless:
+        # fixed time step instead of the wall clock, same pivot as the window starts with
+        fb = setup_framebuffer()
+        px, py = pivots[pivot_idx][1]
+        for i in range(frames):
+            angle_deg += direction * angular_speed / fps
+            xf.set_pivot_rotate(px, py, angle_deg).apply(orig_sq, out=transformed)
+            trail.push(transformed)
+            fb.clear()
+            draw_scene(orig_sq, trail, transformed, (px, py), fb=fb)
+            save_frame(fb, out, i)
+        save_frame(fb, out)
+        return fb
+
     last_time = glfw.get_time()
 
     def key_cb(window, key, scancode, action, mods):
@@ -122,7 +185,7 @@ def main():
     glfw.set_key_callback(win, key_cb)
 
     # initial print of rotation matrix for 1 degree as in original program
-    R1 = make_rotate_deg(1.0)
+    R1 = make_rotate(1.0)
     print("\n=== ROTATION MATRIX (1°) ===\n", R1, "\nAnimation running...\n")
 
     # main loop
@@ -136,45 +199,18 @@ def main():
         if not paused:
             angle_deg += direction * angular_speed * dt
 
-        # Build rotation about the chosen pivot: T(p) * R(angle) * T(-p)
         pivot_name, pivot_coords = pivots[pivot_idx]
         px, py = pivot_coords
-        T1 = make_translate(-px, -py)
-        R = make_rotate_deg(angle_deg)
-        T2 = make_translate(px, py)
-        M = T2 @ R @ T1
+        xf.set_pivot_rotate(px, py, angle_deg).apply(orig_sq, out=transformed)
 
-        transformed = M @ orig_sq
-
-        # maintain trail (store 2x4 floats for drawing or store homogeneous)
-        trail.append(transformed.copy())
-        if len(trail) > max_trail:
-            trail.pop(0)
+        # maintain trail (the ring copies the 2x4 floats in place)
+        trail.push(transformed)
 
         # render
         glClear(GL_COLOR_BUFFER_BIT)
         glLoadIdentity()
 
-        draw_axes(1.0)
-        # draw original outline
-        draw_square(orig_sq, color=(0.9,0.9,0.9,1.0), outline=True)
-
-        # draw faded trail
-        n = len(trail)
-        for i, tmat in enumerate(trail):
-            alpha = 0.15 + 0.85 * (i+1) / max(1, n)
-            col = (0.0, 0.5, 1.0, alpha * 0.6)
-            draw_square(tmat, color=col)
-
-        # draw current transformed square (solid)
-        draw_square(transformed, color=(0.0, 0.6, 0.9, 1.0))
-
-        # draw pivot marker
-        glPointSize(6.0)
-        glBegin(GL_POINTS)
-        glColor3f(1.0, 0.4, 0.1)
-        glVertex2f(px, py)
-        glEnd()
+        draw_scene(orig_sq, trail, transformed, (px, py))
 
         glfw.swap_buffers(win)
 
@@ -184,4 +220,4 @@ def main():
     glfw.terminate()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(headless="--headless" in sys.argv, out=out_arg(sys.argv, "rotation.png"))
\ No newline at end of file
@@ -10,26 +10,32 @@ Controls:
 - R: reset time & trail
 - Esc: quit
 """
-import glfw
+import os
+import sys
 import time
 import numpy as np
-from OpenGL.GL import *
 
-WIN_W, WIN_H = 800, 600
-
-def make_translate(tx, ty):
-    return np.array([[1.0, 0.0, tx],
-                     [0.0, 1.0, ty],
-                     [0.0, 0.0, 1.0]], dtype=float)
-
-def make_scale(sx, sy):
-    return np.array([[sx, 0.0, 0.0],
-                     [0.0, sy, 0.0],
-                     [0.0, 0.0, 1.0]], dtype=float)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from raster.framebuffer import Framebuffer, save_frame, out_arg
+from raster.transform import Transform2D, make_scale, pivot_scaling
+from raster.trail import TrailBuffer
+from raster.clip import clip_polygons
 
-def draw_quad(v, filled=True, color=(1.0, 0.4, 0.0, 1.0)):
+WIN_W, WIN_H = 800, 600
+# the glOrtho box as (xmin, ymin, xmax, ymax); shapes are clipped to it
+VIEW = (-1.0, -1.0, 1.0, 1.0)
+
+def draw_quad(v, filled=True, color=(1.0, 0.4, 0.0, 1.0), fb=None):
+    if fb is not None:
+        if filled:
+            fb.polygon(v[:2].T, color)
+        else:
+            fb.line_strip(v[:2].T, color, closed=True)
+        return
+    from OpenGL.GL import GL_LINE_LOOP, GL_POLYGON, glBegin, glColor4f, glEnd, glVertex2f
     if filled:
-        glBegin(GL_QUADS)
+        # a clipped square can have up to 8 corners
+        glBegin(GL_POLYGON)
     else:
         glBegin(GL_LINE_LOOP)
     glColor4f(*color)
@@ -37,7 +43,11 @@ def draw_quad(v, filled=True, color=(1.0, 0.4, 0.0, 1.0)):
         glVertex2f(p[0], p[1])
     glEnd()
 
-def draw_axes(size=1.0):
+def draw_axes(size=1.0, fb=None):
+    if fb is not None:
+        fb.lines([(-size, 0.0, size, 0.0), (0.0, -size, 0.0, size)], (0.6, 0.6, 0.6))
+        return
+    from OpenGL.GL import GL_LINES, glBegin, glColor3f, glEnd, glVertex2f
     glColor3f(0.6, 0.6, 0.6)
     glBegin(GL_LINES)
     glVertex2f(-size, 0.0); glVertex2f(size, 0.0)
@@ -54,18 +64,54 @@ def print_info(title, orig, mat, trans):
     for i in range(trans.shape[1]):
         print(f" V{i+1}: ({trans[0,i]:+.3f}, {trans[1,i]:+.3f})")
 
-def main():
-    if not glfw.init():
-        print("Failed to init GLFW"); return
-    win = glfw.create_window(WIN_W, WIN_H, "2D Scaling (Homogeneous) — Variant", None, None)
-    if not win:
-        glfw.terminate(); print("Window create failed"); return
+def draw_scene(orig, trail, transformed, pivot, fb=None):
+    draw_axes(1.0, fb=fb)
+    # original outline
+    draw_quad(orig, filled=False, color=(0.9, 0.9, 0.9, 1.0), fb=fb)
 
-    glfw.make_context_current(win)
-    glViewport(0, 0, WIN_W, WIN_H)
-    glMatrixMode(GL_PROJECTION); glLoadIdentity(); glOrtho(-1, 1, -1, 1, -1, 1)
-    glMatrixMode(GL_MODELVIEW)
-    glClearColor(0.08, 0.08, 0.10, 1.0)
+    # faded trail (one batch, oldest first)
+    if fb is not None:
+        trail.fill(fb)
+    else:
+        trail.draw()
+
+    # current transformed square (solid), clipped to the view first;
+    # nothing is submitted once it has left it
+    for v in clip_polygons(transformed, *VIEW)[0]:
+        draw_quad(v, filled=True, color=(1.0, 0.45, 0.05, 1.0), fb=fb)
+
+    # pivot marker
+    if fb is not None:
+        fb.points([pivot], (0.0, 1.0, 0.0), size=6)
+        return
+    from OpenGL.GL import GL_POINTS, glBegin, glColor3f, glEnd, glPointSize, glVertex2f
+    glPointSize(6.0)
+    glBegin(GL_POINTS)
+    glColor3f(0.0, 1.0, 0.0)
+    glVertex2f(*pivot)
+    glEnd()
+
+def setup_framebuffer():
+    fb = Framebuffer(WIN_W, WIN_H, clear_color=(0.08, 0.08, 0.10, 1.0))
+    fb.ortho(-1, 1, -1, 1)
+    return fb
+
+def main(headless=False, out="scaling.png", frames=150, fps=60):
+    if not headless:
+        import glfw
+        from OpenGL.GL import (GL_COLOR_BUFFER_BIT, GL_MODELVIEW, GL_PROJECTION, glClear,
+                               glClearColor, glLoadIdentity, glMatrixMode, glOrtho, glViewport)
+        if not glfw.init():
+            print("Failed to init GLFW"); return
+        win = glfw.create_window(WIN_W, WIN_H, "2D Scaling (Homogeneous) — Variant", None, None)
+        if not win:
+            glfw.terminate(); print("Window create failed"); return
+
+        glfw.make_context_current(win)
+        glViewport(0, 0, WIN_W, WIN_H)
+        glMatrixMode(GL_PROJECTION); glLoadIdentity(); glOrtho(-1, 1, -1, 1, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+        glClearColor(0.08, 0.08, 0.10, 1.0)
 
     # original square (homogeneous)
     orig = np.array([[-0.2, 0.2, 0.2, -0.2],
@@ -85,8 +131,12 @@ def main():
     phase = 0.0                           # phase offset (can be changed to get different x/y phasing)
     paused = False
     time_offset = 0.0
-    trail = []
     max_trail = 50
+    trail = TrailBuffer(max_trail, color=(1.0, 0.4, 0.0),
+                        alpha=lambda i, n: (0.06 + 0.9 * (i / max(1, n - 1))) * 0.75, clip=VIEW)
+    # reused every frame: the transform and the transformed square
+    xf = Transform2D()
+    transformed = np.empty_like(orig)
 
     # print initial coords and a sample scaling matrix (like original did)
     sample_S = make_scale(1.002, 1.002)
@@ -95,6 +145,22 @@ def main():
         print(f"V{i+1}: ({orig[0,i]:.3f},{orig[1,i]:.3f})")
     print("\n=== SAMPLE SCALING MATRIX ===\n", sample_S, "\nAnimation running...\n")
 
+    if headless:
+        # fixed time step instead of the wall clock
+        fb = setup_framebuffer()
+        px, py = pivots[pivot_idx][1]
+        for i in range(frames):
+            anim_t = i / fps
+            sx = base_sx + amp_x * np.sin(2.0 * np.pi * freq * anim_t)
+            sy = base_sy + amp_y * np.sin(2.0 * np.pi * freq * anim_t + phase)
+            xf.set_pivot_scale(px, py, sx, sy).apply(orig, out=transformed)
+            trail.push(transformed)
+            fb.clear()
+            draw_scene(orig, trail, transformed, (px, py), fb=fb)
+            save_frame(fb, out, i)
+        save_frame(fb, out)
+        return fb
+
     last_t = glfw.get_time()
 
     def key_cb(window, key, scancode, action, mods):
@@ -127,7 +193,7 @@ def main():
             sx = base_sx + amp_x * np.sin(2*np.pi*freq*now)
             sy = base_sy + amp_y * np.sin(2*np.pi*freq*now + phase)
             px, py = pivots[pivot_idx][1]
-            M = make_translate(px, py) @ make_scale(sx, sy) @ make_translate(-px, -py)
+            M = pivot_scaling(px, py, sx, sy)
             trans = M @ orig
             print_info(f"After pivot change ({pivots[pivot_idx][0]})", orig, M, trans)
         elif key == glfw.KEY_R:
@@ -154,42 +220,21 @@ def main():
         sx = base_sx + amp_x * np.sin(2.0 * np.pi * freq * anim_t)
         sy = base_sy + amp_y * np.sin(2.0 * np.pi * freq * anim_t + phase)
 
-        # build scaling about current pivot: T(p) * S(sx,sy) * T(-p)
         pivot_name, pivot_coords = pivots[pivot_idx]
         px, py = pivot_coords
-        M = make_translate(px, py) @ make_scale(sx, sy) @ make_translate(-px, -py)
+        M = xf.set_pivot_scale(px, py, sx, sy).m
 
         # always apply matrix to original square (avoid accumulation)
-        transformed = M @ orig
+        xf.apply(orig, out=transformed)
 
-        # push to trail and clamp
-        trail.append(transformed.copy())
-        if len(trail) > max_trail:
-            trail.pop(0)
+        # push to trail (the ring drops the oldest by itself)
+        trail.push(transformed)
 
         # render
         glClear(GL_COLOR_BUFFER_BIT)
         glLoadIdentity()
 
-        draw_axes(1.0)
-        # original outline
-        draw_quad(orig, filled=False, color=(0.9, 0.9, 0.9, 1.0))
-
-        # faded trail
-        n = len(trail)
-        for i, tmat in enumerate(trail):
-            alpha = 0.06 + 0.9 * (i / max(1, n-1))
-            draw_quad(tmat, filled=True, color=(1.0, 0.4, 0.0, alpha * 0.75))
-
-        # current transformed square (solid)
-        draw_quad(transformed, filled=True, color=(1.0, 0.45, 0.05, 1.0))
-
-        # pivot marker
-        glPointSize(6.0)
-        glBegin(GL_POINTS)
-        glColor3f(0.0, 1.0, 0.0)
-        glVertex2f(px, py)
-        glEnd()
+        draw_scene(orig, trail, transformed, (px, py))
 
         # occasionally print matrix & coords when paused or at pivot changes (small rate)
         # keep prints sparse: once per ~1.5s when not paused
@@ -207,4 +252,4 @@ def main():
     glfw.terminate()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(headless="--headless" in sys.argv, out=out_arg(sys.argv, "scaling.png"))
\ No newline at end of file
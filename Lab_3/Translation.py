@@ -1,21 +1,36 @@
-import glfw, time
-from OpenGL.GL import *
+import os, sys, time
 import numpy as np
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from raster.framebuffer import Framebuffer, save_frame, out_arg
+
 WIN_W, WIN_H = 800, 600
 
-def draw_square():
+SQUARE = np.array([[-0.2,0.2],[0.2,0.2],[0.2,-0.2],[-0.2,-0.2]],float)
+
+def draw_square(fb=None, offset=(0.0,0.0)):
+    if fb is not None: fb.polygon(SQUARE + offset, (0,1,0)); return
+    from OpenGL.GL import GL_QUADS, glBegin, glColor3f, glEnd, glVertex2f
     glBegin(GL_QUADS); glColor3f(0,1,0)
     glVertex2f(-0.2,0.2); glVertex2f(0.2,0.2)
     glVertex2f(0.2,-0.2); glVertex2f(-0.2,-0.2)
     glEnd()
 
-def main():
-    if not glfw.init(): return
-    win = glfw.create_window(WIN_W,WIN_H,"2D Translation Homogeneous",None,None)
-    if not win: glfw.terminate(); return
-    glfw.make_context_current(win)
-    glViewport(0,0,WIN_W,WIN_H); glMatrixMode(GL_PROJECTION); glLoadIdentity(); glOrtho(-1,1,-1,1,-1,1); glMatrixMode(GL_MODELVIEW)
+def setup_framebuffer():
+    fb = Framebuffer(WIN_W,WIN_H); fb.ortho(-1,1,-1,1)
+    return fb
+
+def main(headless=False, out="translation.png", frames=600):
+    if headless: fb = setup_framebuffer()
+    else:
+        import glfw
+        from OpenGL.GL import (GL_COLOR_BUFFER_BIT, GL_MODELVIEW, GL_PROJECTION, glClear,
+                               glLoadIdentity, glMatrixMode, glOrtho, glTranslatef, glViewport)
+        if not glfw.init(): return
+        win = glfw.create_window(WIN_W,WIN_H,"2D Translation Homogeneous",None,None)
+        if not win: glfw.terminate(); return
+        glfw.make_context_current(win)
+        glViewport(0,0,WIN_W,WIN_H); glMatrixMode(GL_PROJECTION); glLoadIdentity(); glOrtho(-1,1,-1,1,-1,1); glMatrixMode(GL_MODELVIEW)
 
     pos = np.array([[-0.8],[-0.8],[1.0]],float)
     trans = np.array([[1,0,0.002],[0,1,0.0015],[0,0,1]],float)
@@ -23,6 +38,12 @@ def main():
     print("Starting Position:\n", pos)
     print("Translation Matrix:\n", trans)
 
+    if headless:
+        for i in range(frames):
+            pos = trans @ pos
+            fb.clear(); draw_square(fb, (pos[0,0], pos[1,0])); save_frame(fb, out, i)
+        save_frame(fb, out); return fb
+
     while not glfw.window_should_close(win):
         glClear(GL_COLOR_BUFFER_BIT); glLoadIdentity()
         pos = trans @ pos
@@ -30,4 +51,4 @@ def main():
         glfw.swap_buffers(win); glfw.poll_events(); time.sleep(0.01)
     glfw.terminate()
 
-if __name__=="__main__": main()
\ No newline at end of file
+if __name__=="__main__": main(headless="--headless" in sys.argv, out=out_arg(sys.argv, "translation.png"))
\ No newline at end of file
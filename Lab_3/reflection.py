@@ -1,10 +1,15 @@
-import glfw, time
-from OpenGL.GL import *
+import os, sys, time
 import numpy as np
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from raster.framebuffer import Framebuffer, save_frame, out_arg
+from raster.timeline import Timeline
+
 WIN_W, WIN_H = 800, 600
 
-def draw_square(v, color=(0,1,0.3)):
+def draw_square(v, color=(0,1,0.3), fb=None):
+    if fb is not None: fb.polygon(v[:2].T, color); return
+    from OpenGL.GL import GL_QUADS, glBegin, glColor3f, glEnd, glVertex2f
     glBegin(GL_QUADS); glColor3f(*color)
     for p in v.T: glVertex2f(p[0],p[1])
     glEnd()
@@ -15,12 +20,22 @@ def print_info(title, orig, mat, trans):
     print("\nMatrix:\n", mat)
     print("\nTransformed coords:"); [print(f"V{i+1}: ({trans[0,i]:.3f},{trans[1,i]:.3f})") for i in range(4)]
 
-def main():
-    if not glfw.init(): return
-    win=glfw.create_window(WIN_W,WIN_H,"Reflection Animations",None,None)
-    if not win: glfw.terminate(); return
-    glfw.make_context_current(win)
-    glViewport(0,0,WIN_W,WIN_H); glMatrixMode(GL_PROJECTION); glLoadIdentity(); glOrtho(-1,1,-1,1,-1,1); glMatrixMode(GL_MODELVIEW)
+def setup_framebuffer():
+    fb=Framebuffer(WIN_W,WIN_H); fb.ortho(-1,1,-1,1)
+    return fb
+
+def main(headless=False, out="reflection.png", timeline=None):
+    # timeline: optional .npy path; baked frames are saved there and memory-mapped on later runs
+    if headless: fb=setup_framebuffer()
+    else:
+        import glfw
+        from OpenGL.GL import (GL_COLOR_BUFFER_BIT, GL_MODELVIEW, GL_PROJECTION, glClear,
+                               glLoadIdentity, glMatrixMode, glOrtho, glViewport)
+        if not glfw.init(): return
+        win=glfw.create_window(WIN_W,WIN_H,"Reflection Animations",None,None)
+        if not win: glfw.terminate(); return
+        glfw.make_context_current(win)
+        glViewport(0,0,WIN_W,WIN_H); glMatrixMode(GL_PROJECTION); glLoadIdentity(); glOrtho(-1,1,-1,1,-1,1); glMatrixMode(GL_MODELVIEW)
 
     square=np.array([[-0.2,0.2,0.2,-0.2],[0.2,0.2,-0.2,-0.2],[1,1,1,1]],float)
     reflections={
@@ -29,14 +44,21 @@ def main():
         "Reflection About Origin": np.array([[-1,0,0],[0,-1,0],[0,0,1]])
     }
 
-    for title, mat in reflections.items():
-        trans = mat @ square
-        print_info(title, square, mat, trans)
-        for t in np.linspace(0,1,60):
+    steps=60
+    # every frame of all three animations in one (frames, 3, 4) array; playback is an index
+    tl=Timeline.cached(timeline, lambda: Timeline.concat(Timeline.bake(square, mat @ square, np.linspace(0,1,steps)) for mat in reflections.values()),
+                      key=(square, steps, *reflections.values()))
+    for k, (title, mat) in enumerate(reflections.items()):
+        print_info(title, square, mat, mat @ square)
+        for frame in range(k*steps, (k+1)*steps):
+            if headless:
+                fb.clear(); draw_square(tl[frame], fb=fb); save_frame(fb, out, frame)
+                continue
             glClear(GL_COLOR_BUFFER_BIT); glLoadIdentity()
-            draw_square((1-t)*square + t*trans)
+            draw_square(tl[frame])
             glfw.swap_buffers(win); glfw.poll_events(); time.sleep(0.01)
-        time.sleep(0.5)
+        if not headless: time.sleep(0.5)
+    if headless: save_frame(fb, out); return fb
     time.sleep(1); glfw.terminate()
 
-if __name__=="__main__": main()
\ No newline at end of file
+if __name__=="__main__": main(headless="--headless" in sys.argv, out=out_arg(sys.argv, "reflection.png"))
\ No newline at end of file
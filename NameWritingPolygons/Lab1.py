@@ -1,14 +1,33 @@
-from OpenGL.GL import *
-from OpenGL.GLUT import *
-from OpenGL.GLU import *
 import ctypes
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from raster.framebuffer import Framebuffer, save_frame, out_arg
+from raster.rects import RectBatch, FrameCache
+from raster.glyphs import text_rects
+
+# framebuffer used by draw_rect/draw_name instead of GL when rendering headless
+target_fb = None
+
 def init():
+    from OpenGL.GL import GL_PROJECTION, glClearColor, glLoadIdentity, glMatrixMode
+    from OpenGL.GLU import gluOrtho2D
     glClearColor(1.0, 1.0, 1.0, 1.0)
     glMatrixMode(GL_PROJECTION)
     glLoadIdentity()
     gluOrtho2D(0, 1400, 0, 600)
 
+def setup_framebuffer():
+    fb = Framebuffer(1400, 600, clear_color=(1.0, 1.0, 1.0, 1.0))
+    fb.ortho(0, 1400, 0, 600)
+    return fb
+
 def draw_rect(x, y, w, h, color):
+    if target_fb is not None:
+        target_fb.polygon([(x, y), (x + w, y), (x + w, y + h), (x, y + h)], color)
+        return
+    from OpenGL.GL import GL_POLYGON, glBegin, glColor3f, glEnd, glVertex2f
     glColor3f(*color)
     glBegin(GL_POLYGON)
     glVertex2f(x, y)
@@ -19,60 +38,58 @@ def draw_rect(x, y, w, h, color):
 
 def getRes():
     ctypes.windll.user32.SetProcessDPIAware()
+    from OpenGL.GLUT import GLUT_SCREEN_HEIGHT, GLUT_SCREEN_WIDTH, glutGet, glutInit
     glutInit(sys.argv)
     width = glutGet(GLUT_SCREEN_WIDTH)
     height = glutGet(GLUT_SCREEN_HEIGHT)
 
     return width, height
 
-def draw_name():
-    glClear(GL_COLOR_BUFFER_BIT)
-
-    #B 
-    draw_rect(50, 100, 40, 400, (0.2, 0.5, 0.9))
-    draw_rect(90, 460, 120, 40, (0.2, 0.5, 0.9))
-    draw_rect(210, 340, 40, 120, (0.2, 0.5, 0.9))
-    draw_rect(90, 300, 120, 40, (0.2, 0.5, 0.9))
-    draw_rect(210, 100, 40, 200, (0.2, 0.5, 0.9))
-    draw_rect(90, 100, 120, 40, (0.2, 0.5, 0.9))
+# the letters come from the shared block-letter glyph table (one unit = 40 px),
+# colored per letter and drawn as one batch
+NAME = "BHISHMA"
+NAME_COLORS = [
+    (0.2, 0.5, 0.9),
+    (0.9, 0.2, 0.2),
+    (0.2, 0.8, 0.2),
+    (0.6, 0.2, 0.8),
+    (0.9, 0.5, 0.2),
+    (0.6, 0.2, 0.8),
+    (0.8, 0.3, 0.2),
+]
 
-    # H
-    draw_rect(300, 100, 40, 400, (0.9, 0.2, 0.2))
-    draw_rect(420, 100, 40, 400, (0.9, 0.2, 0.2))
-    draw_rect(340, 300, 80, 40, (0.9, 0.2, 0.2))
+# left edge of every letter as originally set by hand (px); the gaps vary
+NAME_X = [50, 300, 500, 580, 760, 950, 1230]
 
-    # I
-    draw_rect(500, 100, 40, 400, (0.2, 0.8, 0.2))
+name_rects, name_owner = text_rects(NAME, 50, 100, scale=40, owners=True,
+                                    pens=[(x - 50) / 40 for x in NAME_X])
+name_batch = RectBatch(name_rects, [NAME_COLORS[i] for i in name_owner])
+# GLUT_SINGLE redisplays (expose, same-size reshape) re-blit this instead of redrawing
+frame_cache = FrameCache()
 
-    # S
-    draw_rect(580, 460, 140, 40, (0.6, 0.2, 0.8))
-    draw_rect(580, 300, 40, 160, (0.6, 0.2, 0.8))
-    draw_rect(580, 300, 140, 40, (0.6, 0.2, 0.8))
-    draw_rect(680, 100, 40, 200, (0.6, 0.2, 0.8))
-    draw_rect(580, 100, 140, 40, (0.6, 0.2, 0.8))
-
-    # H
-    draw_rect(760, 100, 40, 400, (0.9, 0.5, 0.2))
-    draw_rect(880, 100, 40, 400, (0.9, 0.5, 0.2))
-    draw_rect(800, 300, 80, 40, (0.9, 0.5, 0.2))
-
-    # M
-    draw_rect(950,100,40,400,(0.6, 0.2, 0.8))
-    draw_rect(990,400,60,40,(0.6, 0.2, 0.8))
-    draw_rect(1050,370,40,70,(0.6, 0.2, 0.8))
-    draw_rect(1090,400,60,40,(0.6, 0.2, 0.8))
-    draw_rect(1150,100,40,400,(0.6, 0.2, 0.8))
-
-    # A
-    draw_rect(1230, 100, 40, 400, (0.8, 0.3, 0.2))
-    draw_rect(1350, 100, 40, 400, (0.8, 0.3, 0.2))
-    draw_rect(1270, 300, 80, 40, (0.8, 0.3, 0.2))
-    draw_rect(1270, 460, 80, 40, (0.8, 0.3, 0.2))
+def draw_name():
+    if target_fb is not None:
+        target_fb.clear()
+        name_batch.fill(target_fb)
+        return
 
+    from OpenGL.GL import GL_COLOR_BUFFER_BIT, glClear, glFlush
+    if not frame_cache.blit():
+        glClear(GL_COLOR_BUFFER_BIT)
+        name_batch.draw()
+        frame_cache.store()
     glFlush()
 
-def main():
-    
+def main(headless=False, out="name.png"):
+    global target_fb
+    if headless:
+        target_fb = setup_framebuffer()
+        draw_name()
+        save_frame(target_fb, out)
+        return target_fb
+
+    from OpenGL.GLUT import (GLUT_RGB, GLUT_SINGLE, glutCreateWindow, glutDisplayFunc, glutInit,
+                             glutInitDisplayMode, glutInitWindowSize, glutMainLoop)
     w, h = getRes()
     glutInit()
     print(f"Screen resolution: {w} x {h}")
@@ -86,4 +103,4 @@ def main():
     
 
 if __name__ == "__main__":
-    main()
+    main(headless="--headless" in sys.argv, out=out_arg(sys.argv, "name.png"))
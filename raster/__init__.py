@@ -0,0 +1,50 @@
+"""Headless helpers and algorithm kernels shared by the lab demos.
+
+Nothing here imports OpenGL or GLFW at import time: the few GL draw
+methods (PointBuffer, RectBatch, FrameCache, TrailBuffer, PieChart.draw)
+import PyOpenGL when they are first called. Submodules are also loaded
+lazily, so ``import raster`` is nearly free and ``from raster import
+bresenham_line`` only pays for raster.bresenham (and NumPy).
+"""
+import importlib
+
+_EXPORTS = {
+    "framebuffer": ("Framebuffer", "save_frame", "out_arg"),
+    "trace": ("PrintTrace", "RingTrace", "NpyTrace", "make_trace"),
+    "retained": ("PointBuffer",),
+    "scheduler": ("RevealScheduler",),
+    "trigtable": ("unit_arc", "arc_points"),
+    "rects": ("RectBatch", "FrameCache"),
+    "glyphs": ("GLYPHS", "text_rects", "text_width", "label_rects", "GlyphAtlas"),
+    "transform": ("Transform2D", "make_translate", "make_rotate", "make_rotate_deg", "make_scale", "make_shear",
+                  "pivot_rotation", "pivot_scaling"),
+    "trail": ("TrailBuffer",),
+    "timeline": ("Timeline",),
+    "decimate": ("MinMaxEnvelope",),
+    "dda": ("dda_line", "dda_array", "dda_spans"),
+    "bresenham": ("bresenham_line", "bresenham_spans", "bresenham_lines"),
+    "wu": ("wu_lines",),
+    "clip": ("outcodes", "clip_params", "clip_segments", "bresenham_window", "dda_window",
+             "clip_polygons", "clip_polygons_xy"),
+    "circle": ("midpoint_circle", "midpoint_circles"),
+    "ellipse": ("midpoint_ellipse_points", "midpoint_ellipse_points_int", "midpoint_ellipses",
+                "ellipse_parametric"),
+    "pie": ("sector_fans", "generate_sector", "PieChart"),
+    "tiles": ("TiledRenderer", "bin_boxes", "cull_outline_tiles"),
+}
+_WHERE = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_WHERE)
+
+
+def __getattr__(name):
+    module = _WHERE.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,308 @@
+"""
+Headless benchmark runner for the rasterization and transform kernels.
+
+    python -m raster.bench [--quick] [--json out.json] [--compare base.json]
+
+Every case reports the best time per call over several repeats, us per
+primitive (one line / circle / ellipse / sector / matrix), pixels per
+second (points, vertices or transformed vertices for the non-raster
+kernels) and the peak memory of one call under tracemalloc. ``--json``
+writes the results; ``--compare`` matches them against a stored baseline
+by kernel and parameters and exits with status 1 when any case is slower
+than ``--threshold`` (default 25%) or, for noisy cases, than twice the
+spread of its repeats. Cases faster than ``--min-seconds`` per call are not
+compared, and a slowdown only counts if it shows up again in each of
+``--confirm`` reruns of that case.
+
+The kernels come from the GL-free raster modules. The first row is the
+import time of those modules in a fresh interpreter (minus the bare
+interpreter start-up); it fails loudly if importing them pulls in OpenGL
+or GLFW.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KERNEL_MODULES = ("raster.bresenham", "raster.wu", "raster.dda", "raster.circle",
+                  "raster.ellipse", "raster.pie", "raster.transform")
+
+
+def _count(it):
+    n = 0
+    for _ in it:
+        n += 1
+    return n
+
+
+def _cases(quick):
+    """(kernel, params, call, pixels per call, primitives per call) for every
+    case; ``call`` runs the kernel once and consumes its output."""
+    from .bresenham import bresenham_line, bresenham_lines
+    from .wu import wu_lines
+    from .dda import dda_line, dda_array
+    from .circle import midpoint_circle, midpoint_circles
+    from .ellipse import midpoint_ellipse_points, midpoint_ellipses, ellipse_parametric
+    from .pie import generate_sector, sector_fans
+    from .clip import clip_polygons
+    from .transform import (Transform2D, make_translate, make_rotate, make_scale, make_shear,
+                            pivot_rotation, pivot_scaling)
+
+    lengths = (100, 1000) if quick else (100, 1000, 10000, 100000)
+    radii = (10, 100) if quick else (10, 100, 1000)
+    steps = (32, 128) if quick else (32, 128, 1024)
+    batch = 100 if quick else 1000
+
+    for n in lengths:
+        end = (n, int(n * 0.37))
+        px = n + 1
+        args = (3.3, 7.1, 3.3 + n, 7.1 + n * 0.37)
+        yield "bresenham_line", {"length": n}, lambda end=end: _count(bresenham_line(0, 0, *end)), px, 1
+        # DDA_algorithm.dda_raster and LineGraph.dda_segment both run this kernel
+        for mode in ("float", "fixed"):
+            yield ("dda_line", {"length": n, "mode": mode},
+                   lambda args=args, mode=mode: _count(dda_line(*args, mode=mode)), px, 1)
+        yield "dda_array", {"length": n}, lambda args=args: dda_array(*args), px, 1
+
+    # a segment running far off a 1200x700 viewport: clipped, the cost
+    # follows the visible part (1200 px) whatever the length
+    view = (0, 0, 1199, 699)
+    for n in (10000, 1000000) if quick else (10000, 1000000, 100000000):
+        yield ("bresenham_line", {"length": n, "clip": "1200x700"},
+               lambda n=n: _count(bresenham_line(0, 0, n, n // 2, clip=view)), 1200, 1)
+        yield ("dda_line", {"length": n, "mode": "fixed", "clip": "1200x700"},
+               lambda n=n: _count(dda_line(0.5, 0.0, n, n / 2, mode="fixed", clip=view)), 1200, 1)
+
+    rng = np.random.default_rng(0)
+    ends = rng.integers(-500, 500, size=(batch, 4))
+    total = int(np.maximum(np.abs(ends[:, 2] - ends[:, 0]), np.abs(ends[:, 3] - ends[:, 1])).sum()) + batch
+    yield "bresenham_lines", {"lines": batch}, lambda: bresenham_lines(*ends.T), total, batch
+    # antialiased: about two weighted pixels per step
+    yield "wu_lines", {"lines": batch}, lambda: wu_lines(*ends.T), 2 * total, batch
+
+    for r in radii:
+        px = len(set(midpoint_circle(0, 0, r)))
+        yield "midpoint_circle", {"radius": r}, lambda r=r: _count(midpoint_circle(0, 0, r)), px, 1
+        yield ("midpoint_circles", {"radius": r, "circles": batch},
+               lambda r=r: midpoint_circles(np.zeros(batch), np.zeros(batch), np.full(batch, r)), px * batch, batch)
+        rx, ry = r, max(1, r // 2)
+        px = len(set(midpoint_ellipse_points(0, 0, rx, ry)))
+        yield ("midpoint_ellipse_points", {"rx": rx, "ry": ry},
+               lambda rx=rx, ry=ry: _count(midpoint_ellipse_points(0, 0, rx, ry)), px, 1)
+        yield ("midpoint_ellipses", {"rx": rx, "ry": ry, "ellipses": batch},
+               lambda rx=rx, ry=ry: midpoint_ellipses(np.zeros(batch), np.zeros(batch),
+                                                              np.full(batch, rx), np.full(batch, ry)), px * batch, batch)
+
+    for s in steps:
+        yield "ellipse_parametric", {"segments": s}, lambda s=s: ellipse_parametric(0, 0, 300, 150, s), s, 1
+        yield ("generate_sector", {"steps": s},
+               lambda s=s: _count(generate_sector(0, 0, 240, 90.0, 150.0, steps=s)), s + 2, 1)
+        yield ("sector_fans", {"steps": s, "sectors": batch},
+               lambda s=s: sector_fans(0, 0, 240, np.full(batch, 360.0 / batch), steps=s), (s + 2) * batch, batch)
+
+    # Lab_3 matrix builders; "pixels" are transformed vertices where there are any
+    yield "make_translate", {}, lambda: make_translate(0.25, -0.1), 0, 1
+    yield "make_rotate", {}, lambda: make_rotate(33.0), 0, 1
+    yield "make_scale", {}, lambda: make_scale(1.2, 0.9), 0, 1
+    yield "make_shear", {}, lambda: make_shear(-0.4, 0.2), 0, 1
+    yield "pivot_rotation", {}, lambda: pivot_rotation(0.4, 0.15, 33.0), 0, 1
+    yield "pivot_scaling", {}, lambda: pivot_scaling(0.4, -0.1, 1.2, 0.9), 0, 1
+    for n in (4, 1000) if quick else (4, 1000, 100000):
+        pts = np.vstack([rng.random((2, n)), np.ones((1, n))])
+        out = np.empty_like(pts)
+        xf = Transform2D()
+        yield ("Transform2D.apply", {"vertices": n},
+               lambda pts=pts, out=out, xf=xf: xf.set_pivot_rotate(0.4, 0.15, 33.0).apply(pts, out=out), n, 1)
+
+    # transformed squares scattered around the [-1, 1] view: about half are
+    # culled or passed through by their bounding box, the rest clipped
+    square = np.array([[-0.2, 0.2, 0.2, -0.2], [0.2, 0.2, -0.2, -0.2], [1.0, 1.0, 1.0, 1.0]])
+    angles = np.radians(rng.uniform(0, 360, batch))
+    c, s = np.cos(angles), np.sin(angles)
+    squares = np.empty((batch, 3, 4))
+    squares[:, 0] = c[:, None] * square[0] - s[:, None] * square[1] + rng.uniform(-1.5, 1.5, (batch, 1))
+    squares[:, 1] = s[:, None] * square[0] + c[:, None] * square[1] + rng.uniform(-1.5, 1.5, (batch, 1))
+    squares[:, 2] = 1.0
+    yield ("clip_polygons", {"polygons": batch},
+           lambda: clip_polygons(squares, -1.0, -1.0, 1.0, 1.0), 4 * batch, batch)
+
+
+def _measure(call, repeat):
+    timer = timeit.Timer(call)
+    number, _ = timer.autorange()
+    times = sorted(timer.repeat(repeat=repeat, number=number))
+    best = times[0] / number
+    # relative gap between the median and the best repeat
+    spread = times[len(times) // 2] / times[0] - 1.0
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, spread, peak
+
+
+def import_time(repeat=5):
+    """Best wall time (s) to import KERNEL_MODULES in a fresh interpreter,
+    minus a bare ``python -c pass``."""
+    code = "import " + ", ".join(KERNEL_MODULES) + "; import sys; " \
+           "sys.exit(any(m.split('.')[0] in ('OpenGL', 'glfw') for m in sys.modules))"
+
+    def best(argv):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            done = subprocess.run(argv, cwd=ROOT)
+            times.append(time.perf_counter() - start)
+            if done.returncode:
+                raise RuntimeError("importing the kernel modules loaded OpenGL or GLFW")
+        return min(times)
+
+    return max(best([sys.executable, "-c", code]) - best([sys.executable, "-c", "pass"]), 0.0)
+
+
+def run(quick=False, repeat=5, only=None, log=print):
+    results = []
+    if not only or "import" in only:
+        seconds = import_time(repeat)
+        row = {
+            "kernel": "import",
+            "params": {"modules": len(KERNEL_MODULES)},
+            "seconds_per_call": seconds,
+            "spread": None,
+            "us_per_primitive": seconds * 1e6,
+            "pixels_per_sec": None,
+            "peak_kib": None,
+        }
+        results.append(row)
+        if log:
+            log(_format(row))
+    for kernel, params, call, pixels, primitives in _cases(quick):
+        if only and kernel not in only:
+            continue
+        seconds, spread, peak = _measure(call, repeat)
+        row = {
+            "kernel": kernel,
+            "params": params,
+            "seconds_per_call": seconds,
+            "spread": spread,
+            "us_per_primitive": seconds * 1e6 / primitives,
+            "pixels_per_sec": pixels / seconds if pixels else None,
+            "peak_kib": peak / 1024.0,
+        }
+        results.append(row)
+        if log:
+            log(_format(row))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def _key(row):
+    return row["kernel"], json.dumps(row["params"], sort_keys=True)
+
+
+def _format(row):
+    params = " ".join(f"{k}={v}" for k, v in row["params"].items())
+    rate = f"{row['pixels_per_sec'] / 1e6:10.3f} Mpix/s" if row["pixels_per_sec"] else " " * 17
+    peak = f"{row['peak_kib']:10.1f} KiB" if row["peak_kib"] is not None else ""
+    return f"{row['kernel']:<24} {params:<28} {row['us_per_primitive']:12.3f} us/prim {rate} {peak}"
+
+
+def compare(current, baseline, threshold=0.25, min_seconds=1e-6, log=print):
+    """Ratios of current / baseline time per call for every shared case;
+    returns the list of (kernel, params, ratio) slower than 1 + threshold.
+
+    A case whose repeats spread more than ``threshold / 2`` (in either run)
+    gets twice its spread as the allowance instead. Cases where both runs
+    take less than ``min_seconds`` (or the timer resolution) per call are
+    skipped: their ratio is jitter."""
+    floor = max(min_seconds, time.get_clock_info("perf_counter").resolution)
+    base = {_key(row): row for row in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        old = base.get(_key(row))
+        if old is None:
+            continue
+        params = " ".join(f"{k}={v}" for k, v in row["params"].items())
+        if max(row["seconds_per_call"], old["seconds_per_call"]) < floor:
+            if log:
+                log(f"{row['kernel']:<24} {params:<28}   below {floor * 1e6:g} us, skipped")
+            continue
+        ratio = row["seconds_per_call"] / old["seconds_per_call"]
+        noise = max(row.get("spread") or 0.0, old.get("spread") or 0.0)
+        slow = ratio > 1.0 + max(threshold, 2.0 * noise)
+        if slow:
+            regressions.append((row["kernel"], row["params"], ratio))
+        if log:
+            log(f"{row['kernel']:<24} {params:<28} {ratio:7.2f}x{'  REGRESSION' if slow else ''}")
+    return regressions
+
+
+def confirm(regressions, baseline, runs=2, quick=False, repeat=5, threshold=0.25,
+            min_seconds=1e-6):
+    """Rerun the cases in ``regressions`` ``runs`` times and keep the ones
+    that are slower than the baseline every time; a one-off slowdown is
+    treated as noise."""
+    for _ in range(runs):
+        if not regressions:
+            break
+        kernels = sorted({kernel for kernel, _, _ in regressions})
+        keys = {(kernel, json.dumps(params, sort_keys=True)) for kernel, params, _ in regressions}
+        again = run(quick, repeat, kernels, log=None)
+        again["results"] = [row for row in again["results"] if _key(row) in keys]
+        regressions = compare(again, baseline, threshold, min_seconds, log=None)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--quick", action="store_true", help="fewer and smaller sizes")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="kernel names to run")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier --json run")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before a case counts as a regression")
+    parser.add_argument("--min-seconds", type=float, default=1e-6,
+                        help="cases faster than this per call are not compared")
+    parser.add_argument("--confirm", type=int, default=2,
+                        help="reruns a regression has to show up in again")
+    args = parser.parse_args(argv)
+
+    results = run(args.quick, args.repeat, args.only)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        print(f"\n--- compared with {args.compare} ---")
+        regressions = compare(results, baseline, args.threshold, args.min_seconds)
+        if regressions and args.confirm:
+            print(f"rerunning {len(regressions)} case(s) {args.confirm} more time(s)")
+            regressions = confirm(regressions, baseline, args.confirm, args.quick, args.repeat,
+                                  args.threshold, args.min_seconds)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than {1 + args.threshold:.2f}x the baseline")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Bresenham line kernels: the per-pixel generator, its run (span) form and a
+NumPy batch over many segments. No OpenGL here; DDA_BLA_GRAPHS/BLA.py
+draws with them.
+"""
+import numpy as np
+
+from .clip import bresenham_window
+
+
+def bresenham_line(x0, y0, x1, y1, trace=None, clip=None):
+    """Bresenham's line algorithm with support for all slopes.
+    ``trace`` is an optional sink from raster.trace (off by default).
+    ``clip`` is an optional (xmin, ymin, xmax, ymax) rectangle: only the
+    steps inside it are walked (raster.clip.bresenham_window), starting
+    from the closed form of the decision variable, so the pixels and
+    decision values are the unclipped ones."""
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+    x, y = x0, y0
+
+    sx = 1 if x1 >= x0 else -1
+    sy = 1 if y1 >= y0 else -1
+
+    record = trace.record if trace is not None else None
+
+    major, minor = (dx, dy) if dx > dy else (dy, dx)
+    first, last = 0, major
+    if clip is not None:
+        lo, hi = bresenham_window(x0, y0, x1, y1, *clip)
+        first, last = int(lo[0]), int(hi[0])
+    # after i steps the minor axis has advanced adv times and the decision is
+    # 2*minor*(i+1) - major - 2*major*adv (see bresenham_lines)
+    adv = (2 * minor * first + major) // (2 * max(major, 1))
+    decision = 2 * minor * (first + 1) - major - 2 * major * adv
+
+    if dx > dy:  
+        x += sx * first
+        y += sy * adv
+        for step in range(first, last + 1):
+            if record is not None:
+                record(step, x, y, decision)
+            yield x, y
+            x += sx
+            if decision >= 0:
+                y += sy
+                decision += 2 * (dy - dx)
+            else:
+                decision += 2 * dy
+    else:  
+        y += sy * first
+        x += sx * adv
+        for step in range(first, last + 1):
+            if record is not None:
+                record(step, x, y, decision)
+            yield x, y
+            y += sy
+            if decision >= 0:
+                x += sx
+                decision += 2 * (dx - dy)
+            else:
+                decision += 2 * dx
+
+
+def bresenham_spans(x0, y0, x1, y1):
+    """Span mode of bresenham_line: the same pixels as runs.
+
+    When dx > dy (x-major) yields horizontal runs (y, x_start, x_end),
+    otherwise vertical runs (x, y_start, y_end). Ends are inclusive and in
+    drawing order. Works one run at a time instead of one pixel at a time."""
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+    sx = 1 if x1 >= x0 else -1
+    sy = 1 if y1 >= y0 else -1
+
+    if dx > dy:
+        major, minor, s_major, s_minor, a0, b0 = dx, dy, sx, sy, x0, y0
+    else:
+        major, minor, s_major, s_minor, a0, b0 = dy, dx, sy, sx, y0, x0
+
+    if minor == 0:
+        yield b0, a0, a0 + s_major * major
+        return
+
+    # first step that has advanced m times along the minor axis, from the
+    # closed form used by bresenham_lines: (2*minor*i + major) // (2*major) >= m
+    start = 0
+    for m in range(minor + 1):
+        if m == minor:
+            end = major
+        else:
+            end = -(-(2 * major * (m + 1) - major) // (2 * minor)) - 1
+        yield b0 + s_minor * m, a0 + s_major * start, a0 + s_major * end
+        start = end + 1
+
+
+def bresenham_lines(x0, y0, x1, y1, first=None, last=None, clip=None):
+    """Batch Bresenham over arrays of endpoints (all octants).
+
+    Returns (pixels, offsets): pixels is an (M, 2) int32 array of (x, y) and
+    segment i owns pixels[offsets[i]:offsets[i + 1]], in the same order and
+    with the same values as ``bresenham_line`` would yield them.
+
+    ``first`` / ``last`` (inclusive, per segment or scalar) keep only that
+    range of each segment's pixel indices; since every pixel is computed in
+    closed form, the skipped pixels cost nothing. ``clip`` (xmin, ymin,
+    xmax, ymax) sets them to the part of each segment inside that rectangle
+    (raster.clip.bresenham_window)."""
+    x0 = np.atleast_1d(np.asarray(x0, dtype=np.int64))
+    y0 = np.atleast_1d(np.asarray(y0, dtype=np.int64))
+    x1 = np.atleast_1d(np.asarray(x1, dtype=np.int64))
+    y1 = np.atleast_1d(np.asarray(y1, dtype=np.int64))
+    x0, y0, x1, y1 = np.broadcast_arrays(x0, y0, x1, y1)
+
+    dx = np.abs(x1 - x0)
+    dy = np.abs(y1 - y0)
+    sx = np.where(x1 >= x0, 1, -1)
+    sy = np.where(y1 >= y0, 1, -1)
+
+    # same branch choice as bresenham_line: ties step along y
+    x_major = dx > dy
+    major = np.where(x_major, dx, dy)
+    minor = np.where(x_major, dy, dx)
+
+    if clip is not None:
+        first, last = bresenham_window(x0, y0, x1, y1, *clip)
+    start = np.zeros_like(major) if first is None else np.broadcast_to(np.maximum(first, 0), major.shape)
+    stop = major if last is None else np.minimum(last, major)
+    counts = np.maximum(stop - start + 1, 0)
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    seg = np.repeat(np.arange(len(counts)), counts)
+    i = np.arange(offsets[-1], dtype=np.int64) - offsets[seg] + start[seg]
+
+    # closed form of the decision variable: the minor axis has advanced once
+    # for every step where 2*minor*(k+1) - major >= 2*major*advanced
+    m = major[seg]
+    adv = (2 * minor[seg] * i + m) // (2 * np.maximum(m, 1))
+
+    xm = x_major[seg]
+    pixels = np.empty((len(i), 2), dtype=np.int32)
+    pixels[:, 0] = x0[seg] + sx[seg] * np.where(xm, i, adv)
+    pixels[:, 1] = y0[seg] + sy[seg] * np.where(xm, adv, i)
+    return pixels, offsets
@@ -0,0 +1,105 @@
+"""
+Midpoint circle kernels: the 8-way symmetric generator and a NumPy batch
+that emits every pixel of many circles exactly once. No OpenGL here;
+DDA_BLA_GRAPHS/Midpoint_circle.py draws with them.
+"""
+import numpy as np
+
+
+def midpoint_circle(cx, cy, radius, trace=None):
+    """Midpoint circle generator (yields 8-way symmetric integer points).
+    ``trace`` is an optional sink from raster.trace (off by default); it gets
+    the octant-local x, y and the decision parameter."""
+    x = 0
+    y = radius
+    d = 1 - radius
+    step = 0
+    record = trace.record if trace is not None else None
+
+    while x <= y:
+        p0 = (cx + x, cy + y)
+        p1 = (cx - x, cy + y)
+        p2 = (cx + x, cy - y)
+        p3 = (cx - x, cy - y)
+        p4 = (cx + y, cy + x)
+        p5 = (cx - y, cy + x)
+        p6 = (cx + y, cy - x)
+        p7 = (cx - y, cy - x)
+
+        if record is not None:
+            record(step, x, y, d)
+        step += 1
+
+        yield p0
+        yield p1
+        yield p2
+        yield p3
+        yield p4
+        yield p5
+        yield p6
+        yield p7
+
+        
+        if d < 0:
+            d += (2 * x) + 3
+        else:
+            d += (2 * (x - y)) + 5
+            y -= 1
+        x += 1
+
+
+def midpoint_circles(cx, cy, radius):
+    """Batch midpoint circles over arrays of centers and radii.
+
+    Runs the same decision recurrence as ``midpoint_circle`` for every circle
+    at once (x advances in lockstep) and emits each pixel exactly once: the
+    symmetric copies that coincide on the x == 0 and x == y seams are dropped.
+    Returns (pixels, offsets) like ``BLA.bresenham_lines``: an (M, 2) int32
+    array and circle i owns pixels[offsets[i]:offsets[i + 1]]."""
+    cx = np.atleast_1d(np.asarray(cx, dtype=np.int64))
+    cy = np.atleast_1d(np.asarray(cy, dtype=np.int64))
+    radius = np.atleast_1d(np.asarray(radius, dtype=np.int64))
+    cx, cy, radius = np.broadcast_arrays(cx, cy, radius)
+    k = len(radius)
+
+    # the octant ends once x > y; y never drops below r / sqrt(2) - 1
+    n_steps = int(np.ceil(radius.max(initial=0) / np.sqrt(2.0))) + 2
+    xs = np.arange(n_steps, dtype=np.int64)
+    ys = np.empty((n_steps, k), dtype=np.int64)
+    y = radius.copy()
+    d = 1 - radius
+    for x in range(n_steps):
+        ys[x] = y
+        neg = d < 0
+        d += np.where(neg, 2 * x + 3, 2 * (x - y) + 5)
+        y -= ~neg
+
+    # (K, steps) views in per-circle order
+    y = ys.T
+    x = np.broadcast_to(xs, y.shape)
+    active = x <= y
+
+    sx_ne0 = x != 0
+    sy_ne0 = y != 0
+    off_diag = x != y
+    cand_x = np.stack([x, -x, x, -x, y, -y, y, -y], axis=-1)
+    cand_y = np.stack([y, y, -y, -y, x, x, -x, -x], axis=-1)
+    keep = np.stack([
+        active,
+        active & sx_ne0,
+        active & sy_ne0,
+        active & sx_ne0 & sy_ne0,
+        active & off_diag,
+        active & off_diag & sy_ne0,
+        active & off_diag & sx_ne0,
+        active & off_diag & sx_ne0 & sy_ne0,
+    ], axis=-1)
+
+    counts = keep.reshape(k, -1).sum(axis=1)
+    offsets = np.zeros(k + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    owner = np.repeat(np.arange(k), counts)
+    pixels = np.empty((offsets[-1], 2), dtype=np.int32)
+    pixels[:, 0] = cand_x[keep] + cx[owner]
+    pixels[:, 1] = cand_y[keep] + cy[owner]
+    return pixels, offsets
@@ -0,0 +1,218 @@
+"""
+Line clipping ahead of rasterization, vectorized over segment batches.
+
+``outcodes`` are the Cohen-Sutherland region codes; segments whose
+endpoints share an outside region are rejected and segments with both
+endpoints inside are accepted without further work. The rest go through
+Liang-Barsky: ``clip_params`` gives the visible parameter range [t0, t1]
+of every segment, ``clip_segments`` the trimmed segments themselves.
+
+The rasterizers don't re-round trimmed endpoints, which would move their
+pixels. They take an index window instead: ``bresenham_window`` and
+``dda_window`` give the first and last step of each segment that can land
+in the rectangle, and the kernels start at ``first`` in closed form, so
+the cost scales with the visible length: a segment to (1e6, 1e6) costs what
+its on-screen part costs. The visible pixels stay exactly the same for the
+Bresenham kernels, dda_array and dda_line's "fixed" mode. dda_line's
+"float" mode can't jump to a step of its accumulated adds, so a clipped
+float walk may round a .5 tie pixel the other way (a few percent of
+segments differ somewhere); use mode="fixed" where that matters.
+
+Polygons go through Sutherland-Hodgman (``clip_polygons``), one edge of
+the rectangle at a time over the whole batch. Their bounding boxes cull the
+polygons that are fully outside and pass the fully inside ones through
+untouched, so only polygons that straddle an edge are clipped.
+
+Rectangles are (xmin, ymin, xmax, ymax), inclusive.
+"""
+import numpy as np
+
+INSIDE, LEFT, RIGHT, BOTTOM, TOP = 0, 1, 2, 4, 8
+
+
+def outcodes(x, y, xmin, ymin, xmax, ymax):
+    """Cohen-Sutherland region code of every point."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    return ((x < xmin) * LEFT | (x > xmax) * RIGHT
+            | (y < ymin) * BOTTOM | (y > ymax) * TOP)
+
+
+def clip_params(x0, y0, x1, y1, xmin, ymin, xmax, ymax):
+    """Visible parameter range (t0, t1) of segments p(t) = p0 + t (p1 - p0)
+    inside the rectangle; t0 > t1 where a segment misses it."""
+    x0, y0, x1, y1 = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=np.float64))
+                                           for v in (x0, y0, x1, y1)))
+    c0 = outcodes(x0, y0, xmin, ymin, xmax, ymax)
+    c1 = outcodes(x1, y1, xmin, ymin, xmax, ymax)
+    t0 = np.zeros(x0.shape)
+    t1 = np.ones(x0.shape)
+    t1[(c0 & c1) != 0] = -1.0
+
+    # Liang-Barsky for the segments the outcodes can't decide
+    todo = np.flatnonzero(((c0 | c1) != 0) & ((c0 & c1) == 0))
+    if len(todo):
+        dx = x1[todo] - x0[todo]
+        dy = y1[todo] - y0[todo]
+        lo, hi = t0[todo], t1[todo]
+        for p, q in ((-dx, x0[todo] - xmin), (dx, xmax - x0[todo]),
+                     (-dy, y0[todo] - ymin), (dy, ymax - y0[todo])):
+            r = np.divide(q, p, out=np.zeros_like(q), where=p != 0)
+            # parallel to this edge and outside it: nothing visible
+            hi = np.where((p == 0) & (q < 0), -1.0, hi)
+            lo = np.where(p < 0, np.maximum(lo, r), lo)
+            hi = np.where(p > 0, np.minimum(hi, r), hi)
+        t0[todo], t1[todo] = lo, hi
+    return t0, t1
+
+
+def clip_segments(segments, xmin, ymin, xmax, ymax):
+    """Trim an (N, 4) array of (x0, y0, x1, y1) segments to the rectangle.
+
+    Returns (clipped, index): the visible parts as a (K, 4) float array and
+    the index of each in ``segments``."""
+    seg = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    t0, t1 = clip_params(*seg.T, xmin, ymin, xmax, ymax)
+    index = np.flatnonzero(t0 <= t1)
+    s = seg[index]
+    d = s[:, 2:] - s[:, :2]
+    clipped = np.hstack([s[:, :2] + t0[index, None] * d, s[:, :2] + t1[index, None] * d])
+    return clipped, index
+
+
+def _index_range(a, s, lo, hi):
+    """Indices i with a + s * i in [lo, hi] for steps s = +-1."""
+    return np.where(s > 0, lo - a, a - hi), np.where(s > 0, hi - a, a - lo)
+
+
+def bresenham_window(x0, y0, x1, y1, xmin, ymin, xmax, ymax):
+    """Inclusive (first, last) pixel index of every Bresenham segment with
+    its pixel inside the rectangle, from the kernel's closed form: the major
+    axis moves every step and the minor one has advanced (2 * minor * i +
+    major) // (2 * major) times, both monotonic in i. Exact; segments that
+    miss the rectangle get last < first."""
+    ax, ay, bx, by = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=np.int64))
+                                           for v in (x0, y0, x1, y1)))
+    x_major = np.abs(bx - ax) > np.abs(by - ay)
+    a_maj, b_maj = np.where(x_major, ax, ay), np.where(x_major, bx, by)
+    a_min, b_min = np.where(x_major, ay, ax), np.where(x_major, by, bx)
+    lo_maj, hi_maj = np.where(x_major, xmin, ymin), np.where(x_major, xmax, ymax)
+    lo_min, hi_min = np.where(x_major, ymin, xmin), np.where(x_major, ymax, xmax)
+    major = np.abs(b_maj - a_maj)
+    minor = np.abs(b_min - a_min)
+    m = np.maximum(major, 1)
+
+    first, last = _index_range(a_maj, np.where(b_maj >= a_maj, 1, -1), lo_maj, hi_maj)
+    adv_lo, adv_hi = _index_range(a_min, np.where(b_min >= a_min, 1, -1), lo_min, hi_min)
+    # smallest i with adv(i) >= adv_lo and largest with adv(i) <= adv_hi
+    den = 2 * np.maximum(minor, 1)
+    i_lo = -((m - 2 * m * adv_lo) // den)
+    i_hi = -((m - 2 * m * (adv_hi + 1)) // den) - 1
+    flat = minor == 0
+    hit = (adv_lo <= 0) & (adv_hi >= 0)
+    i_lo = np.where(flat, np.where(hit, 0, major + 1), i_lo)
+    i_hi = np.where(flat, major, i_hi)
+    return np.maximum(np.maximum(first, i_lo), 0), np.minimum(np.minimum(last, i_hi), major)
+
+
+def dda_window(x0, y0, x1, y1, xmin, ymin, xmax, ymax):
+    """Inclusive (first, last) step of DDA segments whose rounded pixel can
+    fall inside the rectangle (step i sits at p0 + i / steps * (p1 - p0),
+    steps = int(max(|dx|, |dy|))). Conservative by at most a step at each
+    end; segments that miss the rectangle get last < first."""
+    x0, y0, x1, y1 = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=np.float64))
+                                           for v in (x0, y0, x1, y1)))
+    steps = np.maximum(np.abs(x1 - x0), np.abs(y1 - y0)).astype(np.int64)
+    # a point rounds into [xmin, xmax] from anywhere within half a pixel
+    t0, t1 = clip_params(x0, y0, x1, y1, xmin - 0.5, ymin - 0.5, xmax + 0.5, ymax + 0.5)
+    first = np.maximum(np.floor(t0 * steps).astype(np.int64), 0)
+    last = np.minimum(np.ceil(t1 * steps).astype(np.int64), steps)
+    miss = t0 > t1
+    return np.where(miss, 1, first), np.where(miss, 0, last)
+
+
+def _clip_edge(v, n, axis, bound, keep_above):
+    """One Sutherland-Hodgman pass: clip (P, K, 2) polygons with n[p] valid
+    vertices to the half-plane v[..., axis] >= bound (``keep_above``) or
+    <= bound. Returns the new (P, K', 2) vertices and counts."""
+    p_count, k = v.shape[:2]
+    i = np.arange(k)
+    valid = i < n[:, None]
+    following = np.where(i + 1 < n[:, None], i + 1, 0)
+    cur = v
+    nxt = np.take_along_axis(v, following[..., None], axis=1)
+    side = 1.0 if keep_above else -1.0
+    d_cur = (cur[..., axis] - bound) * side
+    d_nxt = (nxt[..., axis] - bound) * side
+    in_cur = d_cur >= 0
+    in_nxt = d_nxt >= 0
+    cross = valid & (in_cur != in_nxt)
+    t = np.divide(d_cur, d_cur - d_nxt, out=np.zeros_like(d_cur), where=cross)
+    hit = cur + t[..., None] * (nxt - cur)
+    hit[..., axis] = bound
+
+    # every edge emits its crossing (if any), then its end vertex if inside
+    cand = np.stack([hit, nxt], axis=2).reshape(p_count, 2 * k, 2)
+    emit = np.stack([cross, valid & in_nxt], axis=2).reshape(p_count, 2 * k)
+    counts = emit.sum(axis=1)
+    out = np.empty((p_count, max(int(counts.max(initial=0)), 1), 2))
+    rows = np.broadcast_to(np.arange(p_count)[:, None], emit.shape)[emit]
+    out[rows, (np.cumsum(emit, axis=1) - 1)[emit]] = cand[emit]
+    return out, counts
+
+
+def _pad(v, n, m):
+    """(P, K, 2) polygons with n[p] valid vertices -> (P, m, 2), repeating
+    each polygon's last vertex."""
+    last = np.minimum(np.arange(m), n[:, None] - 1)
+    return np.take_along_axis(v, last[..., None], axis=1)
+
+
+def clip_polygons_xy(polys, xmin, ymin, xmax, ymax):
+    """Clip a (P, N, 2) batch of convex polygons (vertex arrays) to the
+    rectangle.
+
+    Returns (clipped, index): a (K, M, 2) array of the visible polygons,
+    M >= N, shorter ones padded by repeating their last vertex (harmless
+    for a fill or a fan), and the index of each in ``polys``. Polygons
+    left with fewer than 3 vertices are culled."""
+    xy = np.asarray(polys, dtype=np.float64)
+    lo = xy.min(axis=1)
+    hi = xy.max(axis=1)
+    outside = (hi[:, 0] < xmin) | (lo[:, 0] > xmax) | (hi[:, 1] < ymin) | (lo[:, 1] > ymax)
+    inside = (lo[:, 0] >= xmin) & (hi[:, 0] <= xmax) & (lo[:, 1] >= ymin) & (hi[:, 1] <= ymax)
+    straddle = np.flatnonzero(~outside & ~inside)
+    index = np.flatnonzero(inside)
+    if len(straddle) == 0:
+        return xy[index], index
+
+    v = xy[straddle]
+    n = np.full(len(v), v.shape[1])
+    for axis, bound, keep_above in ((0, xmin, True), (0, xmax, False), (1, ymin, True), (1, ymax, False)):
+        v, n = _clip_edge(v, n, axis, bound, keep_above)
+    kept = n >= 3
+    v, n, straddle = v[kept], n[kept], straddle[kept]
+
+    m = max(xy.shape[1], v.shape[1])
+    whole = np.full(len(index), xy.shape[1])
+    clipped = np.concatenate([_pad(xy[index], whole, m), _pad(v, n, m)])
+    index = np.concatenate([index, straddle])
+    order = np.argsort(index, kind="stable")
+    return clipped[order], index[order]
+
+
+def clip_polygons(polys, xmin, ymin, xmax, ymax):
+    """Sutherland-Hodgman for homogeneous polygons straight out of a
+    transform: a (3, N) polygon or a (P, 3, N) batch (convex, w != 0).
+
+    Returns (clipped, index) like clip_polygons_xy, with ``clipped`` as a
+    (K, 3, M) homogeneous batch (w = 1), so ``for v in clipped`` yields
+    (3, M) polygons the demos' draw functions take."""
+    h = np.asarray(polys, dtype=np.float64)
+    if h.ndim == 2:
+        h = h[None]
+    xy = (h[:, :2] / h[:, 2:3]).transpose(0, 2, 1)
+    clipped, index = clip_polygons_xy(xy, xmin, ymin, xmax, ymax)
+    out = np.ones((len(clipped), 3, clipped.shape[1]))
+    out[:, :2] = clipped.transpose(0, 2, 1)
+    return out, index
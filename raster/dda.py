@@ -0,0 +1,189 @@
+"""
+Shared DDA line kernel used by DDA_algorithm.dda_raster and
+LineGraph.dda_segment.
+
+Modes of the generator ``dda_line``:
+- "float": the original loop, a float add per step followed by round()
+  (Python round, so ties go to the even pixel).
+- "fixed": 16.16 fixed-point integers, one int add and a shift per step.
+  Ties round up and the position can't drift like repeated float adds can,
+  so its pixels are a different (if close) line: on random integer
+  endpoints about one segment in five differs from "float" somewhere.
+
+``dda_array`` is the NumPy mode. It accumulates the steps with np.cumsum,
+which adds in the same order as the float loop, and rounds with np.rint
+(ties to even), so it gives exactly the "float" pixels, returned as an
+(N, 2) int32 array. ``dda_spans`` gives the same pixels as horizontal or
+vertical runs. tests/test_dda.py pins which modes agree.
+
+Run ``python -m raster.dda`` for a quick benchmark of the three modes.
+"""
+import numpy as np
+
+from .clip import dda_window
+
+FIX_SHIFT = 16
+FIX_ONE = 1 << FIX_SHIFT
+FIX_HALF = FIX_ONE >> 1
+
+
+def dda_line(x0, y0, x1, y1, mode="float", trace=None, clip=None):
+    """Yield integer pixels from (x0, y0) to (x1, y1), any slope.
+
+    ``clip`` is an optional (xmin, ymin, xmax, ymax) rectangle: only the
+    steps that can land inside it are walked (raster.clip.dda_window) and
+    only pixels inside it are yielded (and traced). "fixed" gives exactly
+    the unclipped pixels inside the rectangle. A
+    clipped "float" walk starts at x0 + first * x_step instead of the
+    accumulated adds, which differ in the last bits, so pixels whose
+    position sits on a .5 tie can round the other way; use mode="fixed"
+    when the clipped pixels must match."""
+    dx = x1 - x0
+    dy = y1 - y0
+    record = trace.record if trace is not None else None
+
+    steps = int(max(abs(dx), abs(dy)))
+    first, last = 0, steps
+    if clip is not None:
+        xmin, ymin, xmax, ymax = clip
+        # the rounded 16.16 step drifts up to half a unit per step
+        pad = steps / FIX_ONE if mode == "fixed" else 0.0
+        lo, hi = dda_window(x0, y0, x1, y1, xmin - pad, ymin - pad, xmax + pad, ymax + pad)
+        first, last = int(lo[0]), int(hi[0])
+        if last < first:
+            return
+    if steps == 0:
+        # single point
+        if clip is not None and not (xmin <= round(x0) <= xmax and ymin <= round(y0) <= ymax):
+            return
+        if record is not None:
+            record(0, round(x0), round(y0), x0, y0)
+        yield round(x0), round(y0)
+        return
+
+    if mode == "float":
+        x_step = dx / steps
+        y_step = dy / steps
+        x = x0 + first * x_step if first else x0
+        y = y0 + first * y_step if first else y0
+        for idx in range(first, last + 1):
+            rx, ry = round(x), round(y)
+            # the window is conservative by up to a step at each end
+            if clip is None or (xmin <= rx <= xmax and ymin <= ry <= ymax):
+                if record is not None:
+                    record(idx, rx, ry, x, y)
+                yield rx, ry
+            x += x_step
+            y += y_step
+    elif mode == "fixed":
+        # positions carry +0.5 so the shift rounds instead of flooring
+        x = int(round(x0 * FIX_ONE)) + FIX_HALF
+        y = int(round(y0 * FIX_ONE)) + FIX_HALF
+        x_step = int(round(dx * FIX_ONE / steps))
+        y_step = int(round(dy * FIX_ONE / steps))
+        x += first * x_step
+        y += first * y_step
+        for idx in range(first, last + 1):
+            rx, ry = x >> FIX_SHIFT, y >> FIX_SHIFT
+            # the padded window runs past the rectangle
+            if clip is None or (xmin <= rx <= xmax and ymin <= ry <= ymax):
+                if record is not None:
+                    record(idx, rx, ry, (x - FIX_HALF) / FIX_ONE, (y - FIX_HALF) / FIX_ONE)
+                yield rx, ry
+            x += x_step
+            y += y_step
+    else:
+        raise ValueError(f"unknown DDA mode: {mode!r}")
+
+
+def dda_array(x0, y0, x1, y1, clip=None):
+    """NumPy DDA: all pixels of the segment as an (N, 2) int32 array, the
+    same pixels as dda_line(mode="float").
+
+    Positions are the running sums x0 + x_step + x_step + ... (np.cumsum
+    adds left to right, like the loop's x += x_step), rounded with np.rint
+    (ties to even, like round()). A closed form x0 + i * dx / steps would
+    land on exact .5 ties the accumulated position misses. With ``clip``
+    (xmin, ymin, xmax, ymax) only the pixels inside the rectangle are
+    returned; the sums still run from the first step to the last one of
+    raster.clip.dda_window."""
+    dx = x1 - x0
+    dy = y1 - y0
+    steps = int(max(abs(dx), abs(dy)))
+    first, last = 0, steps
+    if clip is not None:
+        lo, hi = dda_window(x0, y0, x1, y1, *clip)
+        first, last = int(lo[0]), int(hi[0])
+    if steps == 0:
+        pos = np.array([[x0], [y0]], dtype=np.float64)[:, :last - first + 1]
+    else:
+        pos = np.empty((2, last + 1))
+        pos[0, 0], pos[1, 0] = x0, y0
+        pos[0, 1:] = dx / steps
+        pos[1, 1:] = dy / steps
+        np.cumsum(pos, axis=1, out=pos)
+        pos = pos[:, first:]
+    out = np.empty((pos.shape[1], 2), dtype=np.int32)
+    out[:, 0] = np.rint(pos[0])
+    out[:, 1] = np.rint(pos[1])
+    if clip is not None:
+        xmin, ymin, xmax, ymax = clip
+        x, y = out[:, 0], out[:, 1]
+        out = out[(x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)]
+    return out
+
+
+def pixel_spans(pixels, x_major):
+    """Group an (N, 2) pixel array of one line into runs.
+
+    x-major lines give (y, x_start, x_end) rows, others (x, y_start, y_end);
+    ends are inclusive and in drawing order. Returns an (R, 3) int array."""
+    pixels = np.asarray(pixels).reshape(-1, 2)
+    major, minor = (0, 1) if x_major else (1, 0)
+    if len(pixels) == 0:
+        return np.empty((0, 3), dtype=np.int32)
+    breaks = np.flatnonzero(np.diff(pixels[:, minor])) + 1
+    first = np.concatenate([[0], breaks])
+    last = np.concatenate([breaks - 1, [len(pixels) - 1]])
+    out = np.empty((len(first), 3), dtype=np.int32)
+    out[:, 0] = pixels[first, minor]
+    out[:, 1] = pixels[first, major]
+    out[:, 2] = pixels[last, major]
+    return out
+
+
+def dda_spans(x0, y0, x1, y1, mode="numpy"):
+    """Span mode of the DDA: yields (y, x_start, x_end) runs when
+    |dx| > |dy|, otherwise (x, y_start, y_end). ``mode`` is "numpy" or
+    one of the dda_line modes, whose pixels it groups. With non-integer
+    endpoints the DDA can skip a pixel along the major axis; the runs cover
+    such gaps."""
+    if mode == "numpy":
+        pixels = dda_array(x0, y0, x1, y1)
+    else:
+        pixels = np.array(list(dda_line(x0, y0, x1, y1, mode=mode)), dtype=np.int32)
+    for row in pixel_spans(pixels, abs(x1 - x0) > abs(y1 - y0)).tolist():
+        yield tuple(row)
+
+
+def _benchmark(lengths=(100, 1000, 10000, 100000), repeat=5):
+    import timeit
+
+    print(f"{'length':>8} | {'float loop':>12} | {'16.16 fixed':>12} | {'numpy':>12}   (Mpix/s)")
+    for n in lengths:
+        args = (3.3, 7.1, 3.3 + n, 7.1 + n * 0.37)
+        runs = {
+            "float": lambda: sum(1 for _ in dda_line(*args, mode="float")),
+            "fixed": lambda: sum(1 for _ in dda_line(*args, mode="fixed")),
+            "numpy": lambda: dda_array(*args),
+        }
+        rates = []
+        for name in ("float", "fixed", "numpy"):
+            number = max(1, 200000 // n)
+            best = min(timeit.repeat(runs[name], number=number, repeat=repeat)) / number
+            rates.append((n + 1) / best / 1e6)
+        print(f"{n:>8} | {rates[0]:>12.2f} | {rates[1]:>12.2f} | {rates[2]:>12.2f}")
+
+
+if __name__ == "__main__":
+    _benchmark()
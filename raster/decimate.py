@@ -0,0 +1,92 @@
+"""
+Per-column min/max decimation for streaming line graphs.
+
+MinMaxEnvelope folds an unbounded stream of samples into at most
+``columns`` columns (one per pixel column of the plot). Column i covers
+samples [i * span, (i + 1) * span) and keeps their min, max and last value.
+When the stream outgrows the columns, neighbouring columns are merged
+pairwise and ``span`` doubles, so the whole history always fits and both
+memory and drawing cost depend on the column count, never on how many
+samples have been seen. Chunks are reduced with reshape + min/max, not
+per sample.
+"""
+import numpy as np
+
+
+class MinMaxEnvelope:
+    def __init__(self, columns):
+        if columns < 2 or columns % 2:
+            raise ValueError("columns must be an even number >= 2")
+        self.columns = columns
+        self.span = 1
+        self.count = 0
+        self.lo = np.empty(columns)
+        self.hi = np.empty(columns)
+        self.last = np.empty(columns)
+
+    def __len__(self):
+        """Number of columns in use."""
+        return -(-self.count // self.span)
+
+    def clear(self):
+        self.span = 1
+        self.count = 0
+
+    def _compact(self):
+        n = len(self)
+        pairs = n // 2
+        lo, hi, last = self.lo, self.hi, self.last
+        lo[:pairs] = np.minimum(lo[0:2 * pairs:2], lo[1:2 * pairs:2])
+        hi[:pairs] = np.maximum(hi[0:2 * pairs:2], hi[1:2 * pairs:2])
+        last[:pairs] = last[1:2 * pairs:2]
+        if n % 2:
+            lo[pairs], hi[pairs], last[pairs] = lo[n - 1], hi[n - 1], last[n - 1]
+        self.span *= 2
+
+    def _ingest(self, x):
+        span = self.span
+        col, used = divmod(self.count, span)
+        if used:
+            # top up the partly filled column
+            head = x[:span - used]
+            self.lo[col] = min(self.lo[col], head.min())
+            self.hi[col] = max(self.hi[col], head.max())
+            self.last[col] = head[-1]
+            x = x[len(head):]
+            col += 1
+        full = len(x) // span
+        if full:
+            block = x[:full * span].reshape(full, span)
+            block.min(axis=1, out=self.lo[col:col + full])
+            block.max(axis=1, out=self.hi[col:col + full])
+            self.last[col:col + full] = block[:, -1]
+            col += full
+        tail = x[full * span:]
+        if len(tail):
+            self.lo[col] = tail.min()
+            self.hi[col] = tail.max()
+            self.last[col] = tail[-1]
+
+    def extend(self, samples):
+        """Add a chunk of samples (array-like, in stream order)."""
+        x = np.asarray(samples, dtype=np.float64).ravel()
+        while len(x):
+            room = self.columns * self.span - self.count
+            if room == 0:
+                self._compact()
+                continue
+            part = x[:room]
+            self._ingest(part)
+            self.count += len(part)
+            x = x[len(part):]
+
+    def envelope(self):
+        """(lo, hi) per used column, widened to reach the previous column's
+        last sample so consecutive columns draw as one connected trace."""
+        n = len(self)
+        lo = self.lo[:n].copy()
+        hi = self.hi[:n].copy()
+        if n > 1:
+            np.minimum(lo[1:], self.last[:n - 1], out=lo[1:])
+            np.maximum(hi[1:], self.last[:n - 1], out=hi[1:])
+        return lo, hi
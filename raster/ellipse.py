@@ -0,0 +1,180 @@
+"""
+Midpoint ellipse kernels: the original float generator, the integer-only
+duplicate-free one, a NumPy batch of the latter and the parametric
+outline. No OpenGL here; Lab_3/Ellipse.py draws with them.
+"""
+import numpy as np
+
+from .trigtable import arc_points
+
+
+def midpoint_ellipse_points(cx, cy, rx, ry):
+    """
+    Generator for points on an ellipse using the midpoint algorithm.
+    Yields symmetric integer points (x, y) in screen coordinates.
+    """
+    x, y = 0, ry
+    rx2 = rx * rx
+    ry2 = ry * ry
+    dx = 2 * ry2 * x
+    dy = 2 * rx2 * y
+
+    # Decision parameter for region 1
+    d1 = ry2 - (rx2 * ry) + (0.25 * rx2)
+    while dx < dy:
+        yield (cx + x, cy + y)
+        yield (cx - x, cy + y)
+        yield (cx + x, cy - y)
+        yield (cx - x, cy - y)
+        if d1 < 0:
+            x += 1
+            dx += 2 * ry2
+            d1 += dx + ry2
+        else:
+            x += 1
+            y -= 1
+            dx += 2 * ry2
+            dy -= 2 * rx2
+            d1 += dx - dy + ry2
+
+    # Decision parameter for region 2
+    d2 = (ry2 * (x + 0.5) * (x + 0.5)) + (rx2 * (y - 1) * (y - 1)) - (rx2 * ry2)
+    while y >= 0:
+        yield (cx + x, cy + y)
+        yield (cx - x, cy + y)
+        yield (cx + x, cy - y)
+        yield (cx - x, cy - y)
+        if d2 > 0:
+            y -= 1
+            dy -= 2 * rx2
+            d2 += rx2 - dy
+        else:
+            y -= 1
+            x += 1
+            dx += 2 * ry2
+            dy -= 2 * rx2
+            d2 += dx - dy + rx2
+
+
+def midpoint_ellipse_points_int(cx, cy, rx, ry):
+    """
+    Integer-only midpoint ellipse: the decision parameters are scaled by 4 so
+    the 0.25 / 0.5 terms become integers (same sign tests, same points).
+    Symmetric copies that land on the axes (x == 0 or y == 0) are skipped,
+    so every point is yielded exactly once and no dedup pass is needed.
+    """
+    x, y = 0, ry
+    rx2 = rx * rx
+    ry2 = ry * ry
+    dx = 2 * ry2 * x
+    dy = 2 * rx2 * y
+
+    # 4 * region 1 decision parameter
+    d1 = 4 * ry2 - 4 * rx2 * ry + rx2
+    while dx < dy:
+        yield (cx + x, cy + y)
+        if x:
+            yield (cx - x, cy + y)
+        if y:
+            yield (cx + x, cy - y)
+            if x:
+                yield (cx - x, cy - y)
+        x += 1
+        dx += 2 * ry2
+        if d1 < 0:
+            d1 += 4 * (dx + ry2)
+        else:
+            y -= 1
+            dy -= 2 * rx2
+            d1 += 4 * (dx - dy + ry2)
+
+    # 4 * region 2 decision parameter
+    d2 = ry2 * (2 * x + 1) * (2 * x + 1) + 4 * rx2 * (y - 1) * (y - 1) - 4 * rx2 * ry2
+    while y >= 0:
+        yield (cx + x, cy + y)
+        if x:
+            yield (cx - x, cy + y)
+        if y:
+            yield (cx + x, cy - y)
+            if x:
+                yield (cx - x, cy - y)
+        y -= 1
+        dy -= 2 * rx2
+        if d2 > 0:
+            d2 += 4 * (rx2 - dy)
+        else:
+            x += 1
+            dx += 2 * ry2
+            d2 += 4 * (dx - dy + rx2)
+
+
+def midpoint_ellipses(cx, cy, rx, ry):
+    """
+    NumPy batch of midpoint_ellipse_points_int over arrays of centers and
+    radii. Every ellipse steps in lockstep (masked once it leaves a region).
+    Returns (pixels, offsets): an (M, 2) int32 array, ellipse i owning
+    pixels[offsets[i]:offsets[i + 1]] in the generator's order.
+    """
+    cx, cy, rx, ry = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=np.int64))
+                                           for v in (cx, cy, rx, ry)))
+    k = len(rx)
+    rx2 = rx * rx
+    ry2 = ry * ry
+    x = np.zeros(k, dtype=np.int64)
+    y = ry.copy()
+    dx = np.zeros(k, dtype=np.int64)
+    dy = 2 * rx2 * y
+    xs, ys, act = [], [], []
+
+    d1 = 4 * ry2 - 4 * rx2 * ry + rx2
+    while True:
+        on = dx < dy
+        if not on.any():
+            break
+        xs.append(x.copy()); ys.append(y.copy()); act.append(on)
+        x += on
+        dx += 2 * ry2 * on
+        down = on & (d1 >= 0)
+        y -= down
+        dy -= 2 * rx2 * down
+        d1 += np.where(down, 4 * (dx - dy + ry2), np.where(on, 4 * (dx + ry2), 0))
+
+    d2 = ry2 * (2 * x + 1) ** 2 + 4 * rx2 * (y - 1) ** 2 - 4 * rx2 * ry2
+    while True:
+        on = y >= 0
+        if not on.any():
+            break
+        xs.append(x.copy()); ys.append(y.copy()); act.append(on)
+        y -= on
+        dy -= 2 * rx2 * on
+        right = on & (d2 <= 0)
+        x += right
+        dx += 2 * ry2 * right
+        d2 += np.where(right, 4 * (dx - dy + rx2), np.where(on, 4 * (rx2 - dy), 0))
+
+    if not xs:
+        return np.empty((0, 2), dtype=np.int32), np.zeros(k + 1, dtype=np.int64)
+    # (K, steps) in per-ellipse order
+    x = np.stack(xs, axis=1)
+    y = np.stack(ys, axis=1)
+    on = np.stack(act, axis=1)
+    cand_x = np.stack([x, -x, x, -x], axis=-1)
+    cand_y = np.stack([y, y, -y, -y], axis=-1)
+    keep = np.stack([on, on & (x != 0), on & (y != 0), on & (x != 0) & (y != 0)], axis=-1)
+
+    counts = keep.reshape(k, -1).sum(axis=1)
+    offsets = np.zeros(k + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    owner = np.repeat(np.arange(k), counts)
+    pixels = np.empty((offsets[-1], 2), dtype=np.int32)
+    pixels[:, 0] = cand_x[keep] + cx[owner]
+    pixels[:, 1] = cand_y[keep] + cy[owner]
+    return pixels, offsets
+
+
+def ellipse_parametric(cx, cy, rx, ry, segments=200):
+    """
+    Parametric polygon approximation of the ellipse (useful for outline/fill).
+    Returns a (segments, 2) float array, scaled from the cached unit circle.
+    """
+    return arc_points(cx, cy, rx, ry, segments)
@@ -0,0 +1,288 @@
+"""
+Software framebuffer: a preallocated uint8 RGBA NumPy image with the few
+primitives the demos use (points, lines, polygons, quads), so every
+script can render without a window or a GPU.
+
+World coordinates are mapped through an ortho box exactly like glOrtho /
+gluOrtho2D; row 0 of the image is the top of the view.
+"""
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from .scanfill import scanline_spans, expand_spans
+from .wu import wu_lines
+from .clip import clip_params, clip_segments
+
+
+def _to_rgba8(color):
+    """glColor-style float color(s), 3 or 4 components -> uint8 RGBA."""
+    if isinstance(color, np.ndarray) and color.dtype == np.uint8:
+        return color
+    # float32 like GL, so e.g. 0.9 * 255 rounds to 230 as it does on screen
+    c = np.asarray(color, dtype=np.float32)
+    if c.shape[-1] == 3:
+        c = np.concatenate([c, np.ones(c.shape[:-1] + (1,), dtype=np.float32)], axis=-1)
+    return np.clip(np.round(c * np.float32(255)), 0, 255).astype(np.uint8)
+
+
+class Framebuffer:
+    def __init__(self, width, height, clear_color=(0.0, 0.0, 0.0, 1.0), pixels=None):
+        self.width = width
+        self.height = height
+        # ``pixels`` lets the image live in an existing (height, width, 4)
+        # uint8 buffer, e.g. shared memory (see raster.tiles)
+        self.pixels = np.empty((height, width, 4), dtype=np.uint8) if pixels is None else pixels
+        self.clear_color = clear_color
+        # GL demos never enable GL_BLEND, so alpha is stored, not blended
+        self.blend = False
+        # like GL_LINE_SMOOTH: lines() writes Wu coverage through coverage()
+        self.line_smooth = False
+        self.ortho(0, width, 0, height)
+        self.clear()
+
+    def ortho(self, left, right, bottom, top):
+        self.left, self.right, self.bottom, self.top = left, right, bottom, top
+        self._sx = self.width / float(right - left)
+        self._sy = self.height / float(top - bottom)
+
+    def clear(self, color=None):
+        if color is not None:
+            self.clear_color = color
+        self.pixels[...] = _to_rgba8(self.clear_color)
+
+    def to_pixel(self, pts):
+        """(N, 2) world coords -> (N, 2) float pixel coords (x right, y down)."""
+        pts = np.asarray(pts, dtype=float).reshape(-1, 2)
+        out = np.empty_like(pts)
+        out[:, 0] = (pts[:, 0] - self.left) * self._sx
+        out[:, 1] = (self.top - pts[:, 1]) * self._sy
+        return out
+
+    def blit(self, xs, ys, color):
+        """Write integer pixel coords (already in image space, x right, y
+        down), clipping to the image; blended like the other primitives.
+
+        ``color`` is one glColor-style tuple or an (N, 3|4) array giving a
+        color per pixel."""
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        keep = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        xs, ys = xs[keep], ys[keep]
+        rgba = _to_rgba8(color)
+        if rgba.ndim == 2:
+            rgba = rgba[keep]
+        if self.blend and np.any(rgba[..., 3] < 255):
+            a = rgba[..., 3:4] / 255.0
+            dst = self.pixels[ys, xs].astype(float)
+            dst[:, :3] = dst[:, :3] * (1.0 - a) + rgba[..., :3] * a
+            dst[:, 3] = np.maximum(dst[:, 3], rgba[..., 3])
+            self.pixels[ys, xs] = np.round(dst).astype(np.uint8)
+        else:
+            self.pixels[ys, xs] = rgba
+
+    def coverage(self, xs, ys, weights, color):
+        """Blend ``color`` into integer pixel coords with a coverage weight in
+        [0, 1] per pixel, e.g. from raster.wu.wu_lines.
+
+        Coverage is accumulated before blending: weights of repeated pixels
+        are summed (clipped to 1) and their colors averaged by weight, so a
+        strip's shared vertices and crossing lines blend once per pixel.
+        The result is composited as alpha = coverage * color alpha, whatever
+        ``blend`` says. ``color`` is one color or one per pixel."""
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+        keep = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height) & (weights > 0)
+        rgba = _to_rgba8(color).astype(np.float64)
+        if rgba.ndim == 2:
+            rgba = rgba[keep]
+        index, inverse = np.unique(ys[keep] * self.width + xs[keep], return_inverse=True)
+        w = weights[keep]
+        total = np.bincount(inverse, w, minlength=len(index))
+        if rgba.ndim == 2:
+            rgba = np.stack([np.bincount(inverse, w * rgba[:, c], minlength=len(index))
+                             for c in range(4)], axis=1) / total[:, None]
+        a = np.minimum(total, 1.0)[:, None] * (rgba[..., 3:4] / 255.0)
+        flat = self.pixels.reshape(-1, 4)
+        dst = flat[index].astype(float)
+        dst[:, :3] = dst[:, :3] * (1.0 - a) + rgba[..., :3] * a
+        dst[:, 3] = np.maximum(dst[:, 3], a[:, 0] * 255.0)
+        flat[index] = np.round(dst).astype(np.uint8)
+
+    def _stamp(self, xs, ys, color, size):
+        """Write a ``size`` x ``size`` square around each integer pixel."""
+        size = max(1, int(round(size)))
+        if size > 1:
+            lo = -(size // 2)
+            ox, oy = np.meshgrid(np.arange(lo, lo + size), np.arange(lo, lo + size))
+            xs = (xs[:, None] + ox.ravel()).ravel()
+            ys = (ys[:, None] + oy.ravel()).ravel()
+            if np.ndim(color) == 2:
+                color = np.repeat(np.asarray(color, dtype=float), size * size, axis=0)
+        self.blit(xs, ys, color)
+
+    def points(self, pts, color, size=1):
+        """Square points of ``size`` pixels, like glPointSize + GL_POINTS.
+        ``color`` may be a single color or one color per point."""
+        if len(pts) == 0:
+            return
+        p = np.floor(self.to_pixel(pts)).astype(np.int64)
+        self._stamp(p[:, 0], p[:, 1], color, size)
+
+    def lines(self, segments, color, width=1):
+        """Draw an (N, 4) array of (x0, y0, x1, y1) world-space segments.
+        With ``line_smooth`` they are antialiased (``color`` may then also be
+        one color per segment)."""
+        seg = np.asarray(segments, dtype=float).reshape(-1, 4)
+        if len(seg) == 0:
+            return
+        a = self.to_pixel(seg[:, :2])
+        b = self.to_pixel(seg[:, 2:])
+        # clip to the image (plus the line width) so off-screen parts cost nothing
+        pad = width + 2
+        box = (-pad, -pad, self.width + pad, self.height + pad)
+        if self.line_smooth:
+            # trimmed ends land off-screen, so their partial coverage never shows
+            clipped, index = clip_segments(np.hstack([a, b]) - 0.5, *box)
+            # wu_lines puts pixel centers on integers
+            pixels, weights, offsets = wu_lines(*clipped.T, width)
+            if np.ndim(color) == 2:
+                color = np.repeat(np.asarray(color, dtype=float)[index], np.diff(offsets), axis=0)
+            self.coverage(pixels[:, 0], pixels[:, 1], weights, color)
+            return
+        d = b - a
+        steps = np.ceil(np.abs(d).max(axis=1)).astype(np.int64)
+        t0, t1 = clip_params(a[:, 0], a[:, 1], b[:, 0], b[:, 1], *box)
+        first = np.maximum(np.floor(t0 * steps).astype(np.int64), 0)
+        counts = np.maximum(np.minimum(np.ceil(t1 * steps).astype(np.int64), steps) - first + 1, 0)
+        counts[t0 > t1] = 0
+        idx = np.repeat(np.arange(len(seg)), counts)
+        start = np.repeat(np.cumsum(counts) - counts, counts)
+        k = np.arange(counts.sum()) - start + first[idx]
+        n = np.maximum(steps[idx], 1)
+        # multiply before dividing so axis-aligned lines land exactly on pixels
+        xs = np.floor(a[idx, 0] + d[idx, 0] * k / n).astype(np.int64)
+        ys = np.floor(a[idx, 1] + d[idx, 1] * k / n).astype(np.int64)
+        self._stamp(xs, ys, color, width)
+
+    def spans(self, runs, color, vertical=False):
+        """Fill (row, start, end) runs given in image pixel coordinates with
+        one slice assignment each; ``vertical`` runs are (col, start, end)."""
+        rgba = _to_rgba8(color)
+        for fixed, a, b in runs:
+            if a > b:
+                a, b = b, a
+            if vertical:
+                if 0 <= fixed < self.width:
+                    self.pixels[max(a, 0):max(b + 1, 0), fixed] = rgba
+            elif 0 <= fixed < self.height:
+                self.pixels[fixed, max(a, 0):max(b + 1, 0)] = rgba
+
+    def line_strip(self, pts, color, closed=False, width=1):
+        pts = np.asarray(pts, dtype=float).reshape(-1, 2)
+        if len(pts) < 2:
+            return
+        if closed:
+            pts = np.vstack([pts, pts[:1]])
+        self.lines(np.hstack([pts[:-1], pts[1:]]), color, width)
+
+    def polygons(self, polys, colors):
+        """Fill many polygons (convex or concave, even-odd rule) with one
+        scanline pass. ``colors`` is one color or one per polygon; where
+        polygons overlap the later one wins, as with GL draw order. Blending
+        is applied once per pixel per call."""
+        if isinstance(polys, np.ndarray) and polys.ndim == 3:
+            polys = self.to_pixel(polys).reshape(polys.shape)
+        else:
+            polys = [self.to_pixel(p) for p in polys]
+        rows, xa, xb, owner = scanline_spans(polys, 0, self.height)
+        if len(rows) == 0:
+            return
+        order = np.argsort(owner, kind="stable")
+        rows, xa, xb, owner = rows[order], xa[order], xb[order], owner[order]
+        rgba = _to_rgba8(colors)
+        if self.blend and np.any(rgba[..., 3] < 255):
+            xs, ys, span = expand_spans(rows, xa, xb, self.width)
+            if rgba.ndim == 2:
+                rgba = rgba[owner[span]]
+            self.blit(xs, ys, rgba)
+            return
+        # opaque: one row slice per span, in owner order so later ones win
+        xa = np.maximum(xa, 0)
+        xb = np.minimum(xb, self.width - 1) + 1
+        hit = xb > xa
+        rows, xa, xb, owner = rows[hit].tolist(), xa[hit].tolist(), xb[hit].tolist(), owner[hit]
+        if rgba.ndim == 1:
+            for y, a, b in zip(rows, xa, xb):
+                self.pixels[y, a:b] = rgba
+        else:
+            for y, a, b, c in zip(rows, xa, xb, rgba[owner]):
+                self.pixels[y, a:b] = c
+
+    def polygon(self, pts, color):
+        """Fill one polygon (GL_POLYGON / GL_TRIANGLE_FAN, concave too)."""
+        self.polygons([pts], color)
+
+    def quads(self, pts, color):
+        """GL_QUADS: every 4 consecutive vertices form one filled quad."""
+        self.polygons(np.asarray(pts, dtype=float).reshape(-1, 4, 2), color)
+
+    def save_ppm(self, path):
+        with open(path, "wb") as f:
+            f.write(b"P6\n%d %d\n255\n" % (self.width, self.height))
+            f.write(np.ascontiguousarray(self.pixels[:, :, :3]).tobytes())
+
+    def save_png(self, path):
+        # RGB like the on-screen window; alpha only matters while blending
+        raw = np.empty((self.height, self.width * 3 + 1), dtype=np.uint8)
+        raw[:, 0] = 0  # filter type: none
+        raw[:, 1:] = self.pixels[:, :, :3].reshape(self.height, -1)
+
+        def chunk(tag, data):
+            body = tag + data
+            return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+            f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)))
+            f.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)))
+            f.write(chunk(b"IEND", b""))
+
+    def save(self, path):
+        if str(path).lower().endswith(".ppm"):
+            self.save_ppm(path)
+        else:
+            self.save_png(path)
+
+
+def save_frame(fb, out, index=None):
+    """Write a frame for a headless run.
+
+    ``out`` containing a ``%`` pattern (e.g. ``"frames/rot_%04d.png"``) writes
+    one file per call with an index; a plain path is only written by the
+    final call without an index, so long animations don't rewrite the same
+    file. The demos default to a plain path. Missing directories are created."""
+    if out is None:
+        return
+    if "%" in out:
+        if index is None:
+            return
+        path = out % index
+    elif index is None:
+        path = out
+    else:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fb.save(path)
+
+
+def out_arg(argv, default):
+    """The path after ``--out`` on a demo's command line, else ``default``.
+    Per-frame dumps are asked for with a pattern:
+    ``--out frames/rotation_%04d.png``."""
+    if "--out" in argv[:-1]:
+        return argv[argv.index("--out") + 1]
+    return default
@@ -0,0 +1,201 @@
+"""
+Block-letter glyphs and a small text layout engine.
+
+Every glyph is a list of (x, y, w, h) rectangles on a unit grid: strokes are
+1 unit thick, capitals are GLYPH_HEIGHT units tall and y goes up from the
+baseline. The letters of NameWritingPolygons/Lab1.py are the originals
+(one unit = 40 px there); the rest follow the same style.
+
+``text_rects`` lays a string out as world-space rectangles (cached per
+string), ready for a RectBatch. ``GlyphAtlas`` pre-rasterizes every glyph
+once at a pixel scale and stamps many labels into a Framebuffer with one
+scatter per distinct glyph.
+"""
+import functools
+
+import numpy as np
+
+GLYPH_HEIGHT = 10
+
+GLYPHS = {
+    "A": [(0, 0, 1, 10), (3, 0, 1, 10), (1, 5, 2, 1), (1, 9, 2, 1)],
+    "B": [(0, 0, 1, 10), (1, 9, 3, 1), (4, 6, 1, 3), (1, 5, 3, 1), (4, 0, 1, 5), (1, 0, 3, 1)],
+    "C": [(0, 0, 1, 10), (1, 9, 3, 1), (1, 0, 3, 1)],
+    "D": [(0, 0, 1, 10), (1, 9, 2, 1), (1, 0, 2, 1), (3, 1, 1, 8)],
+    "E": [(0, 0, 1, 10), (1, 9, 3, 1), (1, 5, 2, 1), (1, 0, 3, 1)],
+    "F": [(0, 0, 1, 10), (1, 9, 3, 1), (1, 5, 2, 1)],
+    "G": [(0, 0, 1, 10), (1, 9, 3, 1), (1, 0, 3, 1), (3, 1, 1, 4), (2, 4, 1, 1)],
+    "H": [(0, 0, 1, 10), (3, 0, 1, 10), (1, 5, 2, 1)],
+    "I": [(0, 0, 1, 10)],
+    "J": [(3, 1, 1, 9), (0, 0, 4, 1), (0, 1, 1, 2)],
+    "K": [(0, 0, 1, 10), (1, 4, 1, 2), (2, 6, 1, 2), (3, 8, 1, 2), (2, 2, 1, 2), (3, 0, 1, 2)],
+    "L": [(0, 0, 1, 10), (1, 0, 3, 1)],
+    "M": [(0, 0, 1, 10), (1, 7.5, 1.5, 1), (2.5, 6.75, 1, 1.75), (3.5, 7.5, 1.5, 1), (5, 0, 1, 10)],
+    "N": [(0, 0, 1, 10), (3, 0, 1, 10), (1, 7, 1, 2), (2, 4, 1, 3)],
+    "O": [(0, 0, 1, 10), (3, 0, 1, 10), (1, 9, 2, 1), (1, 0, 2, 1)],
+    "P": [(0, 0, 1, 10), (1, 9, 3, 1), (3, 5, 1, 4), (1, 5, 2, 1)],
+    "Q": [(0, 1, 1, 9), (3, 1, 1, 9), (1, 9, 2, 1), (0, 0, 3, 1), (2, 1, 1, 2), (3, 0, 1, 1)],
+    "R": [(0, 0, 1, 10), (1, 9, 3, 1), (3, 5, 1, 4), (1, 5, 2, 1), (2, 3, 1, 2), (3, 0, 1, 3)],
+    "S": [(0, 9, 3.5, 1), (0, 5, 1, 4), (0, 5, 3.5, 1), (2.5, 0, 1, 5), (0, 0, 3.5, 1)],
+    "T": [(0, 9, 4, 1), (1.5, 0, 1, 9)],
+    "U": [(0, 0, 1, 10), (3, 0, 1, 10), (1, 0, 2, 1)],
+    "V": [(0, 3, 1, 7), (3, 3, 1, 7), (1, 1, 1, 2), (2, 1, 1, 2), (1.5, 0, 1, 1)],
+    "W": [(0, 0, 1, 10), (1, 1, 1.5, 1), (2.5, 1, 1, 1.75), (3.5, 1, 1.5, 1), (5, 0, 1, 10)],
+    "X": [(0, 0, 1, 4), (3, 0, 1, 4), (0, 6, 1, 4), (3, 6, 1, 4), (1, 4, 2, 2)],
+    "Y": [(0, 6, 1, 4), (3, 6, 1, 4), (1, 5, 2, 1), (1.5, 0, 1, 5)],
+    "Z": [(0, 9, 4, 1), (3, 6, 1, 3), (1.5, 4, 1, 2), (0, 1, 1, 3), (0, 0, 4, 1)],
+    "0": [(0, 0, 1, 10), (3, 0, 1, 10), (1, 9, 2, 1), (1, 0, 2, 1)],
+    "1": [(1.5, 0, 1, 10), (0.5, 8, 1, 1), (0.5, 0, 3, 1)],
+    "2": [(0, 9, 4, 1), (3, 6, 1, 3), (0, 5, 4, 1), (0, 1, 1, 4), (0, 0, 4, 1)],
+    "3": [(0, 9, 3, 1), (0, 5, 3, 1), (0, 0, 3, 1), (3, 0, 1, 10)],
+    "4": [(0, 5, 1, 5), (3, 0, 1, 10), (1, 5, 2, 1)],
+    "5": [(0, 9, 4, 1), (0, 6, 1, 3), (0, 5, 4, 1), (3, 1, 1, 4), (0, 0, 4, 1)],
+    "6": [(0, 0, 1, 10), (1, 9, 3, 1), (1, 5, 3, 1), (3, 1, 1, 4), (1, 0, 3, 1)],
+    "7": [(0, 9, 4, 1), (3, 0, 1, 9)],
+    "8": [(0, 0, 1, 10), (3, 0, 1, 10), (1, 9, 2, 1), (1, 5, 2, 1), (1, 0, 2, 1)],
+    "9": [(3, 0, 1, 10), (0, 9, 3, 1), (0, 5, 1, 4), (1, 5, 2, 1), (0, 0, 3, 1)],
+    ".": [(0, 0, 1, 1)],
+    ",": [(0, -1, 1, 2)],
+    ":": [(0, 2, 1, 1), (0, 7, 1, 1)],
+    "-": [(0, 5, 3, 1)],
+    "+": [(0, 5, 3, 1), (1, 4, 1, 3)],
+    "=": [(0, 3, 3, 1), (0, 6, 3, 1)],
+    "/": [(0, 0, 1, 3), (1, 3, 1, 4), (2, 7, 1, 3)],
+    "%": [(0, 8, 1, 2), (4, 0, 1, 2), (0, 0, 1, 2), (1, 2, 1, 2), (2, 4, 1, 2), (3, 6, 1, 2), (4, 8, 1, 2)],
+    " ": [],
+}
+
+# advance width in units (widest rectangle edge; space is explicit)
+GLYPH_WIDTHS = {c: max((x + w for x, y, w, h in r), default=3) for c, r in GLYPHS.items()}
+
+# anything unknown is drawn as an empty box
+MISSING = [(0, 0, 1, 10), (3, 0, 1, 10), (1, 9, 2, 1), (1, 0, 2, 1)]
+
+
+def _glyph(ch):
+    ch = ch.upper()
+    return ch if ch in GLYPHS else None
+
+
+@functools.lru_cache(maxsize=4096)
+def _layout(text, spacing, pens=None):
+    """Unit-space rectangles of ``text``, the character index of each
+    rectangle and the advance of the whole string. ``pens`` (a tuple, one
+    per character) places the characters instead of their advances."""
+    rects = []
+    owner = []
+    pen = 0.0
+    end = 0.0
+    for i, ch in enumerate(text):
+        key = _glyph(ch)
+        glyph = GLYPHS[key] if key is not None else MISSING
+        if pens is not None:
+            pen = pens[i]
+        for x, y, w, h in glyph:
+            rects.append((pen + x, y, w, h))
+            owner.append(i)
+        end = pen + (GLYPH_WIDTHS[key] if key is not None else 4)
+        pen = end + spacing
+    table = np.asarray(rects, dtype=np.float64).reshape(-1, 4)
+    owner = np.asarray(owner, dtype=np.int64)
+    table.flags.writeable = False
+    owner.flags.writeable = False
+    return table, owner, max(end, 0.0)
+
+
+def text_width(text, scale=1.0, spacing=1.0):
+    return _layout(text, float(spacing))[2] * scale
+
+
+def text_rects(text, x=0.0, y=0.0, scale=1.0, spacing=1.0, owners=False, pens=None):
+    """(N, 4) world-space (x, y, w, h) rectangles for ``text`` with its
+    baseline-left corner at (x, y); one unit of the glyph grid = ``scale``.
+    ``pens`` optionally gives every character's left edge in grid units from
+    x, for hand-set lettering. With ``owners=True`` also returns the
+    character index of every rectangle (e.g. to color letters separately)."""
+    if pens is not None:
+        pens = tuple(float(p) for p in pens)
+    unit, owner, _ = _layout(text, float(spacing), pens)
+    out = unit * scale
+    out[:, 0] += x
+    out[:, 1] += y
+    return (out, owner) if owners else out
+
+
+def label_rects(labels, positions, scale=1.0, spacing=1.0, anchor="left"):
+    """Rectangles of many labels concatenated into one (N, 4) array, e.g. for
+    a single RectBatch; ``anchor`` is "left" or "center" like GlyphAtlas.stamp."""
+    parts = []
+    for label, (x, y) in zip(labels, positions):
+        if anchor == "center":
+            x -= text_width(label, scale, spacing) / 2
+        parts.append(text_rects(label, x, y, scale, spacing))
+    if not parts:
+        return np.empty((0, 4))
+    return np.concatenate(parts)
+
+
+class GlyphAtlas:
+    """Every glyph rasterized once at ``px_per_unit`` into one uint8 atlas.
+
+    ``stamp`` writes many labels at once: for each distinct character it
+    scatters that glyph's precomputed pixel offsets at all of its positions."""
+
+    def __init__(self, px_per_unit=1.5, spacing=1.0):
+        self.px_per_unit = px_per_unit
+        self.spacing = spacing
+        self.height = int(np.ceil(GLYPH_HEIGHT * px_per_unit)) + int(np.ceil(px_per_unit))  # room for ','
+        chars = list(GLYPHS) + [None]
+        widths = [int(np.ceil((GLYPH_WIDTHS[c] if c else 4) * px_per_unit)) for c in chars]
+        self.atlas = np.zeros((self.height, sum(widths)), dtype=np.uint8)
+        self.columns = {}
+        self.offsets = {}
+        self._labels = {}
+        col = 0
+        for c, w in zip(chars, widths):
+            cell = self.atlas[:, col:col + w]
+            for rx, ry, rw, rh in (GLYPHS[c] if c else MISSING):
+                # bottom row of the cell is one unit below the baseline
+                y_lo = ry * px_per_unit + np.ceil(px_per_unit)
+                x0, x1 = int(round(rx * px_per_unit)), int(round((rx + rw) * px_per_unit))
+                y0, y1 = int(round(y_lo)), int(round(y_lo + rh * px_per_unit))
+                cell[self.height - y1:self.height - y0, x0:x1] = 1
+            self.columns[c] = (col, w)
+            ys, xs = np.nonzero(cell)
+            # offsets from the glyph's baseline-left pixel, image rows growing down
+            self.offsets[c] = (xs, ys - (self.height - int(np.ceil(px_per_unit))))
+            col += w
+
+    def advance(self, ch):
+        key = _glyph(ch)
+        return int(round(((GLYPH_WIDTHS[key] if key is not None else 4) + self.spacing) * self.px_per_unit))
+
+    def _label(self, label):
+        """Cached glyph keys, pixel pen positions and width of ``label``."""
+        hit = self._labels.get(label)
+        if hit is None:
+            keys = [_glyph(ch) for ch in label]
+            advances = [self.advance(ch) for ch in label]
+            pens = np.concatenate([[0], np.cumsum(advances)[:-1]]).astype(int).tolist() if advances else []
+            hit = self._labels[label] = (keys, pens, sum(advances))
+        return hit
+
+    def stamp(self, fb, labels, positions, color, anchor="left"):
+        """Write ``labels`` (strings) into ``fb`` with their baseline-left
+        corner at world ``positions``; anchor="center" centers each label."""
+        if not len(labels):
+            return
+        base = np.floor(fb.to_pixel(positions)).astype(np.int64)
+        per_char = {}
+        for label, (bx, by) in zip(labels, base.tolist()):
+            keys, pens, width = self._label(label)
+            if anchor == "center":
+                bx -= width // 2
+            for key, pen in zip(keys, pens):
+                per_char.setdefault(key, []).append((bx + pen, by))
+        for key, pos in per_char.items():
+            xs, ys = self.offsets[key]
+            if len(xs) == 0:
+                continue
+            pos = np.asarray(pos, dtype=np.int64)
+            fb.blit((pos[:, 0:1] + xs).ravel(), (pos[:, 1:2] + ys).ravel(), color)
@@ -0,0 +1,131 @@
+"""
+Pie sector geometry: the animated per-sector fan generator, the bulk
+all-sectors call and PieChart for many charts at once. Only
+PieChart.draw touches OpenGL, and imports it when called.
+"""
+import numpy as np
+
+from .trigtable import arc_points, unit_arc
+
+PALETTE = [
+    (0.95, 0.47, 0.60),  # soft pink
+    (0.60, 0.87, 0.73),  # mint
+    (0.64, 0.76, 0.96),  # light blue
+    (0.99, 0.84, 0.59),  # peach
+    (0.82, 0.63, 0.88),  # lavender
+    (0.98, 0.72, 0.72),  # salmon
+    (0.58, 0.84, 0.97),  # aqua
+    (0.88, 0.95, 0.70),  # pale lime
+]
+
+
+def sector_fans(cx, cy, radius, degrees, start_deg=90.0, steps=120):
+    """Bulk mode: every sector of a chart in one vectorized call.
+
+    ``degrees`` are the sector sizes laid out counter-clockwise from
+    ``start_deg``. Returns an (S, steps + 2, 2) int32 array: row 0 of each
+    fan is the center, rows 1.. the rounded rim from its start to end angle
+    (the same points generate_sector reveals one by one)."""
+    degrees = np.asarray(degrees, dtype=np.float64)
+    # running sum from start_deg, added in the same order as the per-sector loop
+    bounds = np.cumsum(np.concatenate([[start_deg], degrees]))
+    t = np.arange(steps + 1, dtype=np.float64) / steps
+    theta = np.radians(bounds[:-1, None] + (bounds[1:] - bounds[:-1])[:, None] * t)
+    fans = np.empty((len(degrees), steps + 2, 2), dtype=np.int32)
+    fans[:, 0] = (cx, cy)
+    fans[:, 1:, 0] = np.rint(np.cos(theta) * radius + cx)
+    fans[:, 1:, 1] = np.rint(np.sin(theta) * radius + cy)
+    return fans
+
+
+def generate_sector(cx, cy, radius, start_deg, end_deg, steps=120):
+    """Yield an animated, growing pie-sector (triangle fan).
+    All vertices live in one preallocated (steps + 2, 2) array; each yielded
+    value is a view of the first k + 2 of them (center plus k + 1 rim points),
+    so nothing is copied and later views supersede earlier ones."""
+    rim = np.rint(arc_points(cx, cy, radius, radius, steps, start_deg, end_deg, endpoint=True))
+    fan = np.empty((steps + 2, 2), dtype=np.int32)
+    fan[0] = (cx, cy)
+    fan[1:] = rim
+    for k in range(steps + 1):
+        yield fan[:k + 2]
+
+
+class PieChart:
+    """Many pie charts at once, one row of ``values`` per chart.
+
+    Sector boundaries come from one cumulative sum over the rows, and every
+    rim vertex is looked up in a single shared unit-circle table of
+    ``table_size`` angles (raster.trigtable) instead of calling cos/sin per
+    vertex, so thousands of small pies cost a handful of array operations.
+    ``fans`` is a (charts, sectors, steps + 2, 2) float array: center first,
+    then the rim from the sector's start to its end angle."""
+
+    def __init__(self, values, centers, radii, start_deg=90.0, steps=24, table_size=3600):
+        self.values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        n_charts, n_sectors = self.values.shape
+        self.centers = np.broadcast_to(np.asarray(centers, dtype=np.float64).reshape(-1, 2), (n_charts, 2))
+        self.radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (n_charts,))
+        self.steps = steps
+        self.table_size = table_size
+
+        totals = self.values.sum(axis=1, keepdims=True)
+        share = np.divide(self.values, totals, out=np.zeros_like(self.values), where=totals > 0)
+        self.bounds = np.empty((n_charts, n_sectors + 1))
+        self.bounds[:, 0] = 0.0
+        np.cumsum(360.0 * share, axis=1, out=self.bounds[:, 1:])
+        self.bounds += start_deg
+        self._fans = None
+        # draw() arrays, built once: (palette, verts, colors, firsts, counts)
+        self._gl = None
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def fans(self):
+        if self._fans is None:
+            table = unit_arc(self.table_size)
+            t = np.arange(self.steps + 1, dtype=np.float64) / self.steps
+            lo = self.bounds[:, :-1, None]
+            deg = lo + (self.bounds[:, 1:, None] - lo) * t
+            # nearest table angle; neighbouring sectors share their boundary index
+            idx = np.rint(deg * (self.table_size / 360.0)).astype(np.int64) % self.table_size
+            n_charts, n_sectors = self.values.shape
+            fans = np.empty((n_charts, n_sectors, self.steps + 2, 2))
+            fans[:, :, 0] = self.centers[:, None]
+            fans[:, :, 1:] = table[idx] * self.radii[:, None, None, None] + self.centers[:, None, None]
+            self._fans = fans
+        return self._fans
+
+    def colors(self, palette=PALETTE):
+        """(charts * sectors, 3) colors, sector i of every chart gets palette[i]."""
+        palette = np.asarray(palette, dtype=np.float32)
+        n_sectors = self.values.shape[1]
+        return np.tile(palette[np.arange(n_sectors) % len(palette)], (len(self), 1))
+
+    def fill(self, fb, palette=PALETTE):
+        """Every sector of every chart in one Framebuffer.polygons call."""
+        fb.polygons(self.fans.reshape(-1, self.steps + 2, 2), self.colors(palette))
+
+    def draw(self, palette=PALETTE):
+        """Every sector of every chart as triangle fans in one glMultiDrawArrays."""
+        from OpenGL import GL as gl
+
+        palette = np.asarray(palette, dtype=np.float32)
+        if self._gl is None or not np.array_equal(self._gl[0], palette):
+            n = self.steps + 2
+            verts = np.ascontiguousarray(self.fans.reshape(-1, 2), dtype=np.float32)
+            rgb8 = np.clip(np.round(self.colors(palette) * np.float32(255)), 0, 255).astype(np.uint8)
+            colors = np.ascontiguousarray(np.repeat(rgb8, n, axis=0))
+            firsts = np.arange(0, len(verts), n, dtype=np.int32)
+            counts = np.full(len(firsts), n, dtype=np.int32)
+            self._gl = (palette, verts, colors, firsts, counts)
+        _, verts, colors, firsts, counts = self._gl
+        gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+        gl.glEnableClientState(gl.GL_COLOR_ARRAY)
+        gl.glVertexPointer(2, gl.GL_FLOAT, 0, verts)
+        gl.glColorPointer(3, gl.GL_UNSIGNED_BYTE, 0, colors)
+        gl.glMultiDrawArrays(gl.GL_TRIANGLE_FAN, firsts, counts, len(firsts))
+        gl.glDisableClientState(gl.GL_COLOR_ARRAY)
+        gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
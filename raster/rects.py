@@ -0,0 +1,95 @@
+"""
+Batched axis-aligned rectangles and a cached-frame helper for GL windows.
+
+RectBatch keeps an (N, 4) array of (x, y, w, h) and an (N, 3) color array,
+expands them once into vertex/color arrays and draws all rectangles with one
+glDrawArrays(GL_QUADS) call (or one Framebuffer.polygons call headless).
+
+FrameCache saves the composed frame with glReadPixels and re-blits it with
+glDrawPixels while the viewport size is unchanged (expose / redisplay), so
+static scenes don't re-issue their geometry.
+"""
+import numpy as np
+
+
+class RectBatch:
+    def __init__(self, rects, colors):
+        self.rects = np.asarray(rects, dtype=np.float32).reshape(-1, 4)
+        colors = np.asarray(colors, dtype=np.float32)
+        if colors.ndim == 1:
+            colors = np.broadcast_to(colors, (len(self.rects), colors.shape[0]))
+        self.colors = np.ascontiguousarray(colors)
+        self._vertices = None
+        self._vertex_colors = None
+
+    def __len__(self):
+        return len(self.rects)
+
+    def quads(self):
+        """(N, 4, 2) corners, counter-clockwise from (x, y) like draw_rect."""
+        x, y, w, h = self.rects.T
+        q = np.empty((len(self.rects), 4, 2), dtype=np.float32)
+        q[:, 0, 0] = x;     q[:, 0, 1] = y
+        q[:, 1, 0] = x + w; q[:, 1, 1] = y
+        q[:, 2, 0] = x + w; q[:, 2, 1] = y + h
+        q[:, 3, 0] = x;     q[:, 3, 1] = y + h
+        return q
+
+    def draw(self):
+        """All rectangles in one glDrawArrays(GL_QUADS) submission."""
+        if len(self.rects) == 0:
+            return
+        from OpenGL import GL as gl
+
+        if self._vertices is None:
+            self._vertices = np.ascontiguousarray(self.quads().reshape(-1, 2))
+            # bytes, so GL gets exactly the values glColor3f would produce
+            rgb8 = np.clip(np.round(self.colors * np.float32(255)), 0, 255).astype(np.uint8)
+            self._vertex_colors = np.ascontiguousarray(np.repeat(rgb8, 4, axis=0))
+        gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+        gl.glEnableClientState(gl.GL_COLOR_ARRAY)
+        gl.glVertexPointer(2, gl.GL_FLOAT, 0, self._vertices)
+        gl.glColorPointer(self._vertex_colors.shape[1], gl.GL_UNSIGNED_BYTE, 0, self._vertex_colors)
+        gl.glDrawArrays(gl.GL_QUADS, 0, len(self._vertices))
+        gl.glDisableClientState(gl.GL_COLOR_ARRAY)
+        gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
+
+    def fill(self, fb):
+        """Headless equivalent of draw() on a raster.framebuffer.Framebuffer."""
+        if len(self.rects):
+            fb.polygons(self.quads(), self.colors)
+
+
+class FrameCache:
+    def __init__(self):
+        self.size = None
+        self.pixels = None
+
+    def invalidate(self):
+        self.size = None
+        self.pixels = None
+
+    def _viewport(self, gl):
+        x, y, w, h = gl.glGetIntegerv(gl.GL_VIEWPORT)
+        return int(w), int(h)
+
+    def store(self):
+        """Read back the frame just drawn."""
+        from OpenGL import GL as gl
+
+        w, h = self._viewport(gl)
+        gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+        self.pixels = gl.glReadPixels(0, 0, w, h, gl.GL_RGB, gl.GL_UNSIGNED_BYTE)
+        self.size = (w, h)
+
+    def blit(self):
+        """Redraw the stored frame; False if there is none for this size."""
+        from OpenGL import GL as gl
+
+        size = self._viewport(gl)
+        if self.pixels is None or size != self.size:
+            return False
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+        gl.glWindowPos2i(0, 0)
+        gl.glDrawPixels(size[0], size[1], gl.GL_RGB, gl.GL_UNSIGNED_BYTE, self.pixels)
+        return True
@@ -0,0 +1,88 @@
+"""
+Retained point buffer for the animated point plots.
+
+Points are appended into a preallocated, geometrically growing NumPy array.
+``draw()`` uploads only the points added since the previous draw into a VBO
+(glBufferSubData) and submits everything with one glDrawArrays, so per-frame
+cost no longer grows with the history. OpenGL is imported only when drawing.
+"""
+import numpy as np
+
+
+class PointBuffer:
+    def __init__(self, capacity=1024, dtype=np.int32, use_vbo=True):
+        self.data = np.empty((max(1, capacity), 2), dtype=dtype)
+        self.count = 0
+        self.use_vbo = use_vbo
+        self._vbo = None
+        self._vbo_capacity = 0
+        self._uploaded = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.view().tolist())
+
+    def view(self):
+        """The stored points as an (N, 2) array view (no copy)."""
+        return self.data[:self.count]
+
+    def _reserve(self, n):
+        if n <= len(self.data):
+            return
+        cap = len(self.data)
+        while cap < n:
+            cap *= 2
+        grown = np.empty((cap, 2), dtype=self.data.dtype)
+        grown[:self.count] = self.data[:self.count]
+        self.data = grown
+
+    def append(self, point):
+        self._reserve(self.count + 1)
+        self.data[self.count] = point
+        self.count += 1
+
+    def extend(self, points):
+        pts = np.asarray(points if isinstance(points, np.ndarray) else list(points),
+                         dtype=self.data.dtype).reshape(-1, 2)
+        self._reserve(self.count + len(pts))
+        self.data[self.count:self.count + len(pts)] = pts
+        self.count += len(pts)
+
+    def clear(self):
+        self.count = 0
+        self._uploaded = 0
+
+    def _sync_vbo(self, gl):
+        if self._vbo is None:
+            self._vbo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._vbo)
+        if self._vbo_capacity != len(self.data):
+            # storage grew: reallocate and upload everything once
+            gl.glBufferData(gl.GL_ARRAY_BUFFER, self.data.nbytes, None, gl.GL_DYNAMIC_DRAW)
+            self._vbo_capacity = len(self.data)
+            self._uploaded = 0
+        if self._uploaded < self.count:
+            fresh = self.data[self._uploaded:self.count]
+            gl.glBufferSubData(gl.GL_ARRAY_BUFFER, self._uploaded * self.data.itemsize * 2,
+                               fresh.nbytes, fresh)
+            self._uploaded = self.count
+
+    def draw(self, mode=None):
+        """Draw every stored point with a single glDrawArrays call."""
+        if self.count == 0:
+            return
+        from OpenGL import GL as gl
+
+        gl_type = gl.GL_INT if self.data.dtype.kind == "i" else gl.GL_FLOAT
+        gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+        if self.use_vbo:
+            self._sync_vbo(gl)
+            gl.glVertexPointer(2, gl_type, 0, None)
+        else:
+            gl.glVertexPointer(2, gl_type, 0, self.data)
+        gl.glDrawArrays(gl.GL_POINTS if mode is None else mode, 0, self.count)
+        if self.use_vbo:
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+        gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
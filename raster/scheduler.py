@@ -0,0 +1,58 @@
+"""
+Frame-rate-independent reveal scheduler for the animated demos.
+
+Instead of busy-polling the clock and taking one point per frame, each frame
+pulls ``elapsed * rate`` items from the generator in one islice and then
+sleeps until the next frame is due. ``instant=True`` drains the whole
+generator on the first frame (throughput runs).
+"""
+import itertools
+import time
+
+
+class RevealScheduler:
+    def __init__(self, source, rate, fps=60.0, instant=False, clock=time.perf_counter, sleep=time.sleep):
+        self.source = iter(source)
+        self.rate = float(rate)   # items per second
+        self.frame_time = 1.0 / fps
+        self.instant = instant
+        self.done = False
+        self._clock = clock
+        self._sleep = sleep
+        self._carry = 0.0         # fractional items owed from earlier frames
+        self._last = None
+        self._deadline = None
+
+    def step(self):
+        """Items due since the previous call (a list, possibly empty)."""
+        now = self._clock()
+        if self._last is None:
+            self._last = now
+            self._deadline = now
+        if self.done:
+            return []
+        if self.instant:
+            batch = list(self.source)
+        else:
+            self._carry += (now - self._last) * self.rate
+            n = int(self._carry)
+            self._carry -= n
+            batch = list(itertools.islice(self.source, n)) if n else []
+            if len(batch) < n:
+                self.done = True
+        if self.instant:
+            self.done = True
+        self._last = now
+        return batch
+
+    def wait(self):
+        """Sleep until the next frame is due instead of spinning."""
+        if self._deadline is None:
+            self._deadline = self._clock()
+        self._deadline += self.frame_time
+        remaining = self._deadline - self._clock()
+        if remaining > 0:
+            self._sleep(remaining)
+        else:
+            # fell behind (slow frame): don't try to catch up with a burst
+            self._deadline = self._clock()
@@ -0,0 +1,299 @@
+"""
+Tiled, multi-process rasterization into a shared-memory framebuffer.
+
+TiledRenderer collects layers of primitives (lines, circles, ellipses,
+filled polygons) in image pixel coordinates (x right, y down), bins every
+primitive into the square tiles its bounding box touches, and rasterizes
+the tiles in a process pool. The RGBA image lives in one
+``multiprocessing.shared_memory`` block that every worker maps and writes
+its own tiles into, so pixel data is never pickled; tasks are tile indices.
+
+Layers are drawn in the order they were added and, inside a layer, later
+primitives win where they overlap, like GL draw order. A tile only runs the
+kernels for its own primitives, and only as far as they cross it where the
+kernel allows: lines are clipped to the tile (raster.clip) before they are
+rasterized, polygons only scan the tile's rows. Circles and ellipses are
+only binned into the tiles their outline reaches, not every tile of their
+bounding box, and are generated whole and clipped to those tiles.
+
+    with TiledRenderer(16384, 16384) as poster:
+        poster.add_lines(segments, colors)
+        poster.add_polygons(quads, (0.2, 0.4, 0.8))
+        poster.render().save("poster.png")
+"""
+import os
+import weakref
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from .bresenham import bresenham_lines
+from .circle import midpoint_circles
+from .dda import dda_array
+from .ellipse import midpoint_ellipses
+from .framebuffer import Framebuffer, _to_rgba8
+from .scanfill import scanline_spans, expand_spans
+
+
+def bin_boxes(boxes, tile, width, height):
+    """Bin inclusive pixel boxes (N, 4) of (x0, y0, x1, y1) into tiles.
+
+    Returns (order, offsets): tile t (row-major, ceil(width / tile) tiles
+    per row) owns primitives order[offsets[t]:offsets[t + 1]], in ascending
+    primitive order. Boxes entirely outside the image are culled."""
+    boxes = np.asarray(boxes, dtype=np.int64).reshape(-1, 4)
+    cols = -(-width // tile)
+    rows = -(-height // tile)
+    inside = ((boxes[:, 2] >= 0) & (boxes[:, 0] < width)
+              & (boxes[:, 3] >= 0) & (boxes[:, 1] < height))
+    prim = np.flatnonzero(inside)
+    tx0 = np.clip(boxes[prim, 0] // tile, 0, cols - 1)
+    ty0 = np.clip(boxes[prim, 1] // tile, 0, rows - 1)
+    tx1 = np.clip(boxes[prim, 2] // tile, 0, cols - 1)
+    ty1 = np.clip(boxes[prim, 3] // tile, 0, rows - 1)
+    nx = tx1 - tx0 + 1
+    counts = nx * (ty1 - ty0 + 1)
+
+    # one (tile, primitive) pair per covered tile, without a per-primitive loop
+    owner = np.repeat(np.arange(len(prim)), counts)
+    k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    tiles = (ty0[owner] + k // nx[owner]) * cols + tx0[owner] + k % nx[owner]
+    order = np.argsort(tiles, kind="stable")
+    offsets = np.zeros(cols * rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(tiles, minlength=cols * rows), out=offsets[1:])
+    return prim[owner[order]], offsets
+
+
+def cull_outline_tiles(order, offsets, ellipses, tile, width, height):
+    """Drop the (tile, primitive) pairs of bin_boxes whose tile an ellipse
+    outline can't reach. ``ellipses`` is (N, 4) (cx, cy, rx, ry); a circle
+    has rx == ry.
+
+    Scaling x by 1 / rx and y by 1 / ry maps the outline to the unit circle.
+    A pixel within 2 px of the outline lands within e = 2 / min(rx, ry) of
+    it. A tile is kept if the nearest and farthest points of its pixel
+    rectangle from the center, in those units, straddle the band
+    [1 - e, 1 + e]. Interior tiles of a large outline and the empty corners
+    of its box drop out. Returns the new (order, offsets)."""
+    e = np.asarray(ellipses, dtype=np.float64).reshape(-1, 4)
+    cols = -(-width // tile)
+    t = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    ty, tx = np.divmod(t, cols)
+    x0 = tx * tile
+    y0 = ty * tile
+    x1 = np.minimum(x0 + tile, width) - 1
+    y1 = np.minimum(y0 + tile, height) - 1
+    cx, cy, rx, ry = e[order].T
+    # nearest and farthest offsets of the tile from the center, per axis
+    near_x = np.clip(cx, x0, x1) - cx
+    near_y = np.clip(cy, y0, y1) - cy
+    far_x = np.maximum(np.abs(x0 - cx), np.abs(x1 - cx))
+    far_y = np.maximum(np.abs(y0 - cy), np.abs(y1 - cy))
+    degenerate = np.minimum(rx, ry) <= 0
+    rx = np.where(degenerate, 1.0, rx)
+    ry = np.where(degenerate, 1.0, ry)
+    band = 2.0 / np.minimum(rx, ry)
+    near = (near_x / rx) ** 2 + (near_y / ry) ** 2
+    far = (far_x / rx) ** 2 + (far_y / ry) ** 2
+    keep = degenerate | ((near <= (1.0 + band) ** 2) & (far >= np.maximum(1.0 - band, 0.0) ** 2))
+    offsets = np.zeros_like(offsets)
+    np.cumsum(np.bincount(t[keep], minlength=len(offsets) - 1), out=offsets[1:])
+    return order[keep], offsets
+
+
+def _colors(colors, n):
+    rgba = _to_rgba8(colors)
+    return np.broadcast_to(rgba, (n, 4)) if rgba.ndim == 1 else rgba
+
+
+# -- worker side -----------------------------------------------------------
+
+_WORKER = {}
+
+
+def _attach(name, shape, tile, layers):
+    shm = shared_memory.SharedMemory(name=name)
+    _WORKER.update(shm=shm, pixels=np.ndarray(shape, dtype=np.uint8, buffer=shm.buf),
+                   tile=tile, layers=layers)
+
+
+def _layer_pixels(kind, data, idx, x0, y0, x1, y1):
+    """(xs, ys, owner) of primitives ``idx`` of one layer inside the tile
+    [x0, x1) x [y0, y1); owner indexes into ``idx``."""
+    if kind == "polygons":
+        polys = data[idx] if isinstance(data, np.ndarray) else [data[i] for i in idx]
+        rows, xa, xb, owner = scanline_spans(polys, y0, y1)
+        xa = np.maximum(xa, x0)
+        xb = np.minimum(xb, x1 - 1)
+        order = np.argsort(owner, kind="stable")
+        rows, xa, xb, owner = rows[order], xa[order], xb[order], owner[order]
+        xs, ys, span = expand_spans(rows, xa, xb)
+        return xs, ys, owner[span]
+    if kind == "dda":
+        lines = [dda_array(*seg, clip=(x0, y0, x1 - 1, y1 - 1)) for seg in data[idx]]
+        counts = np.array([len(p) for p in lines])
+        pixels = np.concatenate(lines) if lines else np.empty((0, 2), dtype=np.int32)
+    elif kind == "bresenham":
+        # only the part of each segment that crosses this tile
+        pixels, offsets = bresenham_lines(*data[idx].T, clip=(x0, y0, x1 - 1, y1 - 1))
+        counts = np.diff(offsets)
+    else:
+        kernel = midpoint_circles if kind == "circles" else midpoint_ellipses
+        pixels, offsets = kernel(*data[idx].T)
+        counts = np.diff(offsets)
+    owner = np.repeat(np.arange(len(idx)), counts)
+    xs, ys = pixels[:, 0], pixels[:, 1]
+    keep = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+    return xs[keep], ys[keep], owner[keep]
+
+
+def _render_tile(t):
+    pixels, tile, layers = _WORKER["pixels"], _WORKER["tile"], _WORKER["layers"]
+    height, width = pixels.shape[:2]
+    cols = -(-width // tile)
+    y0, x0 = divmod(t, cols)
+    y0 *= tile
+    x0 *= tile
+    y1 = min(y0 + tile, height)
+    x1 = min(x0 + tile, width)
+    view = pixels[y0:y1, x0:x1]
+    for kind, data, rgba, order, offsets in layers:
+        idx = order[offsets[t]:offsets[t + 1]]
+        if len(idx) == 0:
+            continue
+        xs, ys, owner = _layer_pixels(kind, data, idx, x0, y0, x1, y1)
+        # repeated indices keep the last write, so later primitives win
+        view[ys - y0, xs - x0] = rgba[idx[owner]]
+    return t
+
+
+# -- parent side -----------------------------------------------------------
+
+def _release(shm):
+    shm.close()
+    shm.unlink()
+
+
+class TiledRenderer:
+    def __init__(self, width, height, tile=1024, clear_color=(0.0, 0.0, 0.0, 1.0)):
+        self.width = width
+        self.height = height
+        self.tile = tile
+        self.clear_color = clear_color
+        self.layers = []
+        self._shm = shared_memory.SharedMemory(create=True, size=width * height * 4)
+        # unlinks the block even if the renderer is dropped without close()
+        self._release = weakref.finalize(self, _release, self._shm)
+        self.fb = Framebuffer(width, height, clear_color,
+                              pixels=np.ndarray((height, width, 4), dtype=np.uint8, buffer=self._shm.buf))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Release the shared framebuffer. NumPy views don't keep the mapping
+        alive, so ``fb`` and any array taken from its pixels must not be
+        used afterwards (copy what should outlive the renderer)."""
+        if self._shm is None:
+            return
+        self.fb = None
+        self._release()
+        self._shm = None
+
+    @property
+    def tiles(self):
+        return -(-self.width // self.tile) * -(-self.height // self.tile)
+
+    def _add(self, kind, data, boxes, colors, outlines=None):
+        order, offsets = bin_boxes(boxes, self.tile, self.width, self.height)
+        if outlines is not None:
+            order, offsets = cull_outline_tiles(order, offsets, outlines, self.tile, self.width, self.height)
+        self.layers.append((kind, data, _colors(colors, len(boxes)), order, offsets))
+
+    def add_lines(self, segments, colors, mode="bresenham"):
+        """(N, 4) segments (x0, y0, x1, y1); ``mode`` "bresenham" (integer
+        endpoints, batch kernel) or "dda" (dda_array per segment)."""
+        if mode not in ("bresenham", "dda"):
+            raise ValueError(f"unknown line mode: {mode!r}")
+        seg = np.asarray(segments, dtype=np.int64 if mode == "bresenham" else float).reshape(-1, 4)
+        lo = np.floor(np.minimum(seg[:, :2], seg[:, 2:]))
+        hi = np.ceil(np.maximum(seg[:, :2], seg[:, 2:]))
+        self._add(mode, seg, np.hstack([lo, hi]), colors)
+
+    def add_circles(self, circles, colors):
+        """(N, 3) integer (cx, cy, radius) outlines (midpoint circles)."""
+        c = np.asarray(circles, dtype=np.int64).reshape(-1, 3)
+        r = c[:, 2:]
+        self._add("circles", c, np.hstack([c[:, :2] - r, c[:, :2] + r]), colors,
+                  outlines=np.hstack([c, r]))
+
+    def add_ellipses(self, ellipses, colors):
+        """(N, 4) integer (cx, cy, rx, ry) outlines (midpoint ellipses)."""
+        e = np.asarray(ellipses, dtype=np.int64).reshape(-1, 4)
+        self._add("ellipses", e, np.hstack([e[:, :2] - e[:, 2:], e[:, :2] + e[:, 2:]]), colors, outlines=e)
+
+    def add_polygons(self, polys, colors):
+        """Filled polygons (even-odd, like Framebuffer.polygons): a (P, N, 2)
+        array or a list of (N, 2) vertex arrays in pixel coordinates."""
+        if isinstance(polys, np.ndarray) and polys.ndim == 3:
+            data = polys.astype(float, copy=False)
+            lo, hi = data.min(axis=1), data.max(axis=1)
+        else:
+            data = [np.asarray(p, dtype=float).reshape(-1, 2) for p in polys]
+            lo = np.array([p.min(axis=0) for p in data]).reshape(-1, 2)
+            hi = np.array([p.max(axis=0) for p in data]).reshape(-1, 2)
+        self._add("polygons", data, np.hstack([np.floor(lo), np.ceil(hi)]), colors)
+
+    def clear(self):
+        self.layers = []
+        self.fb.clear(self.clear_color)
+
+    def render(self, processes=None):
+        """Rasterize every layer and return ``fb``, the Framebuffer over the
+        shared memory. ``processes`` defaults to os.cpu_count(); 1 renders
+        in this process without a pool."""
+        self.fb.clear(self.clear_color)
+        # busiest tiles first so the pool doesn't end on one long tile
+        work = sum(np.diff(offsets) for *_, offsets in self.layers) if self.layers else np.zeros(self.tiles)
+        tasks = [int(t) for t in np.argsort(-work, kind="stable") if work[t]]
+        processes = processes or os.cpu_count() or 1
+        if processes == 1 or len(tasks) <= 1:
+            _WORKER.update(pixels=self.fb.pixels, tile=self.tile, layers=self.layers)
+            try:
+                for t in tasks:
+                    _render_tile(t)
+            finally:
+                _WORKER.clear()
+            return self.fb
+        args = (self._shm.name, self.fb.pixels.shape, self.tile, self.layers)
+        with Pool(min(processes, len(tasks)), initializer=_attach, initargs=args) as pool:
+            for _ in pool.imap_unordered(_render_tile, tasks):
+                pass
+        return self.fb
+
+
+def _benchmark(size=16384, tile=1024, processes=None):
+    import time
+
+    rng = np.random.default_rng(0)
+    n = 20000
+    segments = rng.integers(0, size, size=(n, 4))
+    circles = np.column_stack([rng.integers(0, size, size=(n, 2)), rng.integers(5, 200, n)])
+    corner = rng.uniform(0, size, size=(n, 1, 2))
+    quads = corner + rng.uniform(-40, 40, size=(n, 4, 2))
+    with TiledRenderer(size, size, tile=tile, clear_color=(1.0, 1.0, 1.0)) as poster:
+        poster.add_polygons(quads, rng.random((n, 3)))
+        poster.add_lines(segments, (0.1, 0.1, 0.1))
+        poster.add_circles(circles, (0.8, 0.1, 0.1))
+        for p in (1, processes or os.cpu_count() or 1):
+            start = time.perf_counter()
+            poster.render(processes=p)
+            print(f"{size}x{size}, {poster.tiles} tiles, {p} process(es): "
+                  f"{time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,113 @@
+"""
+Baked animation timelines.
+
+A Timeline holds every frame of a vertex animation as one (frames, 3, N)
+array plus the eased parameter ``t`` of each frame, evaluated in a single
+broadcasted NumPy expression. Playback is an index lookup.
+
+Timelines are stored as a single structured .npy (fields ``t`` and ``pts``),
+so ``Timeline.load(path)`` can memory-map them: long or high-vertex-count
+animations are paged in by the OS instead of being recomputed.
+``Timeline.cached`` keys the file on a digest of the bake inputs, so a
+changed step count, frame rate or matrix bakes a new file.
+"""
+import hashlib
+import os
+
+import numpy as np
+
+
+def linear(t):
+    return t
+
+
+def ease_in_out(t):
+    # smoothstep-like easing: 3t^2 - 2t^3
+    return t * t * (3 - 2 * t)
+
+
+def ping_pong(elapsed, duration):
+    """Normalized progress in [0, 1] that runs forward on even cycles and
+    backward on odd ones; works on scalars and arrays."""
+    raw_t = (elapsed % duration) / duration
+    cycle = np.floor_divide(elapsed, duration)
+    return np.where(cycle % 2 == 1, 1.0 - raw_t, raw_t)
+
+
+class Timeline:
+    def __init__(self, pts, t):
+        self.pts = pts
+        self.t = t
+
+    @classmethod
+    def bake(cls, start, end, t, easing=linear):
+        """Interpolate (3, N) ``start`` -> ``end`` at every raw parameter in
+        ``t`` (e.g. np.linspace(0, 1, frames)) after ``easing``; the frames
+        are (1 - e) * start + e * end like the per-frame demo loops."""
+        e = np.asarray(easing(np.asarray(t, dtype=float)), dtype=float)
+        start = np.asarray(start, dtype=float)
+        end = np.asarray(end, dtype=float)
+        pts = (1.0 - e)[:, None, None] * start + e[:, None, None] * end
+        return cls(pts, e)
+
+    @classmethod
+    def concat(cls, timelines):
+        timelines = list(timelines)
+        return cls(np.concatenate([tl.pts for tl in timelines]),
+                   np.concatenate([tl.t for tl in timelines]))
+
+    def __len__(self):
+        return len(self.t)
+
+    def __getitem__(self, i):
+        return self.pts[i]
+
+    def index(self, elapsed, fps, loop=True):
+        """Frame index for ``elapsed`` seconds of playback at ``fps``."""
+        i = int(elapsed * fps)
+        return i % len(self) if loop else min(i, len(self) - 1)
+
+    def save(self, path):
+        rec = np.empty(len(self), dtype=[("t", "f8"), ("pts", "f8", self.pts.shape[1:])])
+        rec["t"] = self.t
+        rec["pts"] = self.pts
+        np.save(path, rec)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        rec = np.load(path, mmap_mode="r" if mmap else None)
+        return cls(rec["pts"], rec["t"])
+
+    @classmethod
+    def cached(cls, path, build, key=()):
+        """Load the cached timeline for ``path`` (memory-mapped) if it exists,
+        else build(), save it there and return it. ``path`` None just builds.
+
+        ``key`` lists the inputs of build() (arrays, numbers, strings); their
+        digest goes into the file name, ``anim.npy`` -> ``anim-<digest>.npy``,
+        so a cache baked from other inputs is never picked up."""
+        if path is None:
+            return build()
+        path = cache_path(path, key)
+        if os.path.exists(path):
+            return cls.load(path)
+        timeline = build()
+        timeline.save(path)
+        return timeline
+
+
+def cache_path(path, key=()):
+    """The .npy file ``Timeline.cached`` uses for ``path`` and ``key``."""
+    h = hashlib.sha1()
+    for part in key:
+        if isinstance(part, np.ndarray):
+            part = np.ascontiguousarray(part, dtype=float)
+            h.update(repr(part.shape).encode())
+            h.update(part.tobytes())
+        else:
+            h.update(repr(part).encode())
+        h.update(b"\0")
+    root, ext = os.path.splitext(os.fspath(path))
+    if ext != ".npy":
+        root += ext
+    return f"{root}-{h.hexdigest()[:12]}.npy"
@@ -0,0 +1,138 @@
+"""
+Trace sinks for the rasterizer generators.
+
+The generators take ``trace=None`` (the default, tracing off) or a sink and
+call ``sink.record(step, x, y, value, aux)`` once per step. ``value`` is the
+decision parameter (or the float x for DDA) and ``aux`` an optional second
+value (the float y for DDA). With tracing off the inner loops only pay for
+an ``is not None`` check.
+"""
+import os
+import struct
+
+import numpy as np
+
+TRACE_DTYPE = np.dtype([
+    ("step", np.int32),
+    ("x", np.int32),
+    ("y", np.int32),
+    ("value", np.float64),
+    ("aux", np.float64),
+])
+
+
+class PrintTrace:
+    """Console trace, one line per step (what the demos used to print).
+
+    ``fmt`` is a str.format template over step, x, y, value and aux, or a
+    callable taking those five arguments and returning the line."""
+
+    def __init__(self, fmt):
+        if callable(fmt):
+            self._format = fmt
+        else:
+            self._format = lambda step, x, y, value, aux: fmt.format(
+                step=step, x=x, y=y, value=value, aux=aux)
+
+    def record(self, step, x, y, value=0, aux=0.0):
+        print(self._format(step, x, y, value, aux))
+
+
+class RingTrace:
+    """Bounded in-memory trace keeping the last ``capacity`` records."""
+
+    def __init__(self, capacity=65536):
+        self.capacity = capacity
+        self.buffer = np.zeros(capacity, dtype=TRACE_DTYPE)
+        self.count = 0
+
+    def record(self, step, x, y, value=0, aux=0.0):
+        self.buffer[self.count % self.capacity] = (step, x, y, value, aux)
+        self.count += 1
+
+    def records(self):
+        """Stored records, oldest first."""
+        if self.count <= self.capacity:
+            return self.buffer[:self.count].copy()
+        head = self.count % self.capacity
+        return np.concatenate([self.buffer[head:], self.buffer[:head]])
+
+    def clear(self):
+        self.count = 0
+
+
+class NpyTrace:
+    """Streams records to a single structured ``.npy`` file: they are
+    collected in a fixed-size chunk that is appended to the file whenever
+    it fills, so memory stays at one chunk however long the trace runs.
+    The header reserves room for any record count and is rewritten with
+    the real one on ``close()``."""
+
+    def __init__(self, path, chunk=65536):
+        path = os.fspath(path)
+        # np.save's naming, so the file is where it used to be
+        self.path = path if path.endswith(".npy") else path + ".npy"
+        self.chunk = chunk
+        self.count = 0
+        self._current = np.zeros(chunk, dtype=TRACE_DTYPE)
+        self._n = 0
+        self._file = open(self.path, "wb")
+        self._file.write(_npy_header(0))
+
+    def record(self, step, x, y, value=0, aux=0.0):
+        self._current[self._n] = (step, x, y, value, aux)
+        self._n += 1
+        if self._n == self.chunk:
+            self._flush()
+
+    def _flush(self):
+        self._file.write(self._current[:self._n].tobytes())
+        self.count += self._n
+        self._n = 0
+
+    def records(self):
+        """Everything recorded so far, read back from the file."""
+        if self._file.closed:
+            return np.load(self.path)
+        self._flush()
+        self._file.flush()
+        return np.fromfile(self.path, dtype=TRACE_DTYPE, count=self.count,
+                           offset=len(_npy_header(0)))
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._flush()
+        self._file.seek(0)
+        self._file.write(_npy_header(self.count))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _npy_header(count):
+    """.npy (version 1.0) header for ``count`` TRACE_DTYPE records, padded to
+    the same length whatever ``count`` is, so it can be rewritten in place."""
+    header = repr({"descr": np.lib.format.dtype_to_descr(TRACE_DTYPE),
+                   "fortran_order": False, "shape": (count,)})
+    magic = np.lib.format.magic(1, 0)
+    # room for a 20-digit count, padded so the data starts 64-byte aligned
+    size = -(-(len(magic) + 2 + len(header) + 20 + 1) // 64) * 64 - len(magic) - 2
+    return magic + struct.pack("<H", size) + header.ljust(size - 1).encode("latin1") + b"\n"
+
+
+def make_trace(mode="off", **kwargs):
+    """Build a sink by name: "off" (returns None), "print", "ring" or "npy"."""
+    if mode in (None, "off"):
+        return None
+    if mode == "print":
+        return PrintTrace(**kwargs)
+    if mode == "ring":
+        return RingTrace(**kwargs)
+    if mode == "npy":
+        return NpyTrace(**kwargs)
+    raise ValueError(f"unknown trace mode: {mode!r}")
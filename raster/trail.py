@@ -0,0 +1,138 @@
+"""
+Fixed-size motion trail of transformed quads.
+
+TrailBuffer keeps the last ``capacity`` shapes in a preallocated
+(2 * capacity, vertices, 2) array with a moving head. Every push writes
+the shape twice (slot ``head`` and ``head + capacity``), so oldest-to-newest
+is always the contiguous slice ``[head + capacity - n, head + capacity)``:
+no pop(0), no reordering, and the whole trail goes to GL as one
+glDrawArrays(GL_QUADS) call (or one Framebuffer.polygons call headless).
+
+Per-instance colors come from ``alpha(age, n)`` (age 0 = oldest, vectorized
+over ages) and are only recomputed while the trail is still filling up.
+
+With ``clip`` set to the view rectangle, push also records whether the
+shape lies inside it. While every shape of the trail does (the usual case),
+drawing takes the plain quad path above at no extra cost. Otherwise the
+trail is clipped (raster.clip.clip_polygons_xy): shapes that left the view
+are dropped and the rest go to GL as clipped fans in one glMultiDrawArrays
+call.
+"""
+import numpy as np
+
+from .clip import clip_polygons_xy
+
+
+class TrailBuffer:
+    def __init__(self, capacity, vertices=4, color=(0.0, 0.5, 1.0), alpha=None, clip=None):
+        self.capacity = int(capacity)
+        self.clip = clip
+        self.vertices = vertices
+        self.color = tuple(color[:3])
+        self.alpha = alpha if alpha is not None else (lambda age, n: np.ones(len(age)))
+        self.verts = np.zeros((2 * self.capacity, vertices, 2), dtype=np.float64)
+        # per slot: the shape lies inside ``clip`` (mirrored like verts)
+        self.inside = np.ones(2 * self.capacity, dtype=bool)
+        self.head = 0
+        self.count = 0
+        self._colors = None
+        self._vertex_colors = None
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def push(self, shape):
+        """Append a (3, N) homogeneous (or (2, N)) shape, dropping the oldest
+        once full."""
+        h = self.head
+        self.verts[h] = shape[:2].T
+        self.verts[h + self.capacity] = self.verts[h]
+        if self.clip is not None:
+            xmin, ymin, xmax, ymax = self.clip
+            v = self.verts[h]
+            self.inside[h] = self.inside[h + self.capacity] = (
+                xmin <= v[:, 0].min() and v[:, 0].max() <= xmax
+                and ymin <= v[:, 1].min() and v[:, 1].max() <= ymax)
+        self.head = (h + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def view(self):
+        """(n, N, 2) oldest to newest, a view into the ring."""
+        end = self.head + self.capacity
+        return self.verts[end - self.count:end]
+
+    def colors(self):
+        """(n, 4) float32 RGBA per instance, oldest first."""
+        n = self.count
+        if self._colors is None or len(self._colors) != n:
+            rgba = np.empty((n, 4), dtype=np.float32)
+            rgba[:, :3] = self.color
+            rgba[:, 3] = self.alpha(np.arange(n), n)
+            self._colors = rgba
+        return self._colors
+
+    def needs_clip(self):
+        """True if some shape of the trail is not inside ``clip``."""
+        if self.clip is None:
+            return False
+        end = self.head + self.capacity
+        return not self.inside[end - self.count:end].all()
+
+    def clipped(self):
+        """(shapes, colors) left after clipping to ``clip``: a (k, M, 2)
+        array (see clip_polygons_xy) and their (k, 4) colors."""
+        shapes, index = clip_polygons_xy(self.view(), *self.clip)
+        return shapes, self.colors()[index]
+
+    def draw(self):
+        """The whole trail in one glDrawArrays(GL_QUADS) submission, or one
+        glMultiDrawArrays of clipped fans while a shape crosses ``clip``."""
+        if self.count == 0:
+            return
+        from OpenGL import GL as gl
+
+        if self.needs_clip():
+            shapes, colors = self.clipped()
+            if len(shapes) == 0:
+                return
+            m = shapes.shape[1]
+            verts = np.ascontiguousarray(shapes.reshape(-1, 2))
+            vertex_colors = np.ascontiguousarray(np.repeat(colors, m, axis=0))
+            firsts = np.arange(0, len(verts), m, dtype=np.int32)
+            counts = np.full(len(firsts), m, dtype=np.int32)
+            gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+            gl.glEnableClientState(gl.GL_COLOR_ARRAY)
+            gl.glVertexPointer(2, gl.GL_DOUBLE, 0, verts)
+            gl.glColorPointer(4, gl.GL_FLOAT, 0, vertex_colors)
+            gl.glMultiDrawArrays(gl.GL_TRIANGLE_FAN, firsts, counts, len(firsts))
+            gl.glDisableClientState(gl.GL_COLOR_ARRAY)
+            gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
+            return
+
+        n = self.count
+        if self._vertex_colors is None or len(self._vertex_colors) != n * self.vertices:
+            self._vertex_colors = np.ascontiguousarray(np.repeat(self.colors(), self.vertices, axis=0))
+        verts = self.view().reshape(-1, 2)
+        gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+        gl.glEnableClientState(gl.GL_COLOR_ARRAY)
+        gl.glVertexPointer(2, gl.GL_DOUBLE, 0, verts)
+        gl.glColorPointer(4, gl.GL_FLOAT, 0, self._vertex_colors)
+        gl.glDrawArrays(gl.GL_QUADS, 0, len(verts))
+        gl.glDisableClientState(gl.GL_COLOR_ARRAY)
+        gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
+
+    def fill(self, fb):
+        """Headless equivalent of draw() on a raster.framebuffer.Framebuffer."""
+        if self.count == 0:
+            return
+        if self.needs_clip():
+            shapes, colors = self.clipped()
+            if len(shapes):
+                fb.polygons(shapes, colors)
+            return
+        fb.polygons(self.view(), self.colors())
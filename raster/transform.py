@@ -0,0 +1,166 @@
+"""
+2D homogeneous transforms shared by the Lab_3 demos.
+
+Transform2D owns one 3x3 float64 matrix and updates it in place: the set_*
+methods overwrite it (pivot rotate / pivot scale in closed form instead of
+T(p) @ R @ T(-p)), the translate/rotate/scale/shear methods right-multiply
+it like ``M = M @ X`` so ``T.translate(..).rotate(..)`` reads like
+``T @ R``. ``apply(points, out=buf)`` writes M @ points into a preallocated
+(3, N) buffer, so a per-frame loop reuses the same arrays every frame.
+
+The make_* and pivot_* helpers build one fresh matrix literal each, for
+printing and one-off setup.
+"""
+import math
+
+import numpy as np
+
+
+class Transform2D:
+    __slots__ = ("m", "_tmp")
+
+    def __init__(self, m=None):
+        self.m = np.eye(3) if m is None else np.array(m, dtype=float)
+        # compose() scratch, allocated on first use
+        self._tmp = None
+
+    def __array__(self, dtype=None, copy=None):
+        return self.m if dtype is None else self.m.astype(dtype)
+
+    def copy(self):
+        return Transform2D(self.m)
+
+    # -- overwrite -------------------------------------------------------
+
+    def _set(self, a, b, c, d, e, f):
+        m = self.m
+        m[0, 0] = a; m[0, 1] = b; m[0, 2] = c
+        m[1, 0] = d; m[1, 1] = e; m[1, 2] = f
+        m[2, 0] = 0.0; m[2, 1] = 0.0; m[2, 2] = 1.0
+        return self
+
+    def identity(self):
+        return self._set(1.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+
+    def set(self, m):
+        self.m[...] = m
+        return self
+
+    def set_translate(self, tx, ty):
+        return self._set(1.0, 0.0, tx, 0.0, 1.0, ty)
+
+    def set_scale(self, sx, sy):
+        return self._set(sx, 0.0, 0.0, 0.0, sy, 0.0)
+
+    def set_rotate(self, degrees):
+        r = math.radians(degrees)
+        c, s = math.cos(r), math.sin(r)
+        return self._set(c, -s, 0.0, s, c, 0.0)
+
+    def set_shear(self, shx, shy):
+        return self._set(1.0, shx, 0.0, shy, 1.0, 0.0)
+
+    def set_pivot_rotate(self, px, py, degrees):
+        """T(p) @ R(degrees) @ T(-p) without building the three matrices."""
+        r = math.radians(degrees)
+        c, s = math.cos(r), math.sin(r)
+        return self._set(c, -s, px - c * px + s * py,
+                         s, c, py - s * px - c * py)
+
+    def set_pivot_scale(self, px, py, sx, sy):
+        """T(p) @ S(sx, sy) @ T(-p) without building the three matrices."""
+        return self._set(sx, 0.0, px - sx * px, 0.0, sy, py - sy * py)
+
+    # -- compose in place (M = M @ X) ------------------------------------
+
+    def translate(self, tx, ty):
+        m = self.m
+        m[0, 2] += m[0, 0] * tx + m[0, 1] * ty
+        m[1, 2] += m[1, 0] * tx + m[1, 1] * ty
+        return self
+
+    def scale(self, sx, sy):
+        m = self.m
+        m[0, 0] *= sx; m[1, 0] *= sx
+        m[0, 1] *= sy; m[1, 1] *= sy
+        return self
+
+    def rotate(self, degrees):
+        r = math.radians(degrees)
+        c, s = math.cos(r), math.sin(r)
+        m = self.m
+        for i in (0, 1):
+            a, b = m[i, 0], m[i, 1]
+            m[i, 0] = a * c + b * s
+            m[i, 1] = b * c - a * s
+        return self
+
+    def shear(self, shx, shy):
+        m = self.m
+        for i in (0, 1):
+            a, b = m[i, 0], m[i, 1]
+            m[i, 0] = a + b * shy
+            m[i, 1] = a * shx + b
+        return self
+
+    def compose(self, other):
+        """M = M @ other (other is a Transform2D or a 3x3 array)."""
+        if self._tmp is None:
+            self._tmp = np.empty((3, 3))
+        np.matmul(self.m, getattr(other, "m", other), out=self._tmp)
+        self.m[...] = self._tmp
+        return self
+
+    # -- use -------------------------------------------------------------
+
+    def apply(self, points, out=None):
+        """M @ points for (3, N) homogeneous points; ``out`` is an optional
+        preallocated (3, N) float64 buffer (must not be ``points`` itself)."""
+        return np.matmul(self.m, points, out=out)
+
+
+def make_translate(tx, ty):
+    return np.array([[1.0, 0.0, tx],
+                     [0.0, 1.0, ty],
+                     [0.0, 0.0, 1.0]], dtype=float)
+
+
+def make_scale(sx, sy):
+    return np.array([[sx, 0.0, 0.0],
+                     [0.0, sy, 0.0],
+                     [0.0, 0.0, 1.0]], dtype=float)
+
+
+def make_rotate(degrees):
+    r = math.radians(degrees)
+    c, s = math.cos(r), math.sin(r)
+    return np.array([[c, -s, 0.0],
+                     [s,  c, 0.0],
+                     [0.0, 0.0, 1.0]], dtype=float)
+
+
+# the name Rotation.py used
+make_rotate_deg = make_rotate
+
+
+def make_shear(shx, shy):
+    # shear matrix (x shear, y shear)
+    return np.array([[1.0, shx, 0.0],
+                     [shy, 1.0, 0.0],
+                     [0.0, 0.0, 1.0]], dtype=float)
+
+
+def pivot_rotation(px, py, angle_deg):
+    # rotation about the pivot: T(p) * R(angle) * T(-p), in closed form
+    r = math.radians(angle_deg)
+    c, s = math.cos(r), math.sin(r)
+    return np.array([[c, -s, px - c * px + s * py],
+                     [s,  c, py - s * px - c * py],
+                     [0.0, 0.0, 1.0]], dtype=float)
+
+
+def pivot_scaling(px, py, sx, sy):
+    # scaling about the pivot: T(p) * S(sx,sy) * T(-p), in closed form
+    return np.array([[sx, 0.0, px - sx * px],
+                     [0.0, sy, py - sy * py],
+                     [0.0, 0.0, 1.0]], dtype=float)
@@ -0,0 +1,35 @@
+"""
+Cached unit-circle tables for arcs, ellipses and pie sectors.
+
+A table is an (N, 2) array of (cos, sin) for evenly spaced angles and is
+keyed by (segments, start, end, endpoint); the least recently used tables
+are evicted once ``TABLE_CACHE_SIZE`` are held. Shapes then come from one
+scale-and-offset: ``center + radii * unit_arc(...)``.
+"""
+import functools
+
+import numpy as np
+
+TABLE_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=TABLE_CACHE_SIZE)
+def unit_arc(segments, start_deg=0.0, end_deg=360.0, endpoint=False):
+    """(cos, sin) of ``segments`` steps from start_deg towards end_deg.
+
+    endpoint=False gives ``segments`` angles (a closed outline, the last
+    point isn't repeated); endpoint=True gives ``segments + 1`` angles
+    including end_deg (an open arc). The array is shared, so it is read-only."""
+    n = segments + 1 if endpoint else segments
+    t = np.arange(n, dtype=np.float64) / segments
+    theta = np.radians(start_deg + (end_deg - start_deg) * t)
+    table = np.empty((n, 2), dtype=np.float64)
+    table[:, 0] = np.cos(theta)
+    table[:, 1] = np.sin(theta)
+    table.flags.writeable = False
+    return table
+
+
+def arc_points(cx, cy, rx, ry, segments, start_deg=0.0, end_deg=360.0, endpoint=False):
+    """Points of an elliptical arc as an (N, 2) float array."""
+    return unit_arc(segments, float(start_deg), float(end_deg), endpoint) * (rx, ry) + (cx, cy)
@@ -0,0 +1,63 @@
+"""
+Xiaolin Wu antialiased lines as a NumPy batch over many segments.
+
+Instead of one integer pixel per step like Bresenham / DDA, every step
+along the major axis touches the pixels the line crosses on the minor axis
+and gives each a coverage weight in [0, 1]; Framebuffer.coverage blends
+them as alpha. No OpenGL here.
+"""
+import numpy as np
+
+
+def wu_lines(x0, y0, x1, y1, width=1.0):
+    """Antialiased pixels of arrays of segments in pixel coordinates (pixel
+    (i, j) is centered on (i, j); endpoints may be fractional).
+
+    Returns (pixels, weights, offsets): an (M, 2) int32 array of (x, y), an
+    (M,) float32 coverage per pixel, and segment i owns
+    pixels[offsets[i]:offsets[i + 1]].
+
+    A pixel's weight is the overlap of its column (row, for steep lines)
+    with the segment along the major axis times its overlap with a box of
+    ``width`` pixels centered on the line along the minor axis. For width 1
+    that is Wu's algorithm: two pixels per step weighted 1 - frac and frac,
+    endpoint columns scaled by the part of them the segment covers, so the
+    shared vertex of a strip sums to full coverage."""
+    x0, y0, x1, y1 = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=np.float64))
+                                           for v in (x0, y0, x1, y1)))
+    steep = np.abs(y1 - y0) > np.abs(x1 - x0)
+    a0, b0 = np.where(steep, y0, x0), np.where(steep, x0, y0)
+    a1, b1 = np.where(steep, y1, x1), np.where(steep, x1, y1)
+    # walk the major axis upwards
+    back = a1 < a0
+    a0, a1 = np.where(back, a1, a0), np.where(back, a0, a1)
+    b0, b1 = np.where(back, b1, b0), np.where(back, b0, b1)
+    run = a1 - a0
+    gradient = np.divide(b1 - b0, run, out=np.zeros_like(run), where=run > 0)
+
+    first = np.floor(a0 + 0.5).astype(np.int64)
+    last = np.floor(a1 + 0.5).astype(np.int64)
+    counts = last - first + 1
+    seg = np.repeat(np.arange(len(counts)), counts)
+    i = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + first[seg]
+    cover_a = np.clip(np.minimum(i + 0.5, a1[seg]) - np.maximum(i - 0.5, a0[seg]), 0.0, 1.0)
+    center = b0[seg] + gradient[seg] * (i - a0[seg])
+
+    # minor axis: every pixel the width-wide box around the center touches
+    half = 0.5 * width
+    j = np.floor(center - half + 0.5).astype(np.int64)[:, None] + np.arange(int(np.ceil(width)) + 1)
+    cover_b = np.clip(np.minimum(j + 0.5, (center + half)[:, None])
+                      - np.maximum(j - 0.5, (center - half)[:, None]), 0.0, 1.0)
+    weights = cover_a[:, None] * cover_b
+    keep = weights > 0
+    seg = np.broadcast_to(seg[:, None], keep.shape)[keep]
+    i = np.broadcast_to(i[:, None], keep.shape)[keep]
+    j = j[keep]
+    st = steep[seg]
+
+    pixels = np.empty((len(i), 2), dtype=np.int32)
+    pixels[:, 0] = np.where(st, j, i)
+    pixels[:, 1] = np.where(st, i, j)
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(seg, minlength=len(counts)), out=offsets[1:])
+    return pixels, weights[keep].astype(np.float32), offsets
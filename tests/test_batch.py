@@ -0,0 +1,217 @@
+"""Batch / vectorized kernels against their scalar references.
+
+DDA modes are checked in test_dda.py and clipped lines in test_clip.py."""
+import numpy as np
+import pytest
+
+from raster.bresenham import bresenham_line, bresenham_lines
+from raster.circle import midpoint_circle, midpoint_circles
+from raster.clip import clip_polygons_xy
+from raster.dda import dda_array
+from raster.ellipse import midpoint_ellipse_points, midpoint_ellipse_points_int, midpoint_ellipses
+from raster.framebuffer import Framebuffer
+from raster.scanfill import expand_spans, scanline_spans
+from raster.tiles import TiledRenderer
+from raster.wu import wu_lines
+
+
+def _split(pixels, offsets):
+    return [list(map(tuple, pixels[a:b].tolist())) for a, b in zip(offsets[:-1], offsets[1:])]
+
+
+def test_bresenham_lines_matches_bresenham_line():
+    rng = np.random.default_rng(0)
+    seg = rng.integers(-60, 60, size=(500, 4))
+    seg[:20, 2:] = seg[:20, :2]              # single points
+    seg[20:40, 3] = seg[20:40, 1]            # horizontal
+    seg[40:60, 2] = seg[40:60, 0]            # vertical
+    seg[60:80, 3] = seg[60:80, 1] + seg[60:80, 2] - seg[60:80, 0]   # 45 degrees
+    lines = _split(*bresenham_lines(*seg.T))
+    assert lines == [list(bresenham_line(*s)) for s in seg.tolist()]
+
+
+def test_midpoint_circles_matches_midpoint_circle():
+    rng = np.random.default_rng(1)
+    radius = np.arange(0, 80)
+    cx, cy = rng.integers(-50, 50, size=(2, len(radius)))
+    circles = _split(*midpoint_circles(cx, cy, radius))
+    for pixels, args in zip(circles, zip(cx.tolist(), cy.tolist(), radius.tolist())):
+        # the batch drops the symmetric copies that coincide on the seams
+        assert len(pixels) == len(set(pixels))
+        assert set(pixels) == set(midpoint_circle(*args))
+
+
+def test_midpoint_ellipses_matches_generators():
+    rng = np.random.default_rng(2)
+    rx, ry = rng.integers(0, 60, size=(2, 200))
+    cx, cy = rng.integers(-50, 50, size=(2, 200))
+    ellipses = _split(*midpoint_ellipses(cx, cy, rx, ry))
+    for pixels, args in zip(ellipses, zip(cx.tolist(), cy.tolist(), rx.tolist(), ry.tolist())):
+        assert pixels == list(midpoint_ellipse_points_int(*args))
+        if min(args[2:]) > 0:
+            assert set(pixels) == set(midpoint_ellipse_points(*args))
+
+
+def _wu_reference(x0, y0, x1, y1):
+    """Xiaolin Wu, one segment, one step at a time: {pixel: weight}."""
+    steep = abs(y1 - y0) > abs(x1 - x0)
+    if steep:
+        x0, y0, x1, y1 = y0, x0, y1, x1
+    if x1 < x0:
+        x0, y0, x1, y1 = x1, y1, x0, y0
+    gradient = (y1 - y0) / (x1 - x0) if x1 > x0 else 0.0
+    weights = {}
+    for i in range(int(np.floor(x0 + 0.5)), int(np.floor(x1 + 0.5)) + 1):
+        cover = min(max(min(i + 0.5, x1) - max(i - 0.5, x0), 0.0), 1.0)
+        y = y0 + gradient * (i - x0)
+        j = int(np.floor(y))
+        for jj, w in ((j, 1.0 - (y - j)), (j + 1, y - j)):
+            if cover * w > 0:
+                key = (jj, i) if steep else (i, jj)
+                weights[key] = weights.get(key, 0.0) + cover * w
+    return weights
+
+
+def test_wu_lines_matches_scalar_wu():
+    rng = np.random.default_rng(3)
+    seg = rng.uniform(-40, 40, size=(300, 4))
+    seg[:20, 2:] = seg[:20, :2] + rng.uniform(-0.4, 0.4, size=(20, 2))   # shorter than a pixel
+    pixels, weights, offsets = wu_lines(*seg.T)
+    for k, s in enumerate(seg.tolist()):
+        got = {}
+        for p, w in zip(map(tuple, pixels[offsets[k]:offsets[k + 1]].tolist()),
+                        weights[offsets[k]:offsets[k + 1]].tolist()):
+            got[p] = got.get(p, 0.0) + w
+        ref = _wu_reference(*s)
+        # float32 weights; the reference drops nothing the batch keeps
+        assert set(got) <= set(ref)
+        assert all(abs(got.get(p, 0.0) - w) < 1e-5 for p, w in ref.items())
+
+
+def _polygons(n, seed, size=40, vertices=(3, 9)):
+    rng = np.random.default_rng(seed)
+    return [rng.uniform(-5, size + 5, size=(int(rng.integers(*vertices)), 2)) for _ in range(n)]
+
+
+def _even_odd(poly, size):
+    """Pixels whose center is inside ``poly`` by the even-odd rule, testing
+    every pixel against every edge."""
+    inside = np.zeros((size, size), dtype=bool)
+    q = np.roll(poly, -1, axis=0)
+    for y in range(size):
+        yc = y + 0.5
+        for x in range(size):
+            xc = x + 0.5
+            crossings = 0
+            for (ax, ay), (bx, by) in zip(poly, q):
+                if (ay <= yc < by) or (by <= yc < ay):
+                    if ax + (yc - ay) * (bx - ax) / (by - ay) <= xc:
+                        crossings += 1
+            inside[y, x] = crossings % 2 == 1
+    return inside
+
+
+def test_scanline_spans_match_even_odd_rule():
+    size = 40
+    polys = _polygons(30, seed=4, size=size)
+    rows, xa, xb, owner = scanline_spans(polys, 0, size)
+    xs, ys, span = expand_spans(rows, xa, xb, size)
+    for i, poly in enumerate(polys):
+        mask = np.zeros((size, size), dtype=bool)
+        mine = owner[span] == i
+        mask[ys[mine], xs[mine]] = True
+        np.testing.assert_array_equal(mask, _even_odd(poly, size))
+
+
+def _sutherland_hodgman(poly, xmin, ymin, xmax, ymax):
+    """Scalar Sutherland-Hodgman: every edge emits its crossing, then its
+    end vertex if that is inside."""
+    out = [tuple(p) for p in poly]
+    for axis, bound, above in ((0, xmin, True), (0, xmax, False), (1, ymin, True), (1, ymax, False)):
+        pts, out = out, []
+        for k, cur in enumerate(pts):
+            nxt = pts[(k + 1) % len(pts)]
+            d_cur = (cur[axis] - bound) * (1 if above else -1)
+            d_nxt = (nxt[axis] - bound) * (1 if above else -1)
+            if (d_cur >= 0) != (d_nxt >= 0):
+                t = d_cur / (d_cur - d_nxt)
+                hit = [cur[0] + t * (nxt[0] - cur[0]), cur[1] + t * (nxt[1] - cur[1])]
+                hit[axis] = bound
+                out.append(tuple(hit))
+            if d_nxt >= 0:
+                out.append(nxt)
+    return out
+
+
+def _strip_padding(poly):
+    n = len(poly)
+    while n > 1 and np.array_equal(poly[n - 1], poly[n - 2]):
+        n -= 1
+    return poly[:n]
+
+
+def _same_cycle(a, b):
+    a, b = np.asarray(a), np.asarray(b)
+    if a.shape != b.shape:
+        return False
+    return any(np.allclose(np.roll(a, k, axis=0), b) for k in range(len(a)))
+
+
+def test_clip_polygons_xy_matches_sutherland_hodgman():
+    rng = np.random.default_rng(5)
+    rect = (-1.0, -1.0, 1.0, 1.0)
+    # convex: rotated squares scattered around the rectangle
+    angle = rng.uniform(0, 2 * np.pi, 400)
+    half = rng.uniform(0.05, 0.8, 400)
+    corner = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], dtype=float)
+    c, s = np.cos(angle), np.sin(angle)
+    polys = np.empty((400, 4, 2))
+    polys[..., 0] = half[:, None] * (c[:, None] * corner[:, 0] - s[:, None] * corner[:, 1])
+    polys[..., 1] = half[:, None] * (s[:, None] * corner[:, 0] + c[:, None] * corner[:, 1])
+    polys += rng.uniform(-2, 2, size=(400, 1, 2))
+
+    clipped, index = clip_polygons_xy(polys, *rect)
+    got = dict(zip(index.tolist(), clipped))
+    for i, poly in enumerate(polys):
+        ref = _sutherland_hodgman(poly, *rect)
+        if len(ref) < 3:
+            assert i not in got
+            continue
+        assert _same_cycle(_strip_padding(got[i]), ref)
+        assert (got[i] >= -1.0).all() and (got[i] <= 1.0).all()
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_tiled_renderer_matches_single_framebuffer(processes):
+    width, height, tile = 150, 110, 32
+    rng = np.random.default_rng(6)
+    seg = rng.integers(-20, 170, size=(60, 4))
+    dseg = rng.uniform(-20, 170, size=(40, 4))
+    circles = np.column_stack([rng.integers(-10, 160, size=(30, 2)), rng.integers(0, 60, 30)])
+    ellipses = np.column_stack([rng.integers(-10, 160, size=(30, 2)), rng.integers(0, 60, size=(30, 2))])
+    polys = [p * [width / 40, height / 40] for p in _polygons(12, seed=7)]
+    colors = {name: rng.integers(0, 256, size=(n, 3)) / 255.0
+              for name, n in (("lines", 60), ("dda", 40), ("circles", 30), ("ellipses", 30), ("polygons", 12))}
+
+    with TiledRenderer(width, height, tile=tile) as tiled:
+        tiled.add_lines(seg, colors["lines"])
+        tiled.add_lines(dseg, colors["dda"], mode="dda")
+        tiled.add_circles(circles, colors["circles"])
+        tiled.add_ellipses(ellipses, colors["ellipses"])
+        tiled.add_polygons(polys, colors["polygons"])
+        got = tiled.render(processes).pixels.copy()
+
+    # the same layers in one framebuffer, every primitive rasterized whole
+    ref = Framebuffer(width, height)
+    ref.ortho(0, width, height, 0)    # polygons are given in pixel coordinates
+
+    def outline(pixels, offsets, color):
+        ref.blit(pixels[:, 0], pixels[:, 1], np.repeat(color, np.diff(offsets), axis=0))
+
+    outline(*bresenham_lines(*seg.T), colors["lines"])
+    lines = [dda_array(*s) for s in dseg]
+    outline(np.concatenate(lines), np.cumsum([0] + [len(p) for p in lines]), colors["dda"])
+    outline(*midpoint_circles(*circles.T), colors["circles"])
+    outline(*midpoint_ellipses(*ellipses.T), colors["ellipses"])
+    ref.polygons(polys, colors["polygons"])
+    np.testing.assert_array_equal(got, ref.pixels)
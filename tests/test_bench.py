@@ -0,0 +1,20 @@
+from raster.bench import compare
+
+
+def _results(*rows):
+    return {"results": [{"kernel": k, "params": {}, "seconds_per_call": s, "spread": spread}
+                        for k, s, spread in rows]}
+
+
+def test_compare_flags_only_real_slowdowns():
+    base = _results(("steady", 1e-3, 0.01), ("noisy", 1e-3, 0.40), ("tiny", 1e-8, 0.0))
+    current = _results(("steady", 1.2e-3, 0.01), ("noisy", 1.5e-3, 0.05), ("tiny", 5e-8, 0.0))
+    # within 25%, within twice the baseline spread, below the timer floor
+    assert compare(current, base, log=None) == []
+    current = _results(("steady", 1.3e-3, 0.01), ("noisy", 1.9e-3, 0.05), ("tiny", 5e-8, 0.0))
+    assert [k for k, _, _ in compare(current, base, log=None)] == ["steady", "noisy"]
+
+
+def test_compare_accepts_baselines_without_spread():
+    base = {"results": [{"kernel": "old", "params": {}, "seconds_per_call": 1e-3}]}
+    assert compare(_results(("old", 1.1e-3, 0.0)), base, log=None) == []
@@ -0,0 +1,67 @@
+"""Clipped rasterization against the unclipped kernels."""
+import numpy as np
+import pytest
+
+from raster.bresenham import bresenham_line, bresenham_lines
+from raster.clip import clip_polygons_xy
+from raster.dda import dda_array, dda_line
+
+RECT = (-34, -6, 26, 31)
+
+
+def _inside(pixels, rect=RECT):
+    xmin, ymin, xmax, ymax = rect
+    return [(x, y) for x, y in map(tuple, pixels) if xmin <= x <= xmax and ymin <= y <= ymax]
+
+
+def _segments(n=400, seed=0, integer=True):
+    rng = np.random.default_rng(seed)
+    if integer:
+        return rng.integers(-120, 120, size=(n, 4)).tolist()
+    return rng.uniform(-120, 120, size=(n, 4)).tolist()
+
+
+def test_fixed_dda_far_segment_stays_in_rect():
+    pixels = list(dda_line(0, 0, 1e6, 1e6, mode="fixed", clip=(0, 0, 1199, 699)))
+    assert pixels == [(i, i) for i in range(700)]
+
+
+@pytest.mark.parametrize("integer", [True, False])
+def test_fixed_dda_clip_is_unclipped_filtered(integer):
+    for seg in _segments(integer=integer):
+        assert list(dda_line(*seg, mode="fixed", clip=RECT)) == _inside(dda_line(*seg, mode="fixed"))
+
+
+@pytest.mark.parametrize("integer", [True, False])
+def test_dda_array_clip_is_unclipped_filtered(integer):
+    for seg in _segments(integer=integer):
+        assert [tuple(p) for p in dda_array(*seg, clip=RECT).tolist()] == _inside(dda_array(*seg))
+
+
+def test_float_dda_clip_stays_in_rect():
+    # ties may round the other way (see dda_line), but nothing leaves the rectangle
+    for seg in _segments(integer=True) + _segments(integer=False):
+        pixels = list(dda_line(*seg, clip=RECT))
+        assert pixels == _inside(pixels)
+
+
+def test_bresenham_clip_is_unclipped_filtered():
+    segs = _segments()
+    for seg in segs:
+        assert list(bresenham_line(*seg, clip=RECT)) == _inside(bresenham_line(*seg))
+    pixels, offsets = bresenham_lines(*np.array(segs).T, clip=RECT)
+    for i, seg in enumerate(segs):
+        assert [tuple(p) for p in pixels[offsets[i]:offsets[i + 1]].tolist()] == _inside(bresenham_line(*seg))
+
+
+def test_clip_polygons_inside_rect():
+    rng = np.random.default_rng(1)
+    # convex quads: jittered squares around random centers
+    centers = rng.uniform(-2, 2, size=(300, 1, 2))
+    square = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], dtype=float)
+    polys = centers + square * rng.uniform(0.1, 1.0, size=(300, 1, 1))
+    clipped, index = clip_polygons_xy(polys, -1.0, -1.0, 1.0, 1.0)
+    assert np.all(clipped >= -1.0 - 1e-12) and np.all(clipped <= 1.0 + 1e-12)
+    lo, hi = polys.min(axis=1), polys.max(axis=1)
+    overlaps = (hi[:, 0] > -1) & (lo[:, 0] < 1) & (hi[:, 1] > -1) & (lo[:, 1] < 1)
+    assert set(np.flatnonzero(overlaps)) <= set(index.tolist())
@@ -0,0 +1,67 @@
+"""Which DDA modes give the same pixels.
+
+dda_line(mode="float") is the original accumulated loop (DDA_algorithm's
+dda_raster) and dda_array must match it exactly; "fixed" is a 16.16 walk
+that may round ties the other way, so it is only held to one pixel."""
+import numpy as np
+import pytest
+
+from raster.dda import dda_array, dda_line, dda_spans
+
+
+def reference_dda(x0, y0, x1, y1):
+    """The original dda_raster loop."""
+    dx = x1 - x0
+    dy = y1 - y0
+    steps = int(max(abs(dx), abs(dy)))
+    if steps == 0:
+        return [(round(x0), round(y0))]
+    x_step = dx / steps
+    y_step = dy / steps
+    x, y = x0, y0
+    out = []
+    for _ in range(steps + 1):
+        out.append((round(x), round(y)))
+        x += x_step
+        y += y_step
+    return out
+
+
+def _segments(integer, n=1500, seed=0):
+    rng = np.random.default_rng(seed)
+    if integer:
+        segs = rng.integers(-300, 300, size=(n, 4)).tolist()
+    else:
+        segs = rng.uniform(-3000, 3000, size=(n // 5, 4)).tolist()
+    return segs + [[5, 5, 5, 5], [0, 0, 7, 0], [0, 0, 0, -7], [0, 0, 9, 9]]
+
+
+@pytest.mark.parametrize("integer", [True, False])
+def test_float_mode_is_reference(integer):
+    for seg in _segments(integer):
+        assert list(dda_line(*seg)) == reference_dda(*seg)
+
+
+@pytest.mark.parametrize("integer", [True, False])
+def test_dda_array_matches_float_mode(integer):
+    for seg in _segments(integer):
+        assert [tuple(p) for p in dda_array(*seg).tolist()] == reference_dda(*seg)
+
+
+@pytest.mark.parametrize("integer", [True, False])
+def test_fixed_mode_within_a_pixel(integer):
+    for seg in _segments(integer):
+        fixed = np.array(list(dda_line(*seg, mode="fixed")))
+        ref = np.array(reference_dda(*seg))
+        assert fixed.shape == ref.shape
+        assert np.abs(fixed - ref).max() <= 1
+
+
+def test_spans_cover_the_pixels():
+    for seg in _segments(True, n=200):
+        x_major = abs(seg[2] - seg[0]) > abs(seg[3] - seg[1])
+        pixels = set()
+        for fixed, a, b in dda_spans(*seg):
+            for v in range(min(a, b), max(a, b) + 1):
+                pixels.add((v, fixed) if x_major else (fixed, v))
+        assert set(reference_dda(*seg)) <= pixels
@@ -0,0 +1,24 @@
+import gc
+from multiprocessing import shared_memory
+
+import pytest
+
+from raster.tiles import TiledRenderer
+
+
+def test_close_unlinks_shared_memory():
+    tiled = TiledRenderer(64, 64, tile=32)
+    name = tiled._shm.name
+    tiled.close()
+    tiled.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_dropped_renderer_unlinks_shared_memory():
+    tiled = TiledRenderer(64, 64, tile=32)
+    name = tiled._shm.name
+    del tiled
+    gc.collect()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
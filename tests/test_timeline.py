@@ -0,0 +1,40 @@
+import os
+
+import numpy as np
+
+from raster.timeline import Timeline, cache_path
+
+
+def _bake(square, steps, calls):
+    calls.append(steps)
+    return Timeline.bake(square, 2 * square, np.linspace(0, 1, steps))
+
+
+def test_cached_reloads_same_inputs(tmp_path):
+    square = np.eye(3)
+    calls = []
+    for name in ("anim", "anim.npy"):
+        tl = Timeline.cached(tmp_path / name, lambda: _bake(square, 10, calls), key=(square, 10))
+        assert len(tl) == 10
+    # "anim" and "anim.npy" name the same cache; the second run loads it
+    assert calls == [10]
+    assert os.listdir(tmp_path) == [os.path.basename(cache_path(tmp_path / "anim", (square, 10)))]
+
+
+def test_cached_rebuilds_on_changed_inputs(tmp_path):
+    square = np.eye(3)
+    calls = []
+    path = tmp_path / "anim.npy"
+    Timeline.cached(path, lambda: _bake(square, 10, calls), key=(square, 10))
+    tl = Timeline.cached(path, lambda: _bake(square, 20, calls), key=(square, 20))
+    assert len(tl) == 20
+    tl = Timeline.cached(path, lambda: _bake(3 * square, 10, calls), key=(3 * square, 10))
+    np.testing.assert_array_equal(tl[0], 3 * square)
+    assert calls == [10, 20, 10]
+
+
+def test_cache_path_ends_in_npy():
+    assert cache_path("a/b").endswith(".npy")
+    assert cache_path("a/b.npy").endswith(".npy")
+    assert not cache_path("a/b.npy").endswith(".npy.npy")
+    assert cache_path("x", (1,)) != cache_path("x", (2,))
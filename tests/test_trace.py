@@ -0,0 +1,23 @@
+import numpy as np
+
+from raster.dda import dda_line
+from raster.trace import NpyTrace, RingTrace
+
+
+def test_npy_trace_streams_chunks_to_disk(tmp_path):
+    ring = RingTrace(capacity=1000)
+    with NpyTrace(tmp_path / "trace", chunk=64) as trace:
+        for sink in (trace, ring):
+            list(dda_line(0, 0, 300, 170, trace=sink))
+            list(dda_line(5, 400, -20, 3, trace=sink))
+        # only the partial chunk is held in memory
+        assert trace.count == trace.chunk * (ring.count // trace.chunk)
+        np.testing.assert_array_equal(trace.records(), ring.records())
+    assert trace.path == str(tmp_path / "trace.npy")
+    np.testing.assert_array_equal(np.load(trace.path), ring.records())
+    np.testing.assert_array_equal(np.load(trace.path, mmap_mode="r"), ring.records())
+
+
+def test_npy_trace_empty(tmp_path):
+    NpyTrace(tmp_path / "empty.npy").close()
+    assert len(np.load(tmp_path / "empty.npy")) == 0